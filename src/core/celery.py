@@ -1,8 +1,125 @@
+import logging
 import os
+import time
 from celery import Celery
+from celery.signals import before_task_publish, celeryd_init, task_postrun, task_prerun, worker_init, \
+    worker_process_init, worker_ready
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
 
 app = Celery('core')
 app.config_from_object('django.conf:settings', namespace = 'CELERY')
 app.autodiscover_tasks()
+
+logger = logging.getLogger(__name__)
+
+
+def memory_usage():
+    """Memória do processo atual em MB: residente (RSS), proporcional (PSS) e compartilhada."""
+
+    usage = {}
+
+    try:
+        with open('/proc/self/smaps_rollup') as smaps:
+            for line in smaps:
+                field, value = line.split(':', 1)
+
+                if field in ('Rss', 'Pss', 'Shared_Clean', 'Shared_Dirty'):
+                    usage[field] = int(value.split()[0]) / 1024
+    except OSError:
+        return {}
+
+    return {
+        'rss': usage.get('Rss', 0),
+        'pss': usage.get('Pss', 0),
+        'shared': usage.get('Shared_Clean', 0) + usage.get('Shared_Dirty', 0),
+    }
+
+
+def log_memory_usage(process):
+    usage = memory_usage()
+
+    if usage:
+        logger.info(
+            '%s %s: rss=%.0fMB pss=%.0fMB shared=%.0fMB',
+            process, os.getpid(), usage['rss'], usage['pss'], usage['shared'],
+        )
+
+
+@celeryd_init.connect
+def configure_queue_worker(sender=None, conf=None, options=None, **kwargs):
+    """Aplica CELERY_QUEUE_OPTIONS da primeira fila configurada consumida pelo worker."""
+
+    queues = options.get('queues') or []
+
+    if isinstance(queues, str):
+        queues = queues.split(',')
+
+    for queue in queues:
+        queue_options = conf.queue_options.get(queue)
+
+        if queue_options:
+            if not options.get('concurrency'):
+                conf.worker_concurrency = queue_options['concurrency']
+            if not options.get('prefetch_multiplier'):
+                conf.worker_prefetch_multiplier = queue_options['prefetch_multiplier']
+            conf.preload_model = queue_options.get('preload_model', False)
+            break
+
+
+@worker_init.connect
+def preload_model(sender=None, **kwargs):
+    # Executado no processo pai, antes de o pool prefork criar os filhos
+    from django.conf import settings
+
+    if sender.app.conf.get('preload_model') and not settings.RECOMMENDATION_INFERENCE_ADDRESS:
+        from recomendacao.recommendation import load_bert_model
+
+        try:
+            load_bert_model()
+        except Exception:
+            # Sem o modelo pré-carregado cada filho o carrega no primeiro uso
+            logger.exception('Could not preload the BERT model')
+
+
+@worker_ready.connect
+def report_worker_memory(**kwargs):
+    log_memory_usage('worker')
+
+
+@worker_process_init.connect
+def report_child_memory(**kwargs):
+    log_memory_usage('child')
+
+
+@before_task_publish.connect
+def stamp_published_at(headers=None, **kwargs):
+    # Lido em task_prerun para medir o tempo de espera na fila
+    headers.setdefault('published_at', time.time())
+
+
+_started = {}
+
+
+@task_prerun.connect
+def record_task_start(task_id=None, task=None, **kwargs):
+    from core.metrics import timing
+
+    _started[task_id] = time.perf_counter()
+    published_at = task.request.get('published_at')
+
+    if published_at:
+        timing('task.queue_wait', max(0.0, time.time() - published_at),
+               task=task.name, queue=(task.request.delivery_info or {}).get('routing_key', 'unknown'))
+
+
+@task_postrun.connect
+def record_task_outcome(task_id=None, task=None, state=None, **kwargs):
+    from core.metrics import increment, timing
+
+    started = _started.pop(task_id, None)
+
+    if started is not None:
+        timing('task.duration', time.perf_counter() - started, task=task.name, state=state)
+
+    increment('task.outcome', task=task.name, state=state)
@@ -0,0 +1,67 @@
+import mimetypes
+import os
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+
+def file_etag(stat):
+    # Mesmo formato do ETag que o nginx gera para arquivos estáticos, para que o
+    # valor não mude quando o arquivo passa a ser enviado por ele
+    return f'"{int(stat.st_mtime):x}-{stat.st_size:x}"'
+
+
+def content_disposition(name, as_attachment=False):
+    disposition = "attachment" if as_attachment else "inline"
+
+    try:
+        name.encode("ascii")
+        return f'{disposition}; filename="{name}"'
+    except UnicodeEncodeError:
+        return f"{disposition}; filename*=utf-8''{quote(name)}"
+
+
+def protected_file_response(request, file, as_attachment=False):
+    """Resposta para um arquivo de mídia cujo acesso já foi verificado pela view.
+
+    Com ``MEDIA_ACCEL_REDIRECT`` a resposta não tem corpo: o cabeçalho
+    ``X-Accel-Redirect`` aponta para a location interna do nginx
+    (``MEDIA_ACCEL_REDIRECT_URL``), que envia o arquivo sem ocupar o worker.
+    Sem ele (desenvolvimento) o arquivo é enviado pelo Django com FileResponse.
+
+    Em ambos os casos ``ETag`` e ``Last-Modified`` vêm do arquivo, e uma
+    requisição com ``If-None-Match``/``If-Modified-Since`` ainda válidos recebe 304.
+    """
+
+    if not file:
+        raise Http404
+
+    try:
+        stat = os.stat(file.path)
+    except FileNotFoundError:
+        raise Http404
+
+    etag = file_etag(stat)
+    last_modified = int(stat.st_mtime)
+
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+
+    if response is None:
+        name = os.path.basename(file.name)
+
+        if settings.MEDIA_ACCEL_REDIRECT:
+            response = HttpResponse(content_type=mimetypes.guess_type(name)[0] or "application/octet-stream")
+            response["X-Accel-Redirect"] = quote(settings.MEDIA_ACCEL_REDIRECT_URL + file.name)
+            response["Content-Disposition"] = content_disposition(name, as_attachment)
+        else:
+            response = FileResponse(file.open("rb"), as_attachment=as_attachment, filename=name)
+
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    # Sempre revalidado: as permissões podem mudar e o navegador recebe 304 enquanto o arquivo não mudar
+    response["Cache-Control"] = "private, no-cache"
+
+    return response
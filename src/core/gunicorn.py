@@ -0,0 +1,74 @@
+"""
+Gunicorn config for core project.
+
+Usage: ``gunicorn -c python:core.gunicorn``. Every value can be overridden
+through the ``GUNICORN_*`` environment variables below.
+"""
+
+import os
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+
+
+def available_cpus():
+    # Núcleos em que o processo pode rodar (cpuset do container, taskset), e não
+    # todos os do host como em cpu_count()
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+# Processos: um por núcleo disponível, no mínimo 2; as threads do gthread atendem a
+# concorrência dentro de cada um. Com preload_app os pesos e bibliotecas importados no
+# processo master são compartilhados por copy-on-write, mas cada worker ainda soma a
+# memória que aloca depois do fork. Em containers com limite de CPU por quota (que não
+# aparece na afinidade) defina GUNICORN_WORKERS
+workers = int(os.getenv("GUNICORN_WORKERS", max(available_cpus(), 2)))
+
+# gthread atende requisições lentas (recomendação, upload) sem bloquear o processo
+# inteiro. Para ASGI use GUNICORN_WORKER_CLASS=uvicorn.workers.UvicornWorker
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+threads = int(os.getenv("GUNICORN_THREADS", 4))
+
+wsgi_app = "core.asgi:application" if "uvicorn" in worker_class.lower() else "core.wsgi:application"
+
+# Importa Django, as views e a ordenação de recomendações (numpy, scipy) uma única
+# vez no master, antes do fork
+preload_app = os.getenv("GUNICORN_PRELOAD", "True") == "True"
+
+# Recicla os workers periodicamente para conter o crescimento de memória; o jitter
+# evita que todos reiniciem ao mesmo tempo
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", 1000))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", 100))
+
+# As rotas com ?recomendacao=true calculam TF-IDF/similaridade na requisição e
+# podem levar alguns segundos com muitas vagas ou candidatos
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 120))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", 30))
+# Atrás do nginx, que reaproveita as conexões com o upstream
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", 5))
+
+# Heartbeat dos workers em memória; em containers /tmp pode estar em disco lento
+worker_tmp_dir = os.getenv("GUNICORN_WORKER_TMP_DIR", "/dev/shm" if os.path.isdir("/dev/shm") else None)
+
+accesslog = os.getenv("GUNICORN_ACCESSLOG", "-")
+access_log_format = 'remote=%(h)s method=%(m)s path="%(U)s" status=%(s)s bytes=%(B)s duration_us=%(D)s agent="%(a)s"'
+loglevel = os.getenv("GUNICORN_LOGLEVEL", "info")
+
+
+def when_ready(server):
+    # Executado no master depois do preload e antes do primeiro fork. O Django só
+    # importa urls/views na primeira requisição; carregá-las aqui as traz para a
+    # memória compartilhada
+    if server.cfg.preload_app:
+        from django.urls import get_resolver
+
+        get_resolver().url_patterns
+
+
+def post_fork(server, worker):
+    # Conexões abertas no master não podem ser compartilhadas entre processos
+    from django.db import connections
+
+    connections.close_all()
@@ -0,0 +1,136 @@
+import logging
+import socket
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+
+def _format_tags(tags):
+    return " ".join(f"{key}={value}" for key, value in sorted(tags.items()))
+
+
+class LogSink:
+    """Registra cada métrica como uma linha logfmt no logger ``core.metrics``."""
+
+    def timing(self, name, seconds, **tags):
+        logger.info("metric=%s type=timing value=%.6f %s", name, seconds, _format_tags(tags))
+
+    def observe(self, name, value, **tags):
+        logger.info("metric=%s type=histogram value=%s %s", name, value, _format_tags(tags))
+
+    def increment(self, name, value=1, **tags):
+        logger.info("metric=%s type=counter value=%s %s", name, value, _format_tags(tags))
+
+
+class StatsdSink:
+    """Envia as métricas por UDP no formato StatsD, com tags no estilo DogStatsD."""
+
+    def __init__(self, host="localhost", port=8125, prefix="emprega"):
+        self.address = (host, int(port))
+        self.prefix = prefix
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def _send(self, name, value, kind, tags):
+        line = f"{self.prefix}.{name}:{value}|{kind}"
+
+        if tags:
+            line += "|#" + ",".join(f"{key}:{value}" for key, value in sorted(tags.items()))
+
+        try:
+            self.socket.sendto(line.encode(), self.address)
+        except OSError:
+            # Métricas nunca devem derrubar a task
+            pass
+
+    def timing(self, name, seconds, **tags):
+        self._send(name, round(seconds * 1000, 3), "ms", tags)
+
+    def observe(self, name, value, **tags):
+        self._send(name, value, "h", tags)
+
+    def increment(self, name, value=1, **tags):
+        self._send(name, value, "c", tags)
+
+
+class MemorySink:
+    """Acumula as métricas na memória do processo, por nome e tags; usado nos testes.
+
+    ``values`` guarda a lista de tempos e valores observados e ``counters`` a
+    soma de cada contador, ambos com a chave ``(nome, tags)`` em que as tags
+    são pares ``(chave, valor)`` ordenados.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.values = defaultdict(list)
+        self.counters = defaultdict(float)
+
+    @staticmethod
+    def _key(name, tags):
+        return name, tuple(sorted(tags.items()))
+
+    def timing(self, name, seconds, **tags):
+        self.observe(name, seconds, **tags)
+
+    def observe(self, name, value, **tags):
+        with self.lock:
+            self.values[self._key(name, tags)].append(value)
+
+    def increment(self, name, value=1, **tags):
+        with self.lock:
+            self.counters[self._key(name, tags)] += value
+
+
+SINKS = {
+    "log": LogSink,
+    "statsd": StatsdSink,
+    "memory": MemorySink,
+}
+
+
+@lru_cache(maxsize=None)
+def get_sink():
+    """Sink configurado em METRICS_SINK: log, statsd, memory ou o caminho de uma classe."""
+
+    sink = SINKS.get(settings.METRICS_SINK) or import_string(settings.METRICS_SINK)
+
+    return sink(**settings.METRICS_OPTIONS)
+
+
+@receiver(setting_changed)
+def reset_sink(setting=None, **kwargs):
+    if setting in ("METRICS_SINK", "METRICS_OPTIONS"):
+        get_sink.cache_clear()
+
+
+def increment(name, value=1, **tags):
+    get_sink().increment(name, value, **tags)
+
+
+def timing(name, seconds, **tags):
+    get_sink().timing(name, seconds, **tags)
+
+
+def observe(name, value, **tags):
+    get_sink().observe(name, value, **tags)
+
+
+@contextmanager
+def timer(name, **tags):
+    """Mede o tempo do bloco e o registra como ``name``."""
+
+    start = time.perf_counter()
+
+    try:
+        yield
+    finally:
+        timing(name, time.perf_counter() - start, **tags)
@@ -0,0 +1,167 @@
+import time
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+
+from core.metrics import observe, timing
+
+_current = ContextVar("request_metrics", default=None)
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class RequestMetrics:
+    """Consultas e tempos acumulados durante uma requisição."""
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.render_time = 0.0
+        self.serializing = False
+        self.view_start = None
+        self.view_end = None
+        self.view_time = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db_time += time.perf_counter() - start
+
+
+class TimedSerializerMixin:
+    """Soma o ``to_representation`` do serializer mais externo ao tempo de serialização da requisição.
+
+    Serializers aninhados e os chamados por um SerializerMethodField rodam dentro
+    do externo e não são contados de novo.
+    """
+
+    def to_representation(self, instance):
+        metrics = _current.get()
+
+        if metrics is None or metrics.serializing:
+            return super().to_representation(instance)
+
+        metrics.serializing = True
+        start = time.perf_counter()
+
+        try:
+            return super().to_representation(instance)
+        finally:
+            metrics.serializing = False
+            metrics.serializer_time += time.perf_counter() - start
+
+
+def query_budget(method, route):
+    """Limite de consultas de ``route`` (nome da view no router) em QUERY_BUDGETS.
+
+    Procura primeiro ``"<MÉTODO> <rota>"``, depois ``"<rota>"`` e por fim usa QUERY_BUDGET_DEFAULT.
+    """
+
+    budgets = settings.QUERY_BUDGETS
+
+    return budgets.get(f"{method} {route}", budgets.get(route, settings.QUERY_BUDGET_DEFAULT))
+
+
+class RequestMetricsMiddleware:
+    """Mede consultas ao banco e os tempos de banco, de serialização, de renderização e da view em cada requisição.
+
+    O tempo de serialização é o do ``to_representation`` dos serializers com
+    TimedSerializerMixin, onde rodam as consultas dos campos aninhados; ele
+    também faz parte do tempo da view. O de renderização é o da conversão do
+    ``response.data`` em JSON, feita em ``process_template_response``.
+
+    - Com ``REQUEST_METRICS_HEADERS`` (padrão: ``DEBUG``) os valores vão nos
+      cabeçalhos ``X-Query-Count`` e ``Server-Timing`` da resposta.
+    - Com ``REQUEST_METRICS`` os valores são enviados ao sink de métricas
+      (core.metrics) como histogramas, com a rota como tag.
+    - Com ``QUERY_BUDGET_STRICT`` (ligado pelo runner de testes) uma rota que
+      passar do limite em ``QUERY_BUDGETS`` gera ``QueryBudgetExceeded``.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not (settings.REQUEST_METRICS_HEADERS or settings.REQUEST_METRICS or settings.QUERY_BUDGET_STRICT):
+            return self.get_response(request)
+
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        start = time.perf_counter()
+
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(metrics))
+
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+
+        total = time.perf_counter() - start
+
+        if metrics.view_start is not None:
+            metrics.view_time = (metrics.view_end or time.perf_counter()) - metrics.view_start
+
+        match = request.resolver_match
+        route = match.view_name if match else "unresolved"
+
+        if settings.REQUEST_METRICS_HEADERS:
+            response["X-Query-Count"] = metrics.queries
+            response["Server-Timing"] = ", ".join([
+                f"db;dur={metrics.db_time * 1000:.1f}",
+                f"serializer;dur={metrics.serializer_time * 1000:.1f}",
+                f"render;dur={metrics.render_time * 1000:.1f}",
+                f"view;dur={metrics.view_time * 1000:.1f}",
+                f"total;dur={total * 1000:.1f}",
+            ])
+
+        if settings.REQUEST_METRICS:
+            tags = {"route": route, "method": request.method}
+
+            timing("http.request", total, status=response.status_code, **tags)
+            timing("http.view", metrics.view_time, **tags)
+            timing("http.db", metrics.db_time, **tags)
+            timing("http.serializer", metrics.serializer_time, **tags)
+            timing("http.render", metrics.render_time, **tags)
+            observe("http.queries", metrics.queries, **tags)
+
+        budget = query_budget(request.method, route)
+
+        if settings.QUERY_BUDGET_STRICT and budget is not None and metrics.queries > budget:
+            raise QueryBudgetExceeded(
+                f"{request.method} {request.path} ({route}) fez {metrics.queries} consultas; "
+                f"o limite em QUERY_BUDGETS é {budget}"
+            )
+
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        metrics = _current.get()
+
+        if metrics is not None:
+            metrics.view_start = time.perf_counter()
+
+    def process_template_response(self, request, response):
+        metrics = _current.get()
+
+        if metrics is None:
+            return response
+
+        # Primeiro da lista, este é o último process_template_response chamado: a
+        # resposta é renderizada aqui para medir o tempo, e o render() seguinte do
+        # Django não faz nada
+        metrics.view_end = time.perf_counter()
+        response.render()
+        metrics.render_time += time.perf_counter() - metrics.view_end
+
+        return response
@@ -0,0 +1,22 @@
+import logging
+
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+class TestRunner(DiscoverRunner):
+    """Runner de testes que faz as rotas acima de QUERY_BUDGETS falharem (QueryBudgetExceeded).
+
+    As linhas do sink ``log`` de métricas não são exibidas na saída dos testes;
+    ``assertLogs("core.metrics")`` continua as capturando.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self.query_budget_strict = override_settings(QUERY_BUDGET_STRICT=True)
+        self.query_budget_strict.enable()
+        logging.getLogger("core.metrics").setLevel(logging.WARNING)
+
+    def teardown_test_environment(self, **kwargs):
+        self.query_budget_strict.disable()
+        super().teardown_test_environment(**kwargs)
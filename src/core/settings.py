@@ -15,6 +15,7 @@ from pathlib import Path
 
 import environ
 import sentry_sdk
+from celery.schedules import crontab
 from sentry_sdk.integrations.django import DjangoIntegration
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -72,6 +73,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "drf_recaptcha",
     "auditlog",
     "rest_framework",
@@ -83,6 +85,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "core.middleware.RequestMetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
@@ -91,9 +94,11 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
-    "auditlog.middleware.AuditlogMiddleware",
+    "emprega.audit.AuditlogMiddleware",
+    "emprega.audit.AuditlogBufferMiddleware",
 ]
 
+
 ROOT_URLCONF = "core.urls"
 
 TEMPLATES = [
@@ -125,6 +130,14 @@ DATABASES = {
         "PASSWORD": os.getenv("DB_PASS", ""),
         "HOST": os.getenv("DB_HOST", ""),
         "PORT": os.getenv("DB_PORT", ""),
+        # Conexões reaproveitadas entre requisições/tasks por até DB_CONN_MAX_AGE segundos
+        # (0 fecha ao fim de cada uma); a verificação evita reusar uma conexão derrubada
+        "CONN_MAX_AGE": int(os.getenv("DB_CONN_MAX_AGE", 60)),
+        "CONN_HEALTH_CHECKS": os.getenv("DB_CONN_HEALTH_CHECKS", "True") == "True",
+        # Atrás do pgbouncer em modo transaction cursores nomeados não sobrevivem entre
+        # transações; os workers do Celery conectam direto no banco porque usam advisory
+        # locks de sessão (recomendacao.locks)
+        "DISABLE_SERVER_SIDE_CURSORS": os.getenv("DB_PGBOUNCER", "False") == "True",
     }
 }
 
@@ -169,6 +182,29 @@ STATIC_ROOT = BASE_DIR / "static"
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Uploads: o SizeLimitUploadHandler interrompe arquivos maiores que UPLOAD_MAX_SIZE
+# enquanto são recebidos; acima de FILE_UPLOAD_MAX_MEMORY_SIZE o arquivo vai para um
+# temporário em disco, em pedaços, em vez de ficar na memória do worker
+UPLOAD_MAX_SIZE = int(os.getenv("UPLOAD_MAX_SIZE", 10 * 1024 * 1024))
+FILE_UPLOAD_HANDLERS = [
+    "core.uploads.SizeLimitUploadHandler",
+    "django.core.files.uploadhandler.MemoryFileUploadHandler",
+    "django.core.files.uploadhandler.TemporaryFileUploadHandler",
+]
+FILE_UPLOAD_MAX_MEMORY_SIZE = int(os.getenv("FILE_UPLOAD_MAX_MEMORY_SIZE", 1024 * 1024))
+
+# Miniaturas das fotos de usuários e empresas (emprega/thumbnails.py), geradas pela
+# task process_foto: lado, em pixels, de cada tamanho e formatos gerados
+FOTO_MINIATURAS = {"pequena": 64, "media": 256}
+FOTO_MINIATURA_FORMATOS = ["webp", "jpeg"]
+FOTO_MINIATURAS_DIR = "fotos/miniaturas"
+
+# Currículos e certificados são baixados pelas rotas da API (core/downloads.py). Com
+# MEDIA_ACCEL_REDIRECT o Django só verifica a permissão e o nginx envia o arquivo a
+# partir da location interna MEDIA_ACCEL_REDIRECT_URL (nginx/conf.d/nginx.conf)
+MEDIA_ACCEL_REDIRECT = os.getenv("MEDIA_ACCEL_REDIRECT", "False") == "True"
+MEDIA_ACCEL_REDIRECT_URL = "/protected/"
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/3.2/ref/settings/#default-auto-field
 
@@ -226,6 +262,131 @@ CELERY_ACCEPT_CONTENT = ['application/json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 
+# Filas separadas para que um backlog de reprocessamento não atrase e-mails:
+# email (transacionais), recomendacao (edições de perfil/vaga), backfill (lotes) e
+# midia (miniaturas e remoção de arquivos, que usam CPU e disco)
+CELERY_TASK_ROUTES = {
+    'emprega.tasks.send_email_*': {'queue': 'email'},
+    'emprega.tasks.process_foto': {'queue': 'midia'},
+    'emprega.tasks.remove_arquivos': {'queue': 'midia'},
+    'process_candidato': {'queue': 'recomendacao'},
+    'process_vaga': {'queue': 'recomendacao'},
+    'process_candidatos': {'queue': 'backfill'},
+    'process_vagas': {'queue': 'backfill'},
+}
+
+# Concorrência e prefetch de cada fila, aplicados ao worker iniciado com -Q <fila>
+# (opções passadas na linha de comando têm prioridade). Com preload_model o modelo
+# BERT é carregado no processo pai antes do fork e compartilhado pelos filhos
+# (copy-on-write) em vez de uma cópia por processo
+CELERY_QUEUE_OPTIONS = {
+    'email': {
+        'concurrency': int(os.getenv('CELERY_EMAIL_CONCURRENCY', 2)),
+        'prefetch_multiplier': int(os.getenv('CELERY_EMAIL_PREFETCH', 4)),
+    },
+    'recomendacao': {
+        'concurrency': int(os.getenv('CELERY_RECOMENDACAO_CONCURRENCY', 2)),
+        'prefetch_multiplier': int(os.getenv('CELERY_RECOMENDACAO_PREFETCH', 1)),
+        'preload_model': True,
+    },
+    'backfill': {
+        'concurrency': int(os.getenv('CELERY_BACKFILL_CONCURRENCY', 1)),
+        'prefetch_multiplier': int(os.getenv('CELERY_BACKFILL_PREFETCH', 1)),
+        'preload_model': True,
+    },
+    'midia': {
+        'concurrency': int(os.getenv('CELERY_MIDIA_CONCURRENCY', 2)),
+        'prefetch_multiplier': int(os.getenv('CELERY_MIDIA_PREFETCH', 1)),
+    },
+}
+
+# Servidor local de embeddings (python manage.py inference_server). Com um endereço
+# configurado (socket Unix ou host:porta) os workers deixam de carregar o modelo
+RECOMMENDATION_INFERENCE_ADDRESS = os.getenv("RECOMMENDATION_INFERENCE_ADDRESS", None)
+RECOMMENDATION_INFERENCE_MAX_BATCH = int(os.getenv("RECOMMENDATION_INFERENCE_MAX_BATCH", 32))
+RECOMMENDATION_INFERENCE_MAX_WAIT_MS = int(os.getenv("RECOMMENDATION_INFERENCE_MAX_WAIT_MS", 10))
+
+# Auditoria (emprega/audit.py): as entradas do auditlog esperam o commit da transação
+# e, nas requisições, são gravadas em lote ao final delas (AuditlogBufferMiddleware); com
+# AUDITLOG_ASYNC o lote vai para a task write_log_entries. Entradas
+# com mais de AUDITLOG_RETENTION_DAYS dias são removidas diariamente (prune_log_entries)
+AUDITLOG_ASYNC = os.getenv("AUDITLOG_ASYNC", "False") == "True"
+AUDITLOG_BATCH_SIZE = int(os.getenv("AUDITLOG_BATCH_SIZE", 500))
+AUDITLOG_RETENTION_DAYS = int(os.getenv("AUDITLOG_RETENTION_DAYS", 365))
+
+CELERY_BEAT_SCHEDULE = {
+    'prune-log-entries': {
+        'task': 'emprega.tasks.prune_log_entries',
+        'schedule': crontab(hour=3, minute=0),
+    },
+}
+
+# Métricas de processamento, das tasks e das requisições (core/metrics.py): log ou
+# statsd. Para o Prometheus use o statsd com o statsd_exporter, que agrega os
+# valores de todos os processos do gunicorn e dos workers do Celery
+METRICS_SINK = os.getenv("METRICS_SINK", "log")
+METRICS_OPTIONS = {
+    "log": {},
+    "statsd": {
+        "host": os.getenv("METRICS_STATSD_HOST", "localhost"),
+        "port": os.getenv("METRICS_STATSD_PORT", 8125),
+        "prefix": os.getenv("METRICS_PREFIX", "emprega"),
+    },
+}.get(METRICS_SINK, {})
+
+# Consultas e tempos por requisição (core.middleware.RequestMetricsMiddleware): cabeçalhos
+# X-Query-Count/Server-Timing, histogramas no sink de métricas e limite de consultas por rota
+REQUEST_METRICS_HEADERS = os.getenv("REQUEST_METRICS_HEADERS", str(DEBUG)) == "True"
+REQUEST_METRICS = os.getenv("REQUEST_METRICS", str(METRICS_SINK != "log")) == "True"
+QUERY_BUDGET_STRICT = os.getenv("QUERY_BUDGET_STRICT", "False") == "True"
+QUERY_BUDGET_DEFAULT = None
+# Consultas medidas nos testes; CandidatoPerfilSerializer e VagaSerializer ainda fazem
+# consultas por item (N+1), então novas relações aninhadas estouram esses limites
+QUERY_BUDGETS = {
+    "GET candidato-list": 17,
+    "GET candidato-vaga": 17,
+    "GET candidato-perfil": 8,
+    "PATCH candidato-detail": 8,
+    "GET vaga-list": 4,
+    "GET vaga-detail": 2,
+    "POST vaga-list": 9,
+    "PUT vaga-detail": 11,
+    "PATCH vaga-detail": 7,
+    "GET candidatura-list": 2,
+    "POST candidatura-list": 8,
+    "POST knox_login": 11,
+}
+
+TEST_RUNNER = "core.runner.TestRunner"
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {
+        "logfmt": {
+            "format": "ts=%(asctime)s level=%(levelname)s logger=%(name)s pid=%(process)d %(message)s",
+        },
+    },
+    "handlers": {
+        "logfmt": {
+            "class": "logging.StreamHandler",
+            "formatter": "logfmt",
+        },
+    },
+    "loggers": {
+        "core.metrics": {
+            "handlers": ["logfmt"],
+            "level": os.getenv("METRICS_LOG_LEVEL", "INFO"),
+            "propagate": False,
+        },
+        "recomendacao": {
+            "handlers": ["logfmt"],
+            "level": os.getenv("RECOMENDACAO_LOG_LEVEL", "INFO"),
+            "propagate": False,
+        },
+    },
+}
+
 EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
 EMAIL_HOST = os.getenv("EMAIL_HOST", "smtp.gmail.com")
 EMAIL_HOST_USER = os.getenv("EMAIL_HOST_USER", "")
@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.core.exceptions import BadRequest
+from django.core.files.uploadhandler import FileUploadHandler
+from django.http.multipartparser import MultiPartParserError
+from django.template.defaultfilters import filesizeformat
+
+
+class FileTooLarge(MultiPartParserError, BadRequest):
+    pass
+
+
+class SizeLimitUploadHandler(FileUploadHandler):
+    """Interrompe o upload de um arquivo assim que ele passa de ``UPLOAD_MAX_SIZE`` bytes.
+
+    Fica antes dos handlers padrão em FILE_UPLOAD_HANDLERS e apenas conta os
+    bytes de cada pedaço antes de repassá-lo; o arquivo em si continua sendo
+    gravado em memória (até FILE_UPLOAD_MAX_MEMORY_SIZE) ou em disco, em
+    pedaços, pelos handlers seguintes. O erro vira um 400 tanto no DRF
+    (ParseError) quanto no Django (BadRequest), sem ler o restante do corpo.
+    """
+
+    def receive_data_chunk(self, raw_data, start):
+        if start + len(raw_data) > settings.UPLOAD_MAX_SIZE:
+            raise FileTooLarge(
+                f"O arquivo {self.file_name} excede o limite de {filesizeformat(settings.UPLOAD_MAX_SIZE)}"
+            )
+
+        return raw_data
+
+    def file_complete(self, file_size):
+        return None
@@ -0,0 +1,329 @@
+"""
+Receivers do auditlog com gravação em lote.
+
+Os receivers padrão do django-auditlog gravam um ``LogEntry`` por ``save()``
+e carregam a linha anterior inteira (incluindo os embeddings) para calcular a
+diferença. Os modelos do emprega são registrados em ``registry``, um registro
+próprio criado só com os receivers deste módulo: as diferenças continuam sendo
+calculadas no sinal, mas as entradas são acumuladas e gravadas com um único
+``bulk_create`` ou, com ``AUDITLOG_ASYNC``, enviadas a uma task do Celery.
+
+- Em uma requisição (``AuditlogBufferMiddleware``) ou dentro de ``buffered()``
+  as entradas são acumuladas e gravadas juntas ao final.
+- Dentro de uma transação cada entrada espera o commit em um callback de
+  ``transaction.on_commit``, então entradas de uma transação (ou savepoint)
+  desfeita são descartadas pelo próprio Django junto com ela.
+- Fora de ``buffered()`` cada entrada é gravada no ``save()`` ou no commit.
+
+O ator e o IP vêm de ``set_actor``, usado por ``AuditlogMiddleware``.
+"""
+
+import json
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import timedelta
+
+from auditlog.context import set_actor as auditlog_set_actor
+from auditlog.diff import get_field_value, mask_str
+from auditlog.middleware import AuditlogMiddleware as BaseAuditlogMiddleware
+from auditlog.models import LogEntry
+from auditlog.receivers import check_disable
+from auditlog.registry import AuditlogModelRegistry
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.db import router, transaction
+from django.db.models import Case, DateTimeField, Value, When
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.utils.encoding import smart_str
+
+from core.metrics import increment
+
+LOG_ENTRY_FIELDS = [
+    "content_type_id", "object_pk", "object_id", "object_repr", "serialized_data", "action", "changes",
+    "actor_id", "remote_addr", "timestamp", "additional_data",
+]
+
+_buffer = ContextVar("auditlog_buffer", default=None)
+_actor = ContextVar("auditlog_actor", default=(None, None))
+
+
+class _Pending:
+    """Entrada criada dentro de uma transação; entregue a ``store`` no commit."""
+
+    def __init__(self, entry, using):
+        self.entry = entry
+        self.using = using
+
+    def __call__(self):
+        store([self.entry], using=self.using)
+
+
+@contextmanager
+def set_actor(actor, remote_addr=None):
+    """``auditlog.context.set_actor`` que também guarda o ator e o IP para as entradas deste módulo.
+
+    As entradas são gravadas com ``bulk_create``, que não dispara o receiver
+    ``pre_save`` pelo qual o auditlog preenche esses campos.
+    """
+
+    token = _actor.set((actor, remote_addr))
+
+    try:
+        with auditlog_set_actor(actor, remote_addr=remote_addr):
+            yield
+    finally:
+        _actor.reset(token)
+
+
+class AuditlogMiddleware(BaseAuditlogMiddleware):
+    """``auditlog.middleware.AuditlogMiddleware`` usando o ``set_actor`` deste módulo."""
+
+    def __call__(self, request):
+        if hasattr(request, "user") and request.user.is_authenticated:
+            with set_actor(request.user, remote_addr=self._get_remote_addr(request)):
+                return self.get_response(request)
+
+        return self.get_response(request)
+
+
+class _Buffer(defaultdict):
+    """Entradas de uma requisição, por banco, e a profundidade de transação no seu início."""
+
+    def __init__(self, using):
+        super().__init__(list)
+        # Blocos atomic já abertos quando a requisição começou (os do TestCase, nos testes)
+        self.depth = len(transaction.get_connection(using).atomic_blocks)
+
+
+@contextmanager
+def buffered():
+    """Acumula as entradas criadas no bloco e as grava juntas na saída.
+
+    As entradas criadas fora de transação já correspondem a linhas gravadas,
+    então são gravadas mesmo que o bloco termine com uma exceção.
+    """
+
+    buffer = _Buffer(router.db_for_write(LogEntry))
+    token = _buffer.set(buffer)
+
+    try:
+        yield buffer
+    finally:
+        _buffer.reset(token)
+
+        for using, entries in buffer.items():
+            write(entries, using=using)
+
+
+class AuditlogBufferMiddleware:
+    """Grava as entradas do auditlog de cada requisição com um único ``bulk_create``."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with buffered():
+            return self.get_response(request)
+
+
+def store(entries, using=None):
+    """Grava ``entries`` ou, dentro de ``buffered()``, as acumula até o fim do bloco."""
+
+    buffer = _buffer.get()
+
+    if buffer is None:
+        write(entries, using=using)
+    else:
+        buffer[using].extend(entries)
+
+
+def write(entries, using=None):
+    if not entries:
+        return
+
+    if settings.AUDITLOG_ASYNC:
+        from emprega.tasks import write_log_entries
+
+        write_log_entries.delay([serialize(entry) for entry in entries])
+    else:
+        LogEntry.objects.using(using).bulk_create(entries, batch_size=settings.AUDITLOG_BATCH_SIZE)
+
+    increment("auditlog.entries", len(entries), mode="async" if settings.AUDITLOG_ASYNC else "sync")
+
+
+def serialize(entry):
+    data = {field: getattr(entry, field) for field in LOG_ENTRY_FIELDS}
+    data["timestamp"] = entry.timestamp.isoformat()
+
+    return data
+
+
+def deserialize(data):
+    return LogEntry(**{**data, "timestamp": parse_datetime(data["timestamp"])})
+
+
+def bulk_write(entries, using=None):
+    """Grava entradas recebidas depois do commit preservando o horário da alteração.
+
+    ``LogEntry.timestamp`` usa ``auto_now_add``, que sobrescreve o valor no
+    ``bulk_create``; um único UPDATE restaura os horários originais.
+    """
+
+    timestamps = [entry.timestamp for entry in entries]
+    created = LogEntry.objects.using(using).bulk_create(entries, batch_size=settings.AUDITLOG_BATCH_SIZE)
+
+    LogEntry.objects.using(using).filter(pk__in=[entry.pk for entry in created]).update(timestamp=Case(
+        *[When(pk=entry.pk, then=Value(timestamp)) for entry, timestamp in zip(created, timestamps)],
+        output_field=DateTimeField(),
+    ))
+
+    return created
+
+
+def enqueue(entry):
+    using = router.db_for_write(LogEntry)
+    connection = transaction.get_connection(using)
+    buffer = _buffer.get()
+    actor, remote_addr = _actor.get()
+
+    if isinstance(actor, get_user_model()):
+        entry.actor = actor
+
+    entry.remote_addr = remote_addr
+    entry.timestamp = timezone.now()
+
+    if len(connection.atomic_blocks) == (buffer.depth if buffer is not None else 0):
+        return store([entry], using=using)
+
+    # Um callback por entrada: se o savepoint for desfeito o Django descarta o
+    # callback e, com ele, a entrada. No commit as entradas vão para o buffer
+    # da requisição, se houver, e são gravadas juntas
+    transaction.on_commit(_Pending(entry, using), using=using)
+
+
+def build(instance, action, changes):
+    get_additional_data = getattr(instance, "get_additional_data", None)
+
+    return LogEntry(
+        content_type=ContentType.objects.get_for_model(instance),
+        object_pk=instance.pk,
+        object_id=instance.pk if isinstance(instance.pk, int) else None,
+        object_repr=smart_str(instance),
+        action=action,
+        changes=json.dumps(changes),
+        additional_data=get_additional_data() if callable(get_additional_data) else None,
+    )
+
+
+def tracked_fields(model, update_fields=None):
+    """Campos comparados pelo auditlog, respeitando include_fields/exclude_fields do registro."""
+
+    options = registry.get_model_fields(model)
+    fields = [field.name for field in model._meta.concrete_fields]
+
+    if options["include_fields"]:
+        fields = [field for field in fields if field in options["include_fields"]]
+    if options["exclude_fields"]:
+        fields = [field for field in fields if field not in options["exclude_fields"]]
+    if update_fields:
+        fields = [field for field in fields if field in update_fields]
+
+    return fields
+
+
+def diff(model, old, new, fields):
+    """Diferenças entre ``old`` e ``new`` (um deles pode ser None) nos campos ``fields``.
+
+    Mesmo formato de ``auditlog.diff.model_instance_diff``, que consulta o
+    registro global do auditlog e não o deste módulo.
+    """
+
+    mask_fields = registry.get_model_fields(model)["mask_fields"]
+    changes = {}
+
+    for name in fields:
+        field = model._meta.get_field(name)
+        old_value = get_field_value(old, field)
+        new_value = get_field_value(new, field)
+
+        if old_value != new_value:
+            if name in mask_fields:
+                changes[name] = (mask_str(smart_str(old_value)), mask_str(smart_str(new_value)))
+            else:
+                changes[name] = (smart_str(old_value), smart_str(new_value))
+
+    return changes or None
+
+
+@check_disable
+def log_create(sender, instance, created, **kwargs):
+    if created:
+        changes = diff(sender, None, instance, tracked_fields(sender))
+        enqueue(build(instance, LogEntry.Action.CREATE, changes))
+
+
+@check_disable
+def log_update(sender, instance, update_fields=None, **kwargs):
+    if instance.pk is None:
+        return
+
+    fields = tracked_fields(sender, update_fields)
+
+    # save(update_fields=[...]) apenas com colunas derivadas não gera entrada
+    if not fields:
+        return
+
+    # Carrega só as colunas auditadas da versão anterior, sem os embeddings
+    try:
+        old = sender.objects.only(*fields).get(pk=instance.pk)
+    except sender.DoesNotExist:
+        return
+
+    changes = diff(sender, old, instance, fields)
+
+    if changes:
+        enqueue(build(instance, LogEntry.Action.UPDATE, changes))
+
+
+@check_disable
+def log_delete(sender, instance, **kwargs):
+    if instance.pk is not None:
+        changes = diff(sender, instance, None, tracked_fields(sender))
+        enqueue(build(instance, LogEntry.Action.DELETE, changes))
+
+
+# Registro usado pelos modelos do emprega: conecta apenas os receivers acima, no
+# lugar de auditlog.receivers
+registry = AuditlogModelRegistry(
+    create=False, update=False, delete=False, access=False, m2m=False,
+    custom={post_save: log_create, pre_save: log_update, post_delete: log_delete},
+)
+
+
+def prune(days, batch_size=10000):
+    """Remove as entradas com mais de ``days`` dias em lotes de ``batch_size``.
+
+    Apagar em lotes pelo índice de ``timestamp`` mantém cada transação curta e
+    não bloqueia as inserções na tabela. Retorna o número de entradas removidas.
+    """
+
+    cutoff = timezone.now() - timedelta(days=days)
+    deleted = 0
+
+    while True:
+        pks = list(
+            LogEntry.objects.filter(timestamp__lt=cutoff).order_by().values_list("pk", flat=True)[:batch_size]
+        )
+
+        if not pks:
+            break
+
+        deleted += LogEntry.objects.filter(pk__in=pks).delete()[0]
+
+    increment("auditlog.pruned", deleted)
+
+    return deleted
@@ -0,0 +1,3 @@
+from emprega.loadtest.client import HttpClient, HttpError
+from emprega.loadtest.runner import Stats, run
+from emprega.loadtest.scenarios import SCENARIOS
@@ -0,0 +1,140 @@
+import asyncio
+import json
+from urllib.parse import urlencode, urlsplit
+
+
+class HttpError(Exception):
+    pass
+
+
+class Response:
+    def __init__(self, status, headers, body):
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    def json(self):
+        return json.loads(self.body)
+
+
+class HttpClient:
+    """Cliente HTTP/1.1 mínimo sobre asyncio, com uma conexão keep-alive.
+
+    Cada usuário virtual do teste de carga usa o seu próprio cliente, como
+    um navegador com uma conexão aberta para a API.
+    """
+
+    def __init__(self, base_url, timeout=30):
+        url = urlsplit(base_url)
+
+        self.host = url.hostname
+        self.port = url.port or (443 if url.scheme == "https" else 80)
+        self.ssl = url.scheme == "https"
+        self.prefix = url.path.rstrip("/")
+        self.timeout = timeout
+        self.token = None
+        self.reader = None
+        self.writer = None
+
+    async def close(self):
+        if self.writer:
+            self.writer.close()
+            self.reader = self.writer = None
+
+    async def _connect(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port, ssl=self.ssl or None)
+
+    async def _read_body(self, headers):
+        if headers.get("transfer-encoding") == "chunked":
+            chunks = []
+
+            while True:
+                size = int((await self.reader.readline()).split(b";")[0], 16)
+
+                if size == 0:
+                    await self.reader.readline()
+                    return b"".join(chunks)
+
+                chunks.append(await self.reader.readexactly(size))
+                await self.reader.readline()
+
+        if "content-length" in headers:
+            return await self.reader.readexactly(int(headers["content-length"]))
+
+        # Sem tamanho informado o corpo vai até o fim da conexão
+        body = await self.reader.read()
+        await self.close()
+
+        return body
+
+    async def _request(self, method, path, body, headers):
+        if self.writer is None:
+            await self._connect()
+
+        lines = [f"{method} {self.prefix}{path} HTTP/1.1", f"Host: {self.host}:{self.port}", "Connection: keep-alive"]
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        lines.append(f"Content-Length: {len(body)}")
+
+        self.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode() + body)
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+
+        if not status_line:
+            raise ConnectionResetError("connection closed by the server")
+
+        status = int(status_line.split()[1])
+        response_headers = {}
+
+        while True:
+            line = await self.reader.readline()
+
+            if line in (b"\r\n", b"\n", b""):
+                break
+
+            name, _, value = line.decode("latin-1").partition(":")
+            response_headers[name.strip().lower()] = value.strip()
+
+        response = Response(status, response_headers, await self._read_body(response_headers))
+
+        if response_headers.get("connection", "").lower() == "close":
+            await self.close()
+
+        return response
+
+    async def request(self, method, path, params=None, data=None):
+        headers = {"Accept": "application/json"}
+        body = b""
+
+        if params:
+            path = f"{path}?{urlencode(params)}"
+
+        if data is not None:
+            body = json.dumps(data).encode()
+            headers["Content-Type"] = "application/json"
+
+        if self.token:
+            headers["Authorization"] = f"Token {self.token}"
+
+        for attempt in range(2):
+            try:
+                return await asyncio.wait_for(self._request(method, path, body, headers), self.timeout)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                # Conexão keep-alive fechada pelo servidor entre duas requisições
+                await self.close()
+
+                if attempt:
+                    raise
+            except asyncio.TimeoutError:
+                await self.close()
+                raise HttpError(f"{method} {path}: timeout after {self.timeout}s")
+
+    async def login(self, username, password):
+        response = await self.request("POST", "/login/", data={"username": username, "password": password})
+
+        if response.status != 200:
+            raise HttpError(f"login {username}: HTTP {response.status}")
+
+        self.token = response.json()["token"]
+
+        return response
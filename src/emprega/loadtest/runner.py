@@ -0,0 +1,157 @@
+import asyncio
+import random
+import time
+from collections import Counter, defaultdict
+
+import numpy as np
+
+from emprega.loadtest.client import HttpClient, HttpError
+from emprega.loadtest.scenarios import SCENARIOS
+
+QUERY_COUNT_HEADER = "x-query-count"
+
+
+class Stats:
+    """Latências, status e consultas ao banco de cada endpoint."""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(Counter)
+        self.queries = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.failures = []
+        self.started = None
+        self.finished = None
+
+    def record(self, endpoint, latency, status=None, queries=None):
+        self.latencies[endpoint].append(latency)
+
+        if status is None or status >= 400:
+            self.errors[endpoint] += 1
+        if status is not None:
+            self.statuses[endpoint][status] += 1
+        if queries is not None:
+            self.queries[endpoint].append(queries)
+
+    def report(self):
+        elapsed = (self.finished or time.perf_counter()) - self.started
+        endpoints = {}
+
+        for endpoint, latencies in sorted(self.latencies.items()):
+            p50, p90, p95, p99 = np.percentile(latencies, [50, 90, 95, 99])
+            queries = self.queries[endpoint]
+
+            endpoints[endpoint] = {
+                "requests": len(latencies),
+                "rps": len(latencies) / elapsed,
+                "errors": self.errors[endpoint],
+                "statuses": dict(self.statuses[endpoint]),
+                "p50": p50,
+                "p90": p90,
+                "p95": p95,
+                "p99": p99,
+                "max": max(latencies),
+                "queries_avg": sum(queries) / len(queries) if queries else None,
+                "queries_max": max(queries) if queries else None,
+            }
+
+        total = sum(len(latencies) for latencies in self.latencies.values())
+
+        return {
+            "elapsed": elapsed,
+            "requests": total,
+            "rps": total / elapsed if elapsed else 0,
+            "failures": self.failures,
+            "endpoints": endpoints,
+        }
+
+
+class Session:
+    """Usuário virtual: um cliente HTTP, uma credencial e as métricas compartilhadas."""
+
+    def __init__(self, client, user, password, stats):
+        self.client = client
+        self.user = user
+        self.password = password
+        self.stats = stats
+
+    async def call(self, endpoint, method, path, params=None, data=None):
+        start = time.perf_counter()
+
+        try:
+            response = await self.client.request(method, path, params=params, data=data)
+        except (OSError, HttpError, asyncio.IncompleteReadError):
+            self.stats.record(endpoint, time.perf_counter() - start)
+            return None
+
+        queries = response.headers.get(QUERY_COUNT_HEADER)
+        self.stats.record(endpoint, time.perf_counter() - start, response.status,
+                          int(queries) if queries is not None else None)
+
+        return response
+
+
+async def _virtual_user(base_url, scenario, user, password, stats, deadline, think_time):
+    function, _, authenticate = SCENARIOS[scenario]
+    client = HttpClient(base_url)
+    session = Session(client, user, password, stats)
+
+    try:
+        if authenticate:
+            await client.login(user["username"], password)
+
+        while time.perf_counter() < deadline:
+            await function(session)
+
+            if think_time:
+                await asyncio.sleep(random.expovariate(1 / think_time))
+    except (OSError, HttpError) as e:
+        # Usuário virtual que não conseguiu se autenticar não gera carga
+        stats.failures.append(f"{scenario}: {e}")
+    finally:
+        await client.close()
+
+
+async def _run(base_url, users, password, scenarios, concurrency, duration, think_time):
+    stats = Stats()
+    names = list(scenarios)
+    weights = [scenarios[name] for name in names]
+    tasks = []
+
+    stats.started = time.perf_counter()
+    deadline = stats.started + duration
+
+    for i in range(concurrency):
+        scenario = random.choices(names, weights)[0]
+        role = SCENARIOS[scenario][1]
+        user = users[role][i % len(users[role])]
+
+        tasks.append(_virtual_user(base_url, scenario, user, password, stats, deadline, think_time))
+
+    await asyncio.gather(*tasks)
+    stats.finished = time.perf_counter()
+
+    return stats
+
+
+def run(base_url, users, password, scenarios, concurrency=10, duration=30, think_time=0, seed=None):
+    """Executa o teste de carga e retorna as métricas agregadas.
+
+    Parâmetros:
+        base_url (str): endereço da API, por exemplo ``http://localhost:8000``
+        users (dict): credenciais por perfil; ``candidato``: ``[{"pk", "username"}]`` e
+            ``empregador``: ``[{"pk", "username", "vagas"}]``
+        password (str): senha comum aos usuários do dataset
+        scenarios (dict): peso de cada cenário de ``SCENARIOS``
+        concurrency (int): usuários virtuais simultâneos
+        duration (float): duração em segundos
+        think_time (float): pausa média, em segundos, entre duas iterações de um usuário
+        seed (int): semente da escolha de cenários e dados
+
+    Retorno:
+        Stats: métricas coletadas
+    """
+
+    random.seed(seed)
+
+    return asyncio.run(_run(base_url, users, password, scenarios, concurrency, duration, think_time))
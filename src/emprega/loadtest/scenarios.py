@@ -0,0 +1,55 @@
+import random
+
+
+async def candidato_browsing(session):
+    """Candidato navegando pelas vagas recomendadas e abrindo uma delas."""
+
+    response = await session.call("vagas recomendadas", "GET", "/vaga/", params={"recomendacao": "true"})
+
+    if response and response.status == 200:
+        vagas = response.json().get("results", [])
+
+        if vagas:
+            await session.call("vaga detalhe", "GET", f"/vaga/{random.choice(vagas)['id']}/")
+
+
+async def empregador_review(session):
+    """Empregador revisando os candidatos recomendados para uma das suas vagas."""
+
+    vaga = random.choice(session.user["vagas"])
+
+    await session.call(
+        "candidatos recomendados", "GET", f"/candidato/vaga/{vaga}/", params={"recomendacao": "true"}
+    )
+
+
+async def login(session):
+    """Login e logout, cada um gerando e apagando um token do knox."""
+
+    response = await session.call(
+        "login", "POST", "/login/", data={"username": session.user["username"], "password": session.password}
+    )
+
+    if response and response.status == 200:
+        session.client.token = response.json()["token"]
+        await session.call("logout", "POST", "/logout/")
+        session.client.token = None
+
+
+async def profile_edit(session):
+    """Candidato abrindo e editando o próprio perfil."""
+
+    await session.call("perfil", "GET", "/candidato/perfil/")
+    await session.call(
+        "perfil editar", "PATCH", f"/candidato/{session.user['pk']}/",
+        data={"cargo": random.choice(["Analista", "Desenvolvedor", "Vendedor", "Auxiliar administrativo"])},
+    )
+
+
+# nome: (função, perfil de usuário exigido, autenticar antes)
+SCENARIOS = {
+    "candidato_browsing": (candidato_browsing, "candidato", True),
+    "empregador_review": (empregador_review, "empregador", True),
+    "login": (login, "candidato", False),
+    "profile_edit": (profile_edit, "candidato", True),
+}
@@ -0,0 +1,29 @@
+from argparse import ArgumentTypeError
+from datetime import datetime, time
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils.translation import gettext as _
+from recomendacao.recommendation import BERT_MODEL
+
+
+def since(value):
+    date = parse_datetime(value)
+
+    if date is None and parse_date(value):
+        date = datetime.combine(parse_date(value), time.min)
+
+    if date is None:
+        raise ArgumentTypeError(f'Data inválida: {value}')
+
+    return timezone.make_aware(date) if timezone.is_naive(date) else date
+
+
+def add_enqueue_arguments(parser):
+    parser.add_argument('--only-missing', action='store_true', help=_('Only process rows without an embedding'))
+    parser.add_argument('--since', type=since, help=_('Only process rows updated since the given date'))
+    parser.add_argument('--model-version', nargs='?', const=BERT_MODEL,
+                        help=_('Only process rows whose embedding was not generated by the given model'))
+    parser.add_argument('--chunk-size', type=int, default=100, help=_('Number of rows per task'))
+    parser.add_argument('--max-queue', type=int, default=50,
+                        help=_('Wait while the queue holds this many tasks (0 disables the wait)'))
@@ -0,0 +1,104 @@
+import re
+
+from django.db import connection, transaction
+from django.core.management.base import BaseCommand
+from django.utils.translation import gettext as _
+
+from emprega.models import (
+    Candidato,
+    Candidatura,
+    Empresa,
+    JornadaTrabalhoChoices,
+    ModeloTrabalhoChoices,
+    RegimeContratualChoices,
+    Token,
+    TokenTypeChoices,
+    Vaga,
+)
+from emprega.search import trigram_filter
+
+INDEX_SCAN = re.compile(
+    r"(?:Index Scan|Index Only Scan)(?: Backward)? using (\S+)|Bitmap Index Scan on (\S+)"
+)
+
+
+class Command(BaseCommand):
+    help = _('Runs EXPLAIN ANALYZE on the canonical API queries and reports index usage')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--query', action='append', help=_('Only explain the given query (repeatable)'))
+        parser.add_argument('--no-seqscan', action='store_true',
+                            help=_('Disable sequential scans, useful on small datasets'))
+        parser.add_argument('--plan', action='store_true', help=_('Print the full query plan'))
+
+    def _queries(self):
+        vaga = Vaga.objects.order_by().first()
+        candidatura = Candidatura.objects.order_by().first()
+        token = Token.objects.order_by().first()
+
+        empresa_id = vaga.empresa_id if vaga else 0
+        vaga_id = candidatura.vaga_id if candidatura else 0
+        usuario_id = candidatura.usuario_id if candidatura else 0
+
+        # Mesmos formatos de consulta usados em emprega/views.py
+        return {
+            'vaga_list': Vaga.objects.all()[:20],
+            'vaga_list_filtros': Vaga.objects.filter(
+                modelo_trabalho=ModeloTrabalhoChoices.PRESENCIAL,
+                jornada_trabalho=JornadaTrabalhoChoices.TEMPO_INTEGRAL,
+                regime_contratual=RegimeContratualChoices.CLT,
+                salario__gte=1000,
+            )[:20],
+            'vaga_list_empresa': Vaga.objects.filter(
+                trigram_filter('padaria', 'empresa__nome_fantasia', 'empresa__razao_social')
+            )[:20],
+            'vaga_empresa': Vaga.objects.filter(empresa_id=empresa_id)[:20],
+            'vaga_candidaturas': Vaga.objects.filter(
+                candidaturas_vaga__usuario_id=usuario_id, candidaturas_vaga__esta_ativo=True
+            )[:20],
+            'empresa_nome': Empresa.objects.filter(trigram_filter('padaria', 'nome_fantasia')),
+            'candidato_list_cargo': Candidato.objects.filter(
+                trigram_filter('desenvolvedor', 'objetivo_profissional_usuario__cargo')
+            )[:20],
+            'candidato_vaga': Candidato.objects.filter(
+                candidaturas_usuario__vaga_id=vaga_id, esta_ativo=True
+            )[:20],
+            'candidatura_usuario': Candidatura.objects.filter(usuario_id=usuario_id, esta_ativo=True)[:20],
+            'candidatura_vaga': Candidatura.objects.filter(vaga_id=vaga_id, esta_ativo=True),
+            'token': Token.objects.filter(
+                token=token.token if token else '',
+                type=token.type if token else TokenTypeChoices.PASSWORD_RESET,
+            ),
+        }
+
+    def handle(self, *args, **options):
+        only = options['query']
+        queries = self._queries()
+
+        for name in only or []:
+            if name not in queries:
+                raise Exception(f'Consulta desconhecida: {name}')
+
+        with transaction.atomic():
+            if options['no_seqscan']:
+                with connection.cursor() as cursor:
+                    cursor.execute('SET LOCAL enable_seqscan = off')
+
+            for name, queryset in queries.items():
+                if only and name not in only:
+                    continue
+
+                plan = queryset.explain(analyze=True)
+                indexes = [using or on for using, on in INDEX_SCAN.findall(plan)]
+                time = re.search(r'Execution Time: ([\d.]+) ms', plan)
+                time = time.group(1) if time else '?'
+
+                if indexes:
+                    self.stdout.write(self.style.SUCCESS(
+                        f'{name}: index {", ".join(dict.fromkeys(indexes))} ({time} ms)'
+                    ))
+                else:
+                    self.stdout.write(self.style.WARNING(f'{name}: no index used ({time} ms)'))
+
+                if options['plan']:
+                    self.stdout.write(plan)
@@ -0,0 +1,141 @@
+import json
+import os
+import random
+from collections import defaultdict
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils.translation import gettext as _
+
+from emprega.loadtest import SCENARIOS, run
+from emprega.models import Candidato, Candidatura, Vaga
+
+FAKE_PASSWORD = os.getenv('FAKE_PASSWORD', '123456')
+
+
+def scenario_weight(value):
+    name, _, weight = value.partition('=')
+
+    if name not in SCENARIOS:
+        raise ValueError(value)
+
+    return name, float(weight or 1)
+
+
+class Command(BaseCommand):
+    help = _('Runs a load test against a running API and reports throughput, latency and queries per endpoint')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://localhost:8000', help=_('Base URL of the API'))
+        parser.add_argument('--users', type=int, default=20, help=_('Number of concurrent virtual users'))
+        parser.add_argument('--duration', type=float, default=30, help=_('Duration of the test in seconds'))
+        parser.add_argument('--think-time', type=float, default=0,
+                            help=_('Mean pause in seconds between two iterations of a virtual user'))
+        parser.add_argument('--scenario', type=scenario_weight, action='append',
+                            help=_('Scenario and weight, e.g. candidato_browsing=3 (default: all, same weight). '
+                                   'Choices: %s') % ', '.join(SCENARIOS))
+        parser.add_argument('--seed', type=int, default=0, help=_('Seed of the scenario and data choices'))
+        parser.add_argument('--password', default=FAKE_PASSWORD, help=_('Password shared by the dataset users'))
+        parser.add_argument('--sample', type=int, default=200, help=_('Number of users of each profile to log in as'))
+        parser.add_argument('--prepare', type=int, metavar='CANDIDATOS',
+                            help=_('Seed the given number of candidates (and a tenth of employers) before running'))
+        parser.add_argument('--candidaturas', type=int, default=20,
+                            help=_('Applications created per job when preparing the dataset'))
+        parser.add_argument('--output', help=_('Path of the JSON file with the report'))
+
+    def _prepare(self, candidatos, candidaturas, seed):
+        """Semeia o dataset com os comandos em lote e cria candidaturas para as vagas novas."""
+
+        ultimo_candidato = Candidato.objects.order_by('-pk').values_list('pk', flat=True).first() or 0
+        ultima_vaga = Vaga.objects.order_by('-pk').values_list('pk', flat=True).first() or 0
+
+        call_command('seed_candidatos', candidatos, bulk=True, formacao='1~3', experiencia='1~3', curso='0~2',
+                     idioma='1~2', stdout=self.stdout)
+        call_command('seed_empregadores', max(1, candidatos // 10), vagas='1~5', bulk=True, stdout=self.stdout)
+
+        rng = random.Random(seed)
+        pks = list(Candidato.objects.filter(pk__gt=ultimo_candidato).values_list('pk', flat=True))
+        vagas = list(Vaga.objects.filter(pk__gt=ultima_vaga).values_list('pk', flat=True))
+
+        with transaction.atomic():
+            Candidatura.objects.bulk_create([
+                Candidatura(vaga_id=vaga, usuario_id=usuario)
+                for vaga in vagas
+                for usuario in rng.sample(pks, min(candidaturas, len(pks)))
+            ], batch_size=5000)
+
+        self.stdout.write(self.style.SUCCESS(f'Created {len(vagas) * min(candidaturas, len(pks))} candidaturas'))
+
+    def _users(self, sample):
+        candidatos = [
+            {'pk': pk, 'username': cpf}
+            for pk, cpf in Candidato.objects.filter(esta_ativo=True).order_by('-pk').values_list('pk', 'cpf')[:sample]
+        ]
+
+        vagas = defaultdict(list)
+
+        for vaga, usuario, cpf in Vaga.objects.filter(candidaturas_vaga__isnull=False).distinct().order_by(
+                '-pk').values_list('pk', 'empresa__usuario_id', 'empresa__usuario__cpf')[:sample * 5]:
+            vagas[(usuario, cpf)].append(vaga)
+
+        empregadores = [
+            {'pk': pk, 'username': cpf, 'vagas': ids}
+            for (pk, cpf), ids in list(vagas.items())[:sample]
+        ]
+
+        return {'candidato': candidatos, 'empregador': empregadores}
+
+    def _write_report(self, report):
+        self.stdout.write(
+            f'{"endpoint":<26} {"reqs":>7} {"rps":>8} {"err":>5} {"p50":>9} {"p95":>9} {"p99":>9} {"max":>9} '
+            f'{"queries":>9}'
+        )
+
+        for endpoint, row in report['endpoints'].items():
+            queries = f'{row["queries_avg"]:.1f}/{row["queries_max"]}' if row['queries_avg'] is not None else '-'
+            line = (
+                f'{endpoint:<26} {row["requests"]:>7} {row["rps"]:>8.1f} {row["errors"]:>5} '
+                f'{row["p50"] * 1000:>7.0f}ms {row["p95"] * 1000:>7.0f}ms {row["p99"] * 1000:>7.0f}ms '
+                f'{row["max"] * 1000:>7.0f}ms {queries:>9}'
+            )
+            self.stdout.write(self.style.ERROR(line) if row['errors'] else line)
+
+        for failure in report['failures']:
+            self.stdout.write(self.style.ERROR(failure))
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{report["requests"]} requests in {report["elapsed"]:.1f}s ({report["rps"]:.1f} rps)'
+        ))
+
+    def handle(self, *args, **options):
+        if options['prepare']:
+            self._prepare(options['prepare'], options['candidaturas'], options['seed'])
+
+        scenarios = dict(options['scenario'] or [(name, 1) for name in SCENARIOS])
+        users = self._users(options['sample'])
+
+        for scenario in scenarios:
+            role = SCENARIOS[scenario][1]
+
+            if not users[role]:
+                raise CommandError(f'Nenhum {role} no banco para o cenário {scenario}; use --prepare')
+
+        self.stdout.write(f'{options["users"]} virtual users for {options["duration"]:.0f}s against {options["url"]}')
+
+        stats = run(
+            options['url'], users, options['password'], scenarios,
+            concurrency=options['users'],
+            duration=options['duration'],
+            think_time=options['think_time'],
+            seed=options['seed'],
+        )
+        report = stats.report()
+
+        self._write_report(report)
+
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(report, f, indent=2)
+
+            self.stdout.write(self.style.SUCCESS(f'Report saved at {options["output"]}'))
@@ -1,23 +1,34 @@
 from django.core.management.base import BaseCommand
+from django.db.models import Q
 from django.utils.translation import gettext as _
+from emprega.management.commands._enqueue import add_enqueue_arguments
 from emprega.models import Candidato
-from recomendacao.tasks import process_candidato
-from time import sleep
+from recomendacao.queue import enqueue_chunks
+from recomendacao.tasks import process_candidatos
 
 
 class Command(BaseCommand):
     help = _('Processes all users profiles')
 
     def add_arguments(self, parser):
-        parser.add_argument('--delay', type=int, help=_('Delay between each processing'))
+        add_enqueue_arguments(parser)
 
     def handle(self, *args, **options):
-        delay = options['delay']
-        if not delay:
-            delay = 1
+        candidatos = Candidato.objects.order_by('pk')
 
-        candidatos = Candidato.objects.all()
+        if options['only_missing']:
+            candidatos = candidatos.filter(curriculo_embedding__isnull=True)
+        if options['since']:
+            candidatos = candidatos.filter(updated_at__gte=options['since'])
+        if options['model_version']:
+            candidatos = candidatos.filter(
+                Q(curriculo_embedding_modelo__isnull=True) | ~Q(curriculo_embedding_modelo=options['model_version'])
+            )
 
-        for candidato in candidatos:
-            process_candidato.delay(pk = candidato.pk)
-            sleep(delay)
+        pks = candidatos.values_list('pk', flat=True).iterator(chunk_size=options['chunk_size'] * 10)
+        total = 0
+
+        for total in enqueue_chunks(process_candidatos, pks, options['chunk_size'], max_queue=options['max_queue']):
+            self.stdout.write(f'{total} candidatos enqueued')
+
+        self.stdout.write(self.style.SUCCESS(f'Enqueued {total} candidatos'))
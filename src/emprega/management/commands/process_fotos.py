@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.utils.translation import gettext as _
+
+from emprega.models import Empresa, Usuario
+from emprega.tasks import process_foto
+
+
+class Command(BaseCommand):
+    help = _('Generates the photo thumbnails of users and companies')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--only-missing', action='store_true', help=_('Only process photos without thumbnails'))
+
+    def handle(self, *args, **options):
+        total = 0
+
+        for model in (Usuario, Empresa):
+            fotos = model.objects.exclude(Q(foto__isnull=True) | Q(foto=''))
+
+            if options['only_missing']:
+                fotos = fotos.filter(foto_miniaturas__isnull=True)
+
+            for pk in fotos.values_list('pk', flat=True).iterator():
+                process_foto.delay(model._meta.label, pk)
+                total += 1
+
+        self.stdout.write(self.style.SUCCESS(f'Enqueued {total} fotos'))
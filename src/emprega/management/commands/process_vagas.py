@@ -1,23 +1,34 @@
 from django.core.management.base import BaseCommand
+from django.db.models import Q
 from django.utils.translation import gettext as _
+from emprega.management.commands._enqueue import add_enqueue_arguments
 from emprega.models import Vaga
-from recomendacao.tasks import process_vaga
-from time import sleep
+from recomendacao.queue import enqueue_chunks
+from recomendacao.tasks import process_vagas
 
 
 class Command(BaseCommand):
     help = _('Processes all vagas')
 
     def add_arguments(self, parser):
-        parser.add_argument('--delay', type=int, help=_('Delay between each processing'))
+        add_enqueue_arguments(parser)
 
     def handle(self, *args, **options):
-        delay = options['delay']
-        if not delay:
-            delay = 1
+        vagas = Vaga.objects.order_by('pk')
 
-        vagas = Vaga.objects.all()
+        if options['only_missing']:
+            vagas = vagas.filter(vaga_embedding__isnull=True)
+        if options['since']:
+            vagas = vagas.filter(updated_at__gte=options['since'])
+        if options['model_version']:
+            vagas = vagas.filter(
+                Q(vaga_embedding_modelo__isnull=True) | ~Q(vaga_embedding_modelo=options['model_version'])
+            )
 
-        for vaga in vagas:
-            process_vaga.delay(pk = vaga.pk)
-            sleep(delay)
+        pks = vagas.values_list('pk', flat=True).iterator(chunk_size=options['chunk_size'] * 10)
+        total = 0
+
+        for total in enqueue_chunks(process_vagas, pks, options['chunk_size'], max_queue=options['max_queue']):
+            self.stdout.write(f'{total} vagas enqueued')
+
+        self.stdout.write(self.style.SUCCESS(f'Enqueued {total} vagas'))
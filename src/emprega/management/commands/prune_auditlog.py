@@ -0,0 +1,19 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils.translation import gettext as _
+
+from emprega.audit import prune
+
+
+class Command(BaseCommand):
+    help = _('Deletes audit log entries older than the retention period')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.AUDITLOG_RETENTION_DAYS,
+                            help=_('Keep entries from the last N days'))
+        parser.add_argument('--batch-size', type=int, default=10000, help=_('Number of entries deleted per query'))
+
+    def handle(self, *args, **options):
+        deleted = prune(options['days'], batch_size=options['batch_size'])
+
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} log entries older than {options["days"]} days'))
@@ -1,7 +1,9 @@
 import json
 import os
 import random
+import time
 
+from django.contrib.auth.hashers import make_password
 from django.core.management.base import BaseCommand
 from django.db import transaction
 from django.utils.translation import gettext as _
@@ -25,7 +27,10 @@ fake.add_provider(internet)
 fake.add_provider(person)
 
 from emprega.models import UsuarioNivelChoices, SexoChoices, EstadoCivilChoices, TipoDeficienciaChoices, \
-    ModeloTrabalhoChoices, RegimeContratualChoices, JornadaTrabalhoChoices, FormacaoNivelChoices, IdiomaNivelChoices
+    ModeloTrabalhoChoices, RegimeContratualChoices, JornadaTrabalhoChoices, FormacaoNivelChoices, IdiomaNivelChoices, \
+    Usuario, Candidato, ObjetivoProfissional, FormacaoAcademica, ExperienciaProfissional, CursoEspecializacao, Idioma
+from recomendacao.queue import enqueue_chunks
+from recomendacao.tasks import process_candidatos
 
 FAKE_PASSWORD = os.getenv('FAKE_PASSWORD', '123456')
 
@@ -43,6 +48,9 @@ class Command(BaseCommand):
         parser.add_argument('--curso_input', type=str, help=_('Generate specialization course'))
         parser.add_argument('--idioma', type=str, help=_('Generate language'))
         parser.add_argument('--idioma_input', type=str, help=_('Generate language'))
+        parser.add_argument('--bulk', action='store_true',
+                            help=_('Insert rows with bulk_create, skipping serializers and per-row processing'))
+        parser.add_argument('--chunk-size', type=int, default=1000, help=_('Number of users per bulk insert'))
 
     def _gerar_formacao_academica(self, usuario_id, **kwargs):
         nivel = kwargs.pop('nivel', random.choice(FormacaoNivelChoices.names))
@@ -116,6 +124,79 @@ class Command(BaseCommand):
             "jornada_trabalho": random.choice(JornadaTrabalhoChoices.values),
         }
 
+    def _bulk(self, number_of_candidatos, chunk_size, filhos):
+        """Insere os candidatos em lote.
+
+        Os registros são montados em memória e gravados com ``bulk_create`` em
+        blocos de ``chunk_size`` usuários, sem passar pelos serializers nem por
+        ``save()``. Assim nenhum e-mail de confirmação ou processamento é
+        disparado por linha; ao final os usuários criados são enfileirados para
+        ``process_candidatos`` em blocos, com ``enqueue_chunks``.
+        """
+
+        password = make_password(FAKE_PASSWORD)
+        cpfs = set(Usuario.objects.values_list('cpf', flat=True))
+        emails = set(Usuario.objects.values_list('email', flat=True))
+        pks = []
+        total = 0
+        inicio = time.perf_counter()
+
+        for offset in range(0, number_of_candidatos, chunk_size):
+            candidatos, objetivos = [], []
+            relacionados = {model: [] for model in [ObjetivoProfissional, *[filho[0] for filho in filhos]]}
+
+            for _ in range(min(chunk_size, number_of_candidatos - offset)):
+                candidato = self._get_random_user()
+
+                while candidato['cpf'] in cpfs:
+                    candidato['cpf'] = fake.cpf().replace('.', '').replace('-', '')
+
+                if candidato['email'] in emails:
+                    # Nomes de usuário do Faker se repetem rapidamente em grandes volumes
+                    usuario, dominio = candidato['email'].split('@')
+                    candidato['email'] = f'{usuario}.{len(emails)}@{dominio}'
+
+                cpfs.add(candidato['cpf'])
+                emails.add(candidato['email'])
+
+                objetivos.append({campo: candidato.pop(campo) for campo in
+                                  ['cargo', 'salario', 'modelo_trabalho', 'regime_contratual', 'jornada_trabalho']})
+                candidato['password'] = password
+
+                candidatos.append(Candidato(**candidato))
+
+            with transaction.atomic():
+                Candidato.objects.bulk_create(candidatos)
+
+                for candidato, objetivo in zip(candidatos, objetivos):
+                    relacionados[ObjetivoProfissional].append(ObjetivoProfissional(usuario_id=candidato.pk, **objetivo))
+
+                    for model, gerar, lista, n in filhos:
+                        valores = random.choice(lista) if lista else None
+                        for val in (valores or [{} for _ in range(n)]):
+                            dados = gerar(candidato.pk, **val)
+                            dados['usuario_id'] = dados.pop('usuario')
+                            relacionados[model].append(model(**dados))
+
+                for model, objs in relacionados.items():
+                    model.objects.bulk_create(objs)
+
+            pks.extend(candidato.pk for candidato in candidatos)
+            total += len(candidatos) + sum(len(objs) for objs in relacionados.values())
+            decorrido = time.perf_counter() - inicio
+
+            self.stdout.write(self.style.SUCCESS(
+                f'Created {len(pks)} candidatos - {total} rows ({total / decorrido:.0f} rows/s)'
+            ))
+
+        for enfileirados in enqueue_chunks(process_candidatos, pks):
+            self.stdout.write(f'{enfileirados} candidatos enqueued')
+
+        decorrido = time.perf_counter() - inicio
+        self.stdout.write(self.style.SUCCESS(
+            f'Inserted {total} rows in {decorrido:.2f}s ({total / decorrido:.0f} rows/s)'
+        ))
+
     def handle(self, *args, **options):
         number_of_candidatos = options['number'] or 1
         n_formacao = options['formacao'] or '0'
@@ -187,6 +268,14 @@ class Command(BaseCommand):
         else:
             n_idioma = int(n_idioma)
 
+        if options['bulk']:
+            return self._bulk(number_of_candidatos, options['chunk_size'], [
+                (FormacaoAcademica, self._gerar_formacao_academica, l_formacao, n_formacao),
+                (ExperienciaProfissional, self._gerar_experiencia_profissional, l_experiencia, n_experiencia),
+                (CursoEspecializacao, self._gerar_curso_especializacao, l_curso, n_curso),
+                (Idioma, self._gerar_idioma, l_idioma, n_idioma),
+            ])
+
         for i in range(number_of_candidatos):
             with transaction.atomic():
                 candidato = self._get_random_user()
@@ -1,7 +1,10 @@
 import json
 import os
 import random
+import time
+from multiprocessing import Pool
 
+from django.contrib.auth.hashers import make_password
 from django.core.management.base import BaseCommand
 from django.db import transaction
 from django.utils.translation import gettext as _
@@ -28,10 +31,33 @@ fake.add_provider(address)
 fake.add_provider(company)
 
 from emprega.models import UsuarioNivelChoices, SexoChoices, EstadoCivilChoices, JornadaTrabalhoChoices, Beneficio, \
-    RegimeContratualChoices, ModeloTrabalhoChoices
+    RegimeContratualChoices, ModeloTrabalhoChoices, Usuario, Empregador, Empresa, Endereco, Vaga
+from recomendacao.queue import enqueue_chunks
+from recomendacao.tasks import process_vagas
 
 FAKE_PASSWORD = os.getenv('FAKE_PASSWORD', '123456')
 
+VAGA_FIELDS = {field.name for field in Vaga._meta.concrete_fields}
+
+
+def _semear():
+    # Processos do pool herdam o estado do gerador; sem nova semente todos geram os mesmos dados
+    fake.seed_instance(os.getpid())
+    random.seed(os.getpid())
+
+
+def _gerar_empregador(args):
+    beneficios, l_vagas, number_jobs = args
+    command = Command()
+
+    empregador = command._get_random_user()
+    vagas = [
+        command._gerar_vaga(beneficios, **(random.choice(l_vagas) if l_vagas else {}))
+        for _ in range(number_jobs)
+    ]
+
+    return empregador, vagas
+
 
 class Command(BaseCommand):
     help = _('Creates a new employer')
@@ -40,11 +66,14 @@ class Command(BaseCommand):
         parser.add_argument('number', type=int, help=_('The number of users to create'))
         parser.add_argument('--vagas', type=str, help=_('The number of jobs to create'))
         parser.add_argument("--vagas_input", type=str, help=_("The path to the file with the jobs to create"))
+        parser.add_argument('--bulk', action='store_true',
+                            help=_('Insert rows with bulk_create, skipping serializers and per-row processing'))
+        parser.add_argument('--chunk-size', type=int, default=1000, help=_('Number of employers per bulk insert'))
+        parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                            help=_('Number of processes generating fake data in bulk mode'))
 
-    def _gerar_vaga(self, **kwargs):
-        beneficios = Beneficio.objects.all().values('id')
-        beneficios = [beneficio['id'] for beneficio in beneficios]
-        beneficios = random.sample(list(beneficios), random.randint(1, len(beneficios)))
+    def _gerar_vaga(self, beneficios, **kwargs):
+        beneficios = random.sample(beneficios, random.randint(1, len(beneficios))) if beneficios else []
 
         return {
             "cargo": fake.job(),
@@ -101,6 +130,135 @@ class Command(BaseCommand):
             "estado": fake.estado_sigla(),
         }
 
+    def _bulk(self, number_users, number_jobs, l_vagas, chunk_size, workers):
+        """Insere os empregadores em lote.
+
+        Os dados falsos são gerados por um pool de ``workers`` processos e
+        gravados com ``bulk_create`` em blocos de ``chunk_size`` empregadores,
+        incluindo a tabela intermediária de benefícios das vagas. Nenhum
+        e-mail ou ``process_vaga`` é disparado por linha; ao final as vagas
+        criadas são enfileiradas para ``process_vagas`` em blocos, com
+        ``enqueue_chunks``.
+        """
+
+        beneficios = list(Beneficio.objects.values_list('id', flat=True))
+        password = make_password(FAKE_PASSWORD)
+        cpfs = set(Usuario.objects.values_list('cpf', flat=True))
+        emails = set(Usuario.objects.values_list('email', flat=True)) | set(
+            Empresa.objects.values_list('email', flat=True))
+        cnpjs = set(Empresa.objects.values_list('cnpj', flat=True))
+        pks = []
+        total = 0
+        inicio = time.perf_counter()
+
+        pool = Pool(workers, initializer=_semear) if workers > 1 else None
+
+        try:
+            for offset in range(0, number_users, chunk_size):
+                quantidade = min(chunk_size, number_users - offset)
+                args = [(beneficios, l_vagas, number_jobs)] * quantidade
+
+                if pool:
+                    lote = pool.map(_gerar_empregador, args, chunksize=max(1, quantidade // (workers * 4)))
+                else:
+                    lote = list(map(_gerar_empregador, args))
+
+                empregadores, enderecos, empresas, vagas = [], [], [], []
+
+                for empregador, dados_vagas in lote:
+                    while empregador['cpf'] in cpfs:
+                        empregador['cpf'] = fake.cpf().replace('.', '').replace('-', '')
+
+                    while empregador['cnpj'] in cnpjs:
+                        empregador['cnpj'] = fake.cnpj().replace('.', '').replace('-', '').replace('/', '')
+
+                    if empregador['email'] in emails:
+                        # Nomes de usuário do Faker se repetem rapidamente em grandes volumes
+                        usuario, dominio = empregador['email'].split('@')
+                        empregador['email'] = f'{usuario}.{len(emails)}@{dominio}'
+
+                    cpfs.add(empregador['cpf'])
+                    emails.add(empregador['email'])
+                    cnpjs.add(empregador['cnpj'])
+
+                    empregadores.append(Empregador(
+                        nome=empregador['nome'],
+                        cpf=empregador['cpf'],
+                        data_nascimento=empregador['data_nascimento'],
+                        sexo=empregador['sexo'],
+                        estado_civil=empregador['estado_civil'],
+                        cargo=empregador['cargo'],
+                        email=empregador['email'],
+                        telefone=empregador['telefone'],
+                        password=password,
+                        nivel_usuario=UsuarioNivelChoices.EMPREGADOR,
+                    ))
+                    enderecos.append(Endereco(**{campo: empregador[campo] for campo in
+                                                 ['cep', 'logradouro', 'numero', 'complemento', 'bairro', 'cidade',
+                                                  'estado']}))
+                    # Mesmos valores gravados por EmpregadorCreateSerializer
+                    empresas.append(Empresa(
+                        cnpj=empregador['cnpj'],
+                        razao_social=empregador['razao_social'],
+                        nome_fantasia=empregador['nome_fantasia'],
+                        ramo_atividade=empregador['ramo_atividade'],
+                        numero_funcionarios=empregador['numero_funcionarios'],
+                        telefone=empregador['telefone'],
+                        email=empregador['email'],
+                        site=empregador['site'],
+                        descricao=empregador['descricao'],
+                    ))
+                    vagas.append(dados_vagas)
+
+                with transaction.atomic():
+                    Empregador.objects.bulk_create(empregadores)
+                    Endereco.objects.bulk_create(enderecos)
+
+                    for empresa, empregador, endereco in zip(empresas, empregadores, enderecos):
+                        empresa.usuario_id = empregador.pk
+                        empresa.endereco_id = endereco.pk
+
+                    Empresa.objects.bulk_create(empresas)
+
+                    vagas_model, vagas_beneficios = [], []
+
+                    for empresa, dados_vagas in zip(empresas, vagas):
+                        for dados in dados_vagas:
+                            vagas_model.append(Vaga(
+                                empresa_id=empresa.pk,
+                                **{campo: valor for campo, valor in dados.items() if campo in VAGA_FIELDS}
+                            ))
+                            vagas_beneficios.append(dados['beneficios'])
+
+                    Vaga.objects.bulk_create(vagas_model)
+
+                    Vaga.beneficios.through.objects.bulk_create([
+                        Vaga.beneficios.through(vaga_id=vaga.pk, beneficio_id=beneficio)
+                        for vaga, ids in zip(vagas_model, vagas_beneficios)
+                        for beneficio in ids
+                    ])
+
+                pks.extend(vaga.pk for vaga in vagas_model)
+                total += len(empregadores) * 3 + len(vagas_model) + sum(len(ids) for ids in vagas_beneficios)
+                decorrido = time.perf_counter() - inicio
+
+                self.stdout.write(self.style.SUCCESS(
+                    f'Created {offset + quantidade} empregadores, {len(pks)} vagas - {total} rows '
+                    f'({total / decorrido:.0f} rows/s)'
+                ))
+        finally:
+            if pool:
+                pool.close()
+                pool.join()
+
+        for enfileiradas in enqueue_chunks(process_vagas, pks):
+            self.stdout.write(f'{enfileiradas} vagas enqueued')
+
+        decorrido = time.perf_counter() - inicio
+        self.stdout.write(self.style.SUCCESS(
+            f'Inserted {total} rows in {decorrido:.2f}s ({total / decorrido:.0f} rows/s)'
+        ))
+
     def handle(self, *args, **options):
         number_users = options['number'] or 1
         number_jobs = options['vagas'] or '0'
@@ -120,6 +278,11 @@ class Command(BaseCommand):
         else:
             number_jobs = int(number_jobs)
 
+        if options['bulk']:
+            return self._bulk(number_users, number_jobs, l_vagas, options['chunk_size'], options['workers'])
+
+        beneficios = list(Beneficio.objects.values_list('id', flat=True))
+
         for i in range(number_users):
             with transaction.atomic():
                 empregador = self._get_random_user()
@@ -134,7 +297,7 @@ class Command(BaseCommand):
                     if l_vagas:
                         r_vaga = random.choice(l_vagas)
 
-                    vaga = self._gerar_vaga(**r_vaga)
+                    vaga = self._gerar_vaga(beneficios, **r_vaga)
                     vaga['empresa'] = empregador.empresa.id
                     vaga_serializer = VagaCreateInternalSerializer(data=vaga)
                     vaga_serializer.is_valid(raise_exception=True)
@@ -0,0 +1,29 @@
+# Generated by Django 4.1.4 on 2026-10-19 16:57
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('emprega', '0006_alter_vagas_add_column_esta_ativo'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name='empresa',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('nome_fantasia'), name='gin_trgm_ops'), name='empresa_nome_fantasia_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='empresa',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('razao_social'), name='gin_trgm_ops'), name='empresa_razao_social_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='objetivoprofissional',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('cargo'), name='gin_trgm_ops'), name='objetivo_cargo_trgm'),
+        ),
+    ]
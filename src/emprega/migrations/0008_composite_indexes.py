@@ -0,0 +1,37 @@
+# Generated by Django 4.1.4 on 2026-10-19 16:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('emprega', '0007_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='candidatura',
+            index=models.Index(fields=['usuario', 'esta_ativo'], name='candidatura_usuario_ativo_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='candidatura',
+            index=models.Index(fields=['vaga', 'esta_ativo'], name='candidatura_vaga_ativo_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='token',
+            index=models.Index(fields=['token', 'type'], name='token_token_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vaga',
+            index=models.Index(fields=['-created_at'], name='vaga_created_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vaga',
+            index=models.Index(fields=['empresa', '-created_at'], name='vaga_empresa_created_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vaga',
+            index=models.Index(fields=['modelo_trabalho', 'jornada_trabalho', 'regime_contratual', 'salario'], name='vaga_filtros_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.1.4 on 2026-10-19 17:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('emprega', '0008_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='usuario',
+            name='curriculo_embedding_modelo',
+            field=models.CharField(blank=True, max_length=255, null=True, verbose_name='Modelo do embedding'),
+        ),
+        migrations.AddField(
+            model_name='vaga',
+            name='vaga_embedding_modelo',
+            field=models.CharField(blank=True, max_length=255, null=True, verbose_name='Modelo do embedding'),
+        ),
+    ]
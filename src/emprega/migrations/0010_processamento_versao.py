@@ -0,0 +1,23 @@
+# Generated by Django 4.1.4 on 2026-10-19 17:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('emprega', '0009_embedding_modelo'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='usuario',
+            name='curriculo_versao',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Versão do currículo'),
+        ),
+        migrations.AddField(
+            model_name='vaga',
+            name='vaga_versao',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Versão da vaga'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.1.4 on 2026-10-19 18:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('emprega', '0010_processamento_versao'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='empresa',
+            name='foto_miniaturas',
+            field=models.JSONField(blank=True, editable=False, null=True, verbose_name='Miniaturas da foto'),
+        ),
+        migrations.AddField(
+            model_name='usuario',
+            name='foto_miniaturas',
+            field=models.JSONField(blank=True, editable=False, null=True, verbose_name='Miniaturas da foto'),
+        ),
+    ]
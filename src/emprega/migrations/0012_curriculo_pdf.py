@@ -0,0 +1,19 @@
+# Generated by Django 4.1.4 on 2026-10-19 18:43
+
+from django.db import migrations, models
+import emprega.validators
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('emprega', '0011_foto_miniaturas'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='usuario',
+            name='curriculo',
+            field=models.FileField(blank=True, null=True, upload_to='curriculos', validators=[emprega.validators.validate_pdf], verbose_name='Currículo'),
+        ),
+    ]
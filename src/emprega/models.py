@@ -1,17 +1,20 @@
 from datetime import timedelta
 
 from auditlog.models import AuditlogHistoryField
-from auditlog.registry import auditlog
 from django.conf import settings
 from django.contrib.auth.base_user import AbstractBaseUser, BaseUserManager
 from django.contrib.auth.models import PermissionsMixin
 from django.contrib.auth.tokens import default_token_generator
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models, transaction
+from django.db.models.functions import Upper
 from django.utils import timezone
+from django.utils.functional import cached_property
 
-from emprega.validators import validate_cpf, validate_cnpj
-from recomendacao.tasks import process_candidato, process_vaga
+from emprega import audit
+from emprega.validators import validate_cpf, validate_cnpj, validate_pdf
+from recomendacao.tasks import request_candidato_processing, request_vaga_processing
 
 
 class AbstractBaseModel(models.Model):
@@ -203,14 +206,23 @@ class Usuario(AbstractBaseUser, PermissionsMixin, AbstractBaseModel):
     foto = models.ImageField(
         verbose_name="Foto", upload_to="fotos", null=True, blank=True
     )
+    # Gerado por emprega.tasks.process_foto: origem, dimensões e variantes da foto
+    foto_miniaturas = models.JSONField(verbose_name="Miniaturas da foto", null=True, blank=True, editable=False)
     curriculo = models.FileField(
-        verbose_name="Currículo", upload_to="curriculos", null=True, blank=True
+        verbose_name="Currículo", upload_to="curriculos", null=True, blank=True, validators=[validate_pdf]
 
     )
 
     curriculo_processado = models.TextField(verbose_name="Currículo Processado", null=True, blank=True)
 
     curriculo_embedding = ArrayField(models.FloatField(), blank=True, null=True)
+    curriculo_embedding_modelo = models.CharField(
+        verbose_name="Modelo do embedding", max_length=255, null=True, blank=True
+    )
+    # Incrementada a cada pedido de processamento; resultados de versões anteriores são descartados
+    curriculo_versao = models.PositiveIntegerField(
+        verbose_name="Versão do currículo", default=0, editable=False
+    )
 
     esta_ativo = models.BooleanField(verbose_name="esta_ativo", default=True)
     esta_verificado = models.BooleanField(verbose_name="esta_verificado", default=False)
@@ -219,7 +231,7 @@ class Usuario(AbstractBaseUser, PermissionsMixin, AbstractBaseModel):
     def is_staff(self):
         return self.nivel_usuario <= UsuarioNivelChoices.ADMIN
 
-    @property
+    @cached_property
     def empresa(self):
         return Empresa.objects.filter(usuario=self).first()
 
@@ -252,11 +264,11 @@ class Candidato(Usuario):
         super(Usuario, self).save(*args, **kwargs)
 
         if process and created:
-            transaction.on_commit(lambda: process_candidato.delay(pk=self.pk))
+            transaction.on_commit(lambda: request_candidato_processing(self.pk))
         if created:
             send_email_confirmation.delay('email/confirmar_email.html', self.id)
         elif process:
-            transaction.on_commit(lambda: process_candidato.delay(pk=self.pk))
+            transaction.on_commit(lambda: request_candidato_processing(self.pk))
 
     class Meta:
         proxy = True
@@ -283,6 +295,14 @@ class ObjetivoProfissional(AbstractBaseModel):
         Usuario, on_delete=models.CASCADE, related_name="objetivo_profissional_usuario"
     )
 
+    class Meta(AbstractBaseModel.Meta):
+        indexes = [
+            GinIndex(
+                OpClass(Upper("cargo"), name="gin_trgm_ops"),
+                name="objetivo_cargo_trgm",
+            ),
+        ]
+
     def __str__(self):
         return self.usuario.nome
 
@@ -303,7 +323,7 @@ class Idioma(AbstractBaseModel):
         super(Idioma, self).save(*args, **kwargs)
 
         if process:
-            transaction.on_commit(lambda: process_candidato.delay(pk=self.usuario.pk))
+            transaction.on_commit(lambda: request_candidato_processing(self.usuario_id))
 
     def __str__(self):
         return self.nome
@@ -328,7 +348,7 @@ class FormacaoAcademica(AbstractBaseModel):
         super(FormacaoAcademica, self).save(*args, **kwargs)
 
         if process:
-            transaction.on_commit(lambda: process_candidato.delay(pk=self.usuario.pk))
+            transaction.on_commit(lambda: request_candidato_processing(self.usuario_id))
 
     def __str__(self):
         return self.instituicao + " - " + self.curso
@@ -356,7 +376,7 @@ class ExperienciaProfissional(AbstractBaseModel):
         super(ExperienciaProfissional, self).save(*args, **kwargs)
 
         if process:
-            transaction.on_commit(lambda: process_candidato.delay(pk=self.usuario.pk))
+            transaction.on_commit(lambda: request_candidato_processing(self.usuario_id))
 
     def __str__(self):
         return self.empresa + " - " + self.cargo
@@ -381,7 +401,7 @@ class CursoEspecializacao(AbstractBaseModel):
         super(CursoEspecializacao, self).save(*args, **kwargs)
 
         if process:
-            transaction.on_commit(lambda: process_candidato.delay(pk=self.usuario.pk))
+            transaction.on_commit(lambda: request_candidato_processing(self.usuario_id))
 
     def __str__(self):
         return self.instituicao + " - " + self.curso
@@ -428,6 +448,7 @@ class Empresa(AbstractBaseModel):
     foto = models.ImageField(
         verbose_name="Foto", upload_to="fotos", null=True, blank=True
     )
+    foto_miniaturas = models.JSONField(verbose_name="Miniaturas da foto", null=True, blank=True, editable=False)
     descricao = models.TextField(verbose_name="Descrição", null=True, blank=True)
 
     usuario = models.ForeignKey(
@@ -437,6 +458,18 @@ class Empresa(AbstractBaseModel):
         Endereco, on_delete=models.SET_NULL, null=True, related_name="empresa_endereco"
     )
 
+    class Meta(AbstractBaseModel.Meta):
+        indexes = [
+            GinIndex(
+                OpClass(Upper("nome_fantasia"), name="gin_trgm_ops"),
+                name="empresa_nome_fantasia_trgm",
+            ),
+            GinIndex(
+                OpClass(Upper("razao_social"), name="gin_trgm_ops"),
+                name="empresa_razao_social_trgm",
+            ),
+        ]
+
     def __str__(self):
         return self.nome_fantasia
 
@@ -485,16 +518,35 @@ class Vaga(AbstractBaseModel):
     vaga_processada = models.TextField(verbose_name="Vaga Processada", null=True, blank=True)
 
     vaga_embedding = ArrayField(models.FloatField(), blank=True, null=True)
+    vaga_embedding_modelo = models.CharField(
+        verbose_name="Modelo do embedding", max_length=255, null=True, blank=True
+    )
+    # Incrementada a cada pedido de processamento; resultados de versões anteriores são descartados
+    vaga_versao = models.PositiveIntegerField(
+        verbose_name="Versão da vaga", default=0, editable=False
+    )
 
     history = AuditlogHistoryField()
 
+    class Meta(AbstractBaseModel.Meta):
+        indexes = [
+            models.Index(fields=["-created_at"], name="vaga_created_at_idx"),
+            models.Index(
+                fields=["empresa", "-created_at"], name="vaga_empresa_created_at_idx"
+            ),
+            models.Index(
+                fields=["modelo_trabalho", "jornada_trabalho", "regime_contratual", "salario"],
+                name="vaga_filtros_idx",
+            ),
+        ]
+
     def save(self, *args, **kwargs):
         process = kwargs.pop("process", True)
 
         super(Vaga, self).save(*args, **kwargs)
 
         if process:
-            transaction.on_commit(lambda: process_vaga.delay(pk=self.pk))
+            transaction.on_commit(lambda: request_vaga_processing(self.pk))
 
     def __str__(self):
         return self.cargo
@@ -511,6 +563,10 @@ class Candidatura(AbstractBaseModel):
 
     class Meta:
         unique_together = ("vaga", "usuario")
+        indexes = [
+            models.Index(fields=["usuario", "esta_ativo"], name="candidatura_usuario_ativo_idx"),
+            models.Index(fields=["vaga", "esta_ativo"], name="candidatura_vaga_ativo_idx"),
+        ]
 
     def __str__(self):
         return self.vaga.cargo + " - " + self.usuario.cpf
@@ -566,6 +622,9 @@ class Token(AbstractBaseModel):
 
     class Meta:
         ordering = ("-created_at",)
+        indexes = [
+            models.Index(fields=["token", "type"], name="token_token_type_idx"),
+        ]
 
     def save(self, *args, **kwargs):
         if not self.token:
@@ -582,16 +641,22 @@ class Token(AbstractBaseModel):
         return default_token_generator.check_token(self.user, token)
 
 
-auditlog.register(Usuario)
-auditlog.register(Candidato)
-auditlog.register(Empregador)
-auditlog.register(Endereco)
-auditlog.register(Empresa)
-auditlog.register(Vaga)
-auditlog.register(Candidatura)
-auditlog.register(FormacaoAcademica)
-auditlog.register(ObjetivoProfissional)
-auditlog.register(Idioma)
-auditlog.register(ExperienciaProfissional)
-auditlog.register(CursoEspecializacao)
-auditlog.register(Avaliacao)
+# Colunas calculadas pelo processamento de recomendação (recomendacao.tasks) e das
+# fotos, e o last_login, gravado a cada login, ficam fora das diferenças registradas
+USUARIO_AUDIT_EXCLUDE = ["last_login", "foto_miniaturas", "curriculo_processado", "curriculo_embedding",
+                         "curriculo_embedding_modelo", "curriculo_versao"]
+VAGA_AUDIT_EXCLUDE = ["vaga_processada", "vaga_embedding", "vaga_embedding_modelo", "vaga_versao"]
+
+audit.registry.register(Usuario, exclude_fields=USUARIO_AUDIT_EXCLUDE)
+audit.registry.register(Candidato, exclude_fields=USUARIO_AUDIT_EXCLUDE)
+audit.registry.register(Empregador, exclude_fields=USUARIO_AUDIT_EXCLUDE)
+audit.registry.register(Endereco)
+audit.registry.register(Empresa, exclude_fields=["foto_miniaturas"])
+audit.registry.register(Vaga, exclude_fields=VAGA_AUDIT_EXCLUDE)
+audit.registry.register(Candidatura)
+audit.registry.register(FormacaoAcademica)
+audit.registry.register(ObjetivoProfissional)
+audit.registry.register(Idioma)
+audit.registry.register(ExperienciaProfissional)
+audit.registry.register(CursoEspecializacao)
+audit.registry.register(Avaliacao)
@@ -1,7 +1,7 @@
 from rest_framework import permissions
 from rest_framework.permissions import SAFE_METHODS
 
-from emprega.models import UsuarioNivelChoices, Vaga, Endereco
+from emprega.models import UsuarioNivelChoices, Vaga, Endereco, Candidatura, Usuario
 
 
 class OwnedByPermission(permissions.BasePermission):
@@ -14,17 +14,15 @@ class OwnedByPermission(permissions.BasePermission):
         if obj == request.user:
             return True
 
-        if hasattr(obj, "usuario") and obj.usuario == request.user:
+        if getattr(obj, "usuario_id", None) == request.user.id:
             return True
 
-        if isinstance(obj, Vaga) and obj.empresa.usuario == request.user:
+        if isinstance(obj, Vaga) and obj.empresa.usuario_id == request.user.id:
             return True
 
-        if (
-            isinstance(obj, Endereco)
-            and request.user.empresas_usuario.filter(endereco=obj).exists()
-        ):
-            return True
+        if isinstance(obj, Endereco):
+            empresa = getattr(obj, "empresa_endereco", None)
+            return empresa is not None and empresa.usuario_id == request.user.id
 
         return False
 
@@ -72,6 +70,32 @@ class IsEmpregadorPermission(permissions.BasePermission):
         return False
 
 
+class CandidaturaEmpregadorPermission(permissions.BasePermission):
+    """Empregador que recebeu uma candidatura do dono do objeto em uma de suas vagas."""
+
+    def has_permission(self, request, view):
+        if not bool(request.user) or request.user.is_anonymous:
+            return False
+
+        if request.user.nivel_usuario == UsuarioNivelChoices.EMPREGADOR:
+            return True
+
+        return False
+
+    def has_object_permission(self, request, view, obj):
+        if not bool(request.user) or request.user.is_anonymous:
+            return False
+
+        if request.user.nivel_usuario != UsuarioNivelChoices.EMPREGADOR:
+            return False
+
+        usuario_id = obj.id if isinstance(obj, Usuario) else obj.usuario_id
+
+        return Candidatura.objects.filter(
+            usuario_id=usuario_id, vaga__empresa__usuario_id=request.user.id
+        ).exists()
+
+
 class IsCandidatoPermission(permissions.BasePermission):
     def has_permission(self, request, view):
         if not bool(request.user) or request.user.is_anonymous:
@@ -88,7 +112,7 @@ class IsCandidatoPermission(permissions.BasePermission):
 
         if (
             request.user.nivel_usuario == UsuarioNivelChoices.CANDIDATO
-            and obj.usuario == request.user
+            and obj.usuario_id == request.user.id
         ):
             return True
 
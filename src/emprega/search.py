@@ -0,0 +1,28 @@
+from django.contrib.postgres.lookups import TrigramWordSimilar
+from django.db.models import Q
+from django.db.models.functions import Upper
+
+
+def trigram_filter(termo, *fields):
+    """Monta o filtro de busca textual tolerante a erros de digitação.
+
+    Cada campo é comparado por ``icontains`` ou por similaridade de trigramas
+    (``pg_trgm``). Ambas as condições usam ``UPPER(campo)``, que é a expressão
+    coberta pelos índices GIN ``gin_trgm_ops`` dos modelos.
+
+    Parâmetros:
+        termo (str): termo buscado
+        fields (str): campos (ou caminhos de relacionamento) pesquisados
+
+    Retorno:
+        Q: condições combinadas com OR
+    """
+
+    filtering = Q()
+
+    for field in fields:
+        filtering |= Q(**{f"{field}__icontains": termo}) | Q(
+            TrigramWordSimilar(Upper(field), termo)
+        )
+
+    return filtering
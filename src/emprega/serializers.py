@@ -1,12 +1,13 @@
-import os
-
 from auditlog.models import LogEntry
 from django.contrib.auth import get_user_model
-from django.db import transaction
+from django.core.files.storage import default_storage
+from django.db import models, transaction
 from django.shortcuts import get_object_or_404
 from drf_recaptcha.fields import ReCaptchaV2Field
 from rest_framework import serializers
+from rest_framework.reverse import reverse
 
+from core.middleware import TimedSerializerMixin
 from emprega.models import (
     Empresa,
     Vaga,
@@ -26,10 +27,81 @@ from emprega.models import (
     UsuarioNivelChoices,
     Beneficio, Token,
 )
-from emprega.tasks import send_email_reset_password
+from emprega.tasks import remove_arquivos, send_email_reset_password
+
+
+def substituir_arquivo(instance, field, arquivo):
+    """Troca o arquivo de ``field``; o anterior é removido pela task remove_arquivos depois do commit.
+
+    Deve ser chamada dentro de ``transaction.atomic()`` junto com o save: fora de
+    uma transação o on_commit roda na hora e o arquivo seria removido mesmo que o
+    save falhe.
+    """
+
+    anterior = getattr(instance, field).name
+
+    if anterior:
+        transaction.on_commit(lambda: remove_arquivos.delay([anterior]))
+
+    setattr(instance, field, arquivo)
+
+
+class MiniaturasField(serializers.Field):
+    """URLs das miniaturas da foto (``foto_miniaturas``), por tamanho e formato, com as dimensões da original."""
+
+    def __init__(self, **kwargs):
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def _url(self, name):
+        url = default_storage.url(name)
+        request = self.context.get("request", None)
+
+        return request.build_absolute_uri(url) if request is not None else url
+
+    def to_representation(self, value):
+        if not value:
+            return None
+
+        return {
+            "largura": value["largura"],
+            "altura": value["altura"],
+            **{
+                tamanho: {formato: self._url(name) for formato, name in formatos.items()}
+                for tamanho, formatos in value["variantes"].items()
+            },
+        }
+
 
+class DownloadField(serializers.FileField):
+    """Arquivo que só é entregue pela action de download da view, depois da verificação de permissão.
 
-class AbstractReCaptchaSerializer(serializers.ModelSerializer):
+    A representação é a URL dessa action (``DOWNLOADS``, pelo nome do campo no
+    model) em vez da URL de ``/media/``, que o nginx não serve para esses arquivos.
+    """
+
+    DOWNLOADS = {
+        "curriculo": "candidato-curriculo",
+        "certificado": "curso_especializacao-certificado",
+    }
+
+    def to_representation(self, value):
+        if not value:
+            return None
+
+        return reverse(
+            self.DOWNLOADS[value.field.name], kwargs={"pk": value.instance.pk}, request=self.context.get("request")
+        )
+
+
+class DownloadSerializerMixin:
+    serializer_field_mapping = {
+        **serializers.ModelSerializer.serializer_field_mapping,
+        models.FileField: DownloadField,
+    }
+
+
+class AbstractReCaptchaSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     recaptcha = ReCaptchaV2Field(write_only=True)
 
     def create(self, validated_data):
@@ -37,8 +109,9 @@ class AbstractReCaptchaSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class UsuarioSerializer(AbstractReCaptchaSerializer):
+class UsuarioSerializer(DownloadSerializerMixin, AbstractReCaptchaSerializer):
     foto = serializers.ImageField(required=False, allow_empty_file=True)
+    foto_miniaturas = MiniaturasField()
     empresas = serializers.PrimaryKeyRelatedField(read_only=True)
 
     class Meta:
@@ -193,17 +266,14 @@ class CandidatoSerializer(UsuarioSerializer):
         }
 
     def update(self, instance, validated_data):
-        if "password" in validated_data:
-            instance.set_password(validated_data["password"])
-        if "curriculo" in validated_data:
-            if instance.curriculo and os.path.isfile(instance.curriculo.path):
-                os.remove(instance.curriculo.path)
-            instance.curriculo = validated_data["curriculo"]
-        if "foto" in validated_data:
-            if instance.foto and os.path.isfile(instance.foto.path):
-                os.remove(instance.foto.path)
-            instance.foto = validated_data
-        return super().update(instance, validated_data)
+        with transaction.atomic():
+            if "password" in validated_data:
+                instance.set_password(validated_data["password"])
+            if "curriculo" in validated_data:
+                substituir_arquivo(instance, "curriculo", validated_data["curriculo"])
+            if "foto" in validated_data:
+                substituir_arquivo(instance, "foto", validated_data["foto"])
+            return super().update(instance, validated_data)
 
 
 class CandidatoListSerializer(UsuarioSerializer):
@@ -308,17 +378,17 @@ class CandidatoCreateInternalSerializer(CandidatoCreateSerializer):
 
 class EmpresaSerializer(AbstractReCaptchaSerializer):
     foto = serializers.ImageField(required=False, allow_null=True)
+    foto_miniaturas = MiniaturasField()
 
     class Meta:
         model = Empresa
         fields = "__all__"
 
     def update(self, instance, validated_data):
-        if "foto" in validated_data:
-            if instance.foto and os.path.isfile(instance.foto.path):
-                os.remove(instance.foto.path)
-            instance.foto = validated_data["foto"]
-        return super().update(instance, validated_data)
+        with transaction.atomic():
+            if "foto" in validated_data:
+                substituir_arquivo(instance, "foto", validated_data["foto"])
+            return super().update(instance, validated_data)
 
 
 class EnderecoSerializer(AbstractReCaptchaSerializer):
@@ -348,7 +418,7 @@ class EmpresaCreateSerializer(AbstractReCaptchaSerializer):
         }
 
 
-class BeneficioSerializer(serializers.ModelSerializer):
+class BeneficioSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Beneficio
         fields = "__all__"
@@ -366,7 +436,7 @@ class LogEntrySerializer(AbstractReCaptchaSerializer):
         fields = "__all__"
 
 
-class VagaSerializer(serializers.ModelSerializer):
+class VagaSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     beneficios = BeneficioSerializer(many=True, read_only=True)
     empresa = EmpresaVagaSerializer(read_only=True)
 
@@ -394,23 +464,37 @@ class VagaCreateSerializer(AbstractReCaptchaSerializer):
             },
         }
 
+    def validate_beneficios(self, value):
+        beneficios = set(value)
+        existentes = set(
+            Beneficio.objects.filter(id__in=beneficios).values_list("id", flat=True)
+        )
+
+        if beneficios - existentes:
+            raise serializers.ValidationError(
+                f"Benefícios inexistentes: {sorted(beneficios - existentes)}"
+            )
+
+        return beneficios
+
     def create(self, validated_data):
         validated_data.pop("recaptcha", None)
 
         with transaction.atomic():
-            beneficios = validated_data.pop("beneficios", [])
+            beneficios = validated_data.pop("beneficios", None)
             vaga = Vaga.objects.create(**validated_data)
-            for beneficio in beneficios:
-                vaga.beneficios.add(beneficio)
+            if beneficios:
+                vaga.beneficios.add(*beneficios)
             return vaga
 
     def update(self, instance, validated_data):
         with transaction.atomic():
-            beneficios = validated_data.pop("beneficios", [])
+            beneficios = validated_data.pop("beneficios", None)
             instance = super().update(instance, validated_data)
-            instance.beneficios.clear()
-            for beneficio in beneficios:
-                instance.beneficios.add(beneficio)
+            if beneficios is not None:
+                atuais = set(instance.beneficios.values_list("id", flat=True))
+                instance.beneficios.remove(*(atuais - beneficios))
+                instance.beneficios.add(*(beneficios - atuais))
             return instance
 
 
@@ -496,7 +580,7 @@ class IdiomaInternalSerializer(IdiomaSerializer):
         return super().create(validated_data)
 
 
-class CursoEspecializacaoSerializer(AbstractReCaptchaSerializer):
+class CursoEspecializacaoSerializer(DownloadSerializerMixin, AbstractReCaptchaSerializer):
     class Meta:
         model = CursoEspecializacao
         fields = "__all__"
@@ -505,10 +589,10 @@ class CursoEspecializacaoSerializer(AbstractReCaptchaSerializer):
         }
 
     def update(self, instance, validated_data):
-        if "certificado" in validated_data:
-            if instance.certificado and os.path.isfile(instance.certificado.path):
-                os.remove(instance.certificado.path)
-            instance.certificado = validated_data["certificado"]
+        with transaction.atomic():
+            if "certificado" in validated_data:
+                substituir_arquivo(instance, "certificado", validated_data["certificado"])
+            return super().update(instance, validated_data)
 
 
 class CursoEspecializacaoInternalSerializer(CursoEspecializacaoSerializer):
@@ -520,7 +604,7 @@ class CursoEspecializacaoInternalSerializer(CursoEspecializacaoSerializer):
         return super().create(validated_data)
 
 
-class CandidaturaSerializer(serializers.ModelSerializer):
+class CandidaturaSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Candidatura
         fields = "__all__"
@@ -1,7 +1,10 @@
+from django.db import transaction
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 
-from emprega.models import Vaga, Candidatura
+from emprega.models import Vaga, Candidatura, Usuario, Candidato, Empregador, Empresa
+from emprega.tasks import process_foto
+from emprega.thumbnails import desatualizada
 
 
 @receiver(post_save, sender=Vaga)
@@ -10,3 +13,16 @@ def vaga_post_save(sender, instance, created, **kwargs):
         Candidatura.objects.filter(vaga=instance).update(esta_ativo=False)
 
     return None
+
+
+@receiver(post_save, sender=Usuario)
+@receiver(post_save, sender=Candidato)
+@receiver(post_save, sender=Empregador)
+@receiver(post_save, sender=Empresa)
+def foto_post_save(sender, instance, raw=False, **kwargs):
+    if raw or not desatualizada(instance):
+        return None
+
+    transaction.on_commit(lambda: process_foto.delay(sender._meta.label, instance.pk))
+
+    return None
@@ -1,11 +1,15 @@
 from celery import shared_task
+from django.apps import apps
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
 from django.core.mail import send_mail
+from django.db.models import Q
 from django.template.loader import render_to_string
 from django.utils.html import strip_tags
 
 from emprega.models import Token, TokenTypeChoices
+from emprega.thumbnails import arquivos, desatualizada, gerar_miniaturas
 
 
 @shared_task(max_retries=3, default_retry_delay=60)
@@ -46,3 +50,49 @@ def send_email_reset_password(template: str, user_id: int):
         [user.email],
         html_message=html_message
     )
+
+
+@shared_task(max_retries=3, default_retry_delay=60)
+def write_log_entries(entries: list):
+    from emprega.audit import bulk_write, deserialize
+
+    return len(bulk_write([deserialize(entry) for entry in entries]))
+
+
+@shared_task
+def prune_log_entries(days: int = None):
+    from emprega.audit import prune
+
+    return prune(days or settings.AUDITLOG_RETENTION_DAYS)
+
+
+@shared_task(max_retries=3, default_retry_delay=60)
+def process_foto(model: str, pk: int):
+    """Gera as miniaturas da foto atual de ``model`` (``app_label.Model``) e remove as anteriores.
+
+    Grava com ``update`` filtrando pela mesma foto, para não disparar os sinais
+    do modelo nem sobrescrever uma foto enviada enquanto a task rodava.
+    """
+
+    model = apps.get_model(model)
+    instance = model._base_manager.filter(pk=pk).first()
+
+    if instance is None or not desatualizada(instance):
+        return None
+
+    foto = instance.foto.name
+    miniaturas = gerar_miniaturas(instance.foto) if foto else None
+    mesma_foto = Q(foto=foto) if foto else Q(foto__isnull=True) | Q(foto="")
+    atualizadas = model._base_manager.filter(mesma_foto, pk=pk).update(foto_miniaturas=miniaturas)
+    removidas = arquivos(instance.foto_miniaturas) if atualizadas else arquivos(miniaturas)
+
+    for nome in removidas:
+        instance.foto.storage.delete(nome)
+
+    return miniaturas
+
+
+@shared_task(max_retries=3, default_retry_delay=60)
+def remove_arquivos(names: list):
+    for name in names:
+        default_storage.delete(name)
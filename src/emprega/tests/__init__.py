@@ -1,13 +1,19 @@
+from emprega.tests.auditlog import *
 from emprega.tests.avaliacao import *
 from emprega.tests.candidato import *
 from emprega.tests.candidatura import *
 from emprega.tests.curso_especializacao import *
+from emprega.tests.downloads import *
 from emprega.tests.empregador import *
 from emprega.tests.empresa import *
 from emprega.tests.endereco import *
 from emprega.tests.experiencia_profissional import *
 from emprega.tests.formacao_academica import *
 from emprega.tests.idioma import *
+from emprega.tests.loadtest import *
 from emprega.tests.objetivo_profissional import *
+from emprega.tests.request_metrics import *
+from emprega.tests.thumbnails import *
+from emprega.tests.uploads import *
 from emprega.tests.user import *
 from emprega.tests.vaga import *
@@ -0,0 +1,186 @@
+from datetime import timedelta
+from unittest import mock
+
+from auditlog.context import disable_auditlog
+from auditlog.models import LogEntry
+from django.core.management import call_command
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from emprega.audit import _Pending, buffered, prune, set_actor
+from emprega.factories import EnderecoFactory, UserFactory, VagaFactory
+from emprega.models import UsuarioNivelChoices
+from emprega.tasks import write_log_entries
+
+
+class AuditLogTestCase(APITestCase):
+    def _pending(self, callbacks):
+        return [callback.entry for callback in callbacks if isinstance(callback, _Pending)]
+
+    def test_on_commit(self):
+        logs = LogEntry.objects.count()
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            enderecos = EnderecoFactory.create_batch(3)
+            enderecos[0].cidade = "Outra"
+            enderecos[0].save()
+
+        self.assertEqual(len(self._pending(callbacks)), 4)
+        self.assertEqual(LogEntry.objects.count(), logs)
+
+        # As entradas confirmadas dentro de buffered() são gravadas juntas na saída
+        with self.assertNumQueries(1):
+            with buffered():
+                for callback in callbacks:
+                    callback()
+
+        self.assertEqual(LogEntry.objects.count(), logs + 4)
+        self.assertEqual(LogEntry.objects.get(action=LogEntry.Action.UPDATE).changes_dict["cidade"][1], "Outra")
+
+    def test_buffered(self):
+        logs = LogEntry.objects.count()
+
+        # Os INSERTs dos endereços e um único bulk_create na saída do bloco
+        with self.assertNumQueries(3):
+            with buffered():
+                EnderecoFactory.create_batch(2)
+
+        self.assertEqual(LogEntry.objects.count(), logs + 2)
+
+    def test_request(self):
+        endereco = EnderecoFactory()
+        self.client.force_authenticate(user=UserFactory(nivel_usuario=UsuarioNivelChoices.ADMIN))
+
+        # Sem captureOnCommitCallbacks: a entrada é gravada ao final da requisição
+        response = self.client.patch(f"/endereco/{endereco.id}/", data={"cidade": "Outra"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(LogEntry.objects.get_for_object(endereco).get().changes_dict["cidade"][1], "Outra")
+
+    def test_buffered_atomic(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            with buffered() as buffer:
+                with transaction.atomic():
+                    EnderecoFactory()
+
+                EnderecoFactory()
+
+        # A entrada da transação aberta dentro do bloco continua esperando o commit
+        self.assertEqual(len(self._pending(callbacks)), 1)
+        self.assertEqual([len(entries) for entries in buffer.values()], [1])
+
+    def test_savepoint_rollback(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            EnderecoFactory()
+
+            try:
+                with transaction.atomic():
+                    EnderecoFactory()
+                    raise ValueError
+            except ValueError:
+                pass
+
+        self.assertEqual(LogEntry.objects.filter(action=LogEntry.Action.CREATE).count(), 1)
+
+    def test_savepoint_reused(self):
+        # O mesmo Atomic (usado como decorador) abre um savepoint novo a cada chamada
+        atomic = transaction.atomic()
+
+        @atomic
+        def criar(falhar):
+            EnderecoFactory()
+
+            if falhar:
+                raise ValueError
+
+        with self.captureOnCommitCallbacks(execute=True):
+            criar(False)
+
+            with self.assertRaises(ValueError):
+                criar(True)
+
+        self.assertEqual(LogEntry.objects.filter(action=LogEntry.Action.CREATE).count(), 1)
+
+    def test_actor(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            user = UserFactory()
+
+            with set_actor(user, remote_addr="10.0.0.1"):
+                endereco = EnderecoFactory()
+
+        entry = LogEntry.objects.get_for_object(endereco).get()
+
+        self.assertEqual(entry.actor, user)
+        self.assertEqual(entry.remote_addr, "10.0.0.1")
+
+    def test_disabled(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            with disable_auditlog():
+                EnderecoFactory()
+
+        self.assertEqual(self._pending(callbacks), [])
+
+    def test_excluded_fields(self):
+        with self.captureOnCommitCallbacks():
+            vaga = VagaFactory()
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            vaga.vaga_embedding = [0.1, 0.2]
+            vaga.vaga_processada = "processada"
+            vaga.save(update_fields=["vaga_embedding", "vaga_processada"])
+
+        self.assertEqual(self._pending(callbacks), [])
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            vaga.cargo = "Outro cargo"
+            vaga.vaga_embedding = [0.3, 0.4]
+            vaga.save()
+
+        entry, = self._pending(callbacks)
+
+        self.assertEqual(set(entry.changes_dict), {"cargo"})
+
+    @override_settings(AUDITLOG_ASYNC=True)
+    def test_async(self):
+        with mock.patch.object(write_log_entries, "delay", side_effect=write_log_entries) as delay:
+            with self.captureOnCommitCallbacks() as callbacks:
+                EnderecoFactory.create_batch(2)
+
+            timestamp = self._pending(callbacks)[0].timestamp - timedelta(minutes=5)
+
+            for entry in self._pending(callbacks):
+                entry.timestamp = timestamp
+
+            with buffered():
+                for callback in callbacks:
+                    callback()
+
+        delay.assert_called_once()
+        self.assertEqual(len(delay.call_args.args[0]), 2)
+        self.assertEqual(
+            list(LogEntry.objects.filter(action=LogEntry.Action.CREATE).values_list("timestamp", flat=True)),
+            [timestamp, timestamp],
+        )
+
+
+class PruneAuditLogTestCase(TestCase):
+    def setUp(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.enderecos = EnderecoFactory.create_batch(5)
+
+        LogEntry.objects.filter(object_id__in=[endereco.pk for endereco in self.enderecos[:3]]).update(
+            timestamp=timezone.now() - timedelta(days=60)
+        )
+
+    def test_prune(self):
+        self.assertEqual(prune(30, batch_size=2), 3)
+        self.assertEqual(LogEntry.objects.count(), 2)
+
+    def test_command(self):
+        call_command("prune_auditlog", "--days", "90", stdout=mock.MagicMock())
+        self.assertEqual(LogEntry.objects.count(), 5)
+
+        call_command("prune_auditlog", "--days", "30", stdout=mock.MagicMock())
+        self.assertEqual(LogEntry.objects.count(), 2)
@@ -0,0 +1,115 @@
+import shutil
+import tempfile
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from emprega.factories import CandidaturaFactory, CursoEspecializacaoFactory, UserFactory
+from emprega.models import UsuarioNivelChoices
+
+PDF = b"%PDF-1.4\n%conteudo\n%%EOF\n"
+
+
+class DownloadTestCase(APITestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.media_settings = override_settings(MEDIA_ROOT=self.media_root, MEDIA_ACCEL_REDIRECT=False)
+        self.media_settings.enable()
+
+        self.candidato = UserFactory(
+            nivel_usuario=UsuarioNivelChoices.CANDIDATO,
+            curriculo=SimpleUploadedFile("curriculo.pdf", PDF, content_type="application/pdf"),
+        )
+        self.curso = CursoEspecializacaoFactory(
+            usuario=self.candidato,
+            certificado=SimpleUploadedFile("certificado.pdf", PDF, content_type="application/pdf"),
+        )
+        self.empregador = UserFactory(nivel_usuario=UsuarioNivelChoices.EMPREGADOR)
+        CandidaturaFactory(usuario=self.candidato, vaga__empresa__usuario=self.empregador)
+        self.uri = f"/candidato/{self.candidato.id}/curriculo/"
+
+    def tearDown(self):
+        self.media_settings.disable()
+        shutil.rmtree(self.media_root)
+
+    def test_owner(self):
+        self.client.force_authenticate(user=self.candidato)
+
+        response = self.client.get(self.uri)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b"".join(response.streaming_content), PDF)
+        self.assertIn("ETag", response)
+        self.assertIn("Last-Modified", response)
+        self.assertNotIn("X-Accel-Redirect", response)
+
+    def test_empregador(self):
+        self.client.force_authenticate(user=self.empregador)
+
+        self.assertEqual(self.client.get(self.uri).status_code, 200)
+
+    def test_empregador_sem_candidatura(self):
+        self.client.force_authenticate(user=UserFactory(nivel_usuario=UsuarioNivelChoices.EMPREGADOR))
+
+        self.assertEqual(self.client.get(self.uri).status_code, 403)
+        self.assertEqual(self.client.get(f"/curso_especializacao/{self.curso.id}/certificado/").status_code, 403)
+
+    def test_other_candidato(self):
+        self.client.force_authenticate(user=UserFactory(nivel_usuario=UsuarioNivelChoices.CANDIDATO))
+
+        self.assertEqual(self.client.get(self.uri).status_code, 403)
+        self.assertEqual(self.client.get(f"/curso_especializacao/{self.curso.id}/certificado/").status_code, 403)
+
+    def test_not_modified(self):
+        self.client.force_authenticate(user=self.empregador)
+
+        response = self.client.get(self.uri)
+        cached = self.client.get(self.uri, HTTP_IF_NONE_MATCH=response["ETag"])
+
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(cached["ETag"], response["ETag"])
+
+        cached = self.client.get(self.uri, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"])
+
+        self.assertEqual(cached.status_code, 304)
+
+    @override_settings(MEDIA_ACCEL_REDIRECT=True)
+    def test_accel_redirect(self):
+        self.client.force_authenticate(user=self.empregador)
+
+        response = self.client.get(self.uri)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["X-Accel-Redirect"], f"/protected/{self.candidato.curriculo.name}")
+        self.assertEqual(response["Content-Type"], "application/pdf")
+        self.assertEqual(response.content, b"")
+
+    def test_missing_file(self):
+        self.client.force_authenticate(user=self.empregador)
+        candidato = UserFactory(nivel_usuario=UsuarioNivelChoices.CANDIDATO, curriculo=None)
+        CandidaturaFactory(usuario=candidato, vaga__empresa__usuario=self.empregador)
+
+        self.assertEqual(self.client.get(f"/candidato/{candidato.id}/curriculo/").status_code, 404)
+
+    @override_settings(MEDIA_ACCEL_REDIRECT=True)
+    def test_certificado(self):
+        self.client.force_authenticate(user=self.empregador)
+
+        response = self.client.get(f"/curso_especializacao/{self.curso.id}/certificado/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["X-Accel-Redirect"], f"/protected/{self.curso.certificado.name}")
+
+    def test_serializer_url(self):
+        self.client.force_authenticate(user=self.candidato)
+
+        response = self.client.get(f"/candidato/{self.candidato.id}/")
+
+        self.assertEqual(response.data["curriculo"], f"http://testserver{self.uri}")
+
+        response = self.client.get(f"/curso_especializacao/{self.curso.id}/")
+
+        self.assertEqual(
+            response.data["certificado"], f"http://testserver/curso_especializacao/{self.curso.id}/certificado/"
+        )
@@ -1,3 +1,4 @@
+from django.contrib.contenttypes.models import ContentType
 from rest_framework import status
 from rest_framework.test import APITestCase, APIClient
 
@@ -5,7 +6,7 @@ from emprega.factories import (
     UserFactory,
     EmpresaFactory,
 )
-from emprega.models import UsuarioNivelChoices
+from emprega.models import UsuarioNivelChoices, Endereco
 
 
 class AdminEnderecoTestCase(APITestCase):
@@ -119,6 +120,30 @@ class EmpregadorEnderecoTestCase(AdminEnderecoTestCase):
     def test_detail(self):
         super().test_detail()
 
+    def test_detail_queries(self):
+        endereco = EmpresaFactory(usuario=self.user).endereco
+
+        with self.assertNumQueries(1):
+            response = self.client.get(f"{self.uri}{endereco.id}/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_update_queries(self):
+        endereco = EmpresaFactory(usuario=self.user).endereco
+        ContentType.objects.get_for_model(Endereco)
+
+        with self.assertNumQueries(4):
+            response = self.client.patch(f"{self.uri}{endereco.id}/", data={"cep": "75000000"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_update_alheio(self):
+        endereco = EmpresaFactory().endereco
+
+        response = self.client.patch(f"{self.uri}{endereco.id}/", data={"cep": "75000000"})
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
 
 class CandidatoEnderecoTestCase(AdminEnderecoTestCase):
     def setUp(self):
@@ -1,3 +1,4 @@
+from django.contrib.contenttypes.models import ContentType
 from rest_framework import status
 from rest_framework.test import APITestCase, APIClient
 
@@ -153,6 +154,23 @@ class CandidatoIdiomaTestCase(AdminIdiomaTestCase):
 
         self.client.force_authenticate(user=self.user)
 
+    def test_detail_queries(self):
+        item = IdiomaFactory(usuario=self.user)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(f"{self.uri}{item.id}/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_update_queries(self):
+        item = IdiomaFactory(usuario=self.user)
+        ContentType.objects.get_for_model(Idioma)
+
+        with self.assertNumQueries(5):
+            response = self.client.patch(f"{self.uri}{item.id}/", data={"nome": "Inglês"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
 
 class GuestIdiomaTestCase(AdminIdiomaTestCase):
     def setUp(self):
@@ -0,0 +1,30 @@
+from django.test import LiveServerTestCase, override_settings
+
+from emprega.factories import UserFactory
+from emprega.loadtest import Stats, run
+from emprega.models import UsuarioNivelChoices
+
+
+@override_settings(REQUEST_METRICS_HEADERS=True)
+class LoadTestTestCase(LiveServerTestCase):
+    def setUp(self):
+        self.candidato = UserFactory(nivel_usuario=UsuarioNivelChoices.CANDIDATO, password="123456")
+        self.users = {"candidato": [{"pk": self.candidato.pk, "username": self.candidato.cpf}], "empregador": []}
+
+    def test_run(self):
+        stats = run(self.live_server_url, self.users, "123456", {"login": 1, "profile_edit": 1},
+                    concurrency=2, duration=1, seed=1)
+        report = stats.report()
+
+        self.assertEqual(report["failures"], [])
+        self.assertGreater(report["requests"], 0)
+
+        for endpoint, row in report["endpoints"].items():
+            self.assertEqual(row["errors"], 0, endpoint)
+            self.assertGreater(row["queries_avg"], 0, endpoint)
+            self.assertLessEqual(row["p50"], row["p99"])
+
+    def test_login_failure(self):
+        stats = run(self.live_server_url, self.users, "errada", {"profile_edit": 1}, concurrency=1, duration=1)
+
+        self.assertEqual(len(stats.report()["failures"]), 1)
@@ -0,0 +1,68 @@
+import itertools
+from unittest import mock
+
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from core.metrics import get_sink
+from core.middleware import QueryBudgetExceeded
+from emprega.factories import BeneficioFactory, UserFactory
+from emprega.models import UsuarioNivelChoices
+
+
+class RequestMetricsTestCase(APITestCase):
+    def setUp(self):
+        self.user = UserFactory(nivel_usuario=UsuarioNivelChoices.CANDIDATO)
+        self.client.force_authenticate(user=self.user)
+        BeneficioFactory.create_batch(3)
+
+    @override_settings(REQUEST_METRICS_HEADERS=True)
+    def test_headers(self):
+        response = self.client.get("/beneficio/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(int(response["X-Query-Count"]), 0)
+        self.assertRegex(
+            response["Server-Timing"],
+            r"^db;dur=[\d.]+, serializer;dur=[\d.]+, render;dur=[\d.]+, view;dur=[\d.]+, total;dur=[\d.]+$",
+        )
+
+    def test_no_headers(self):
+        response = self.client.get("/beneficio/")
+
+        self.assertNotIn("X-Query-Count", response)
+
+    @override_settings(QUERY_BUDGETS={"GET beneficio-list": 0})
+    def test_budget(self):
+        with self.assertRaisesMessage(QueryBudgetExceeded, "beneficio-list"):
+            self.client.get("/beneficio/")
+
+    @override_settings(QUERY_BUDGETS={"beneficio-list": 0, "GET beneficio-list": 100})
+    def test_budget_method(self):
+        self.assertEqual(self.client.get("/beneficio/").status_code, 200)
+
+    @override_settings(REQUEST_METRICS=True, METRICS_SINK="memory", METRICS_OPTIONS={})
+    def test_histograms(self):
+        self.client.get("/beneficio/")
+
+        sink = get_sink()
+        tags = (("method", "GET"), ("route", "beneficio-list"))
+
+        self.assertEqual(len(sink.values["http.request", tags + (("status", 200),)]), 1)
+        self.assertEqual(len(sink.values["http.serializer", tags]), 1)
+        self.assertEqual(len(sink.values["http.render", tags]), 1)
+        self.assertEqual(len(sink.values["http.queries", tags]), 1)
+
+    @override_settings(REQUEST_METRICS=True, METRICS_SINK="memory", METRICS_OPTIONS={})
+    def test_serializer_time(self):
+        tempos = itertools.count()
+
+        # Cada chamada a perf_counter avança 1s: o tempo de serialização é o do
+        # to_representation de cada um dos 3 benefícios, sem a renderização
+        with mock.patch("core.middleware.time.perf_counter", lambda: next(tempos)):
+            self.client.get("/beneficio/")
+
+        tags = (("method", "GET"), ("route", "beneficio-list"))
+
+        self.assertEqual(get_sink().values["http.serializer", tags], [3])
+        self.assertEqual(get_sink().values["http.render", tags], [1])
@@ -0,0 +1,136 @@
+import os
+import shutil
+import tempfile
+from io import BytesIO
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from PIL import Image
+from rest_framework.test import APITestCase
+
+from emprega.factories import EmpresaFactory, UserFactory
+from emprega.models import Empresa, Usuario, UsuarioNivelChoices
+from emprega.tasks import process_foto
+from emprega.thumbnails import desatualizada, gerar_miniaturas
+
+
+def imagem(nome="foto.jpg", tamanho=(300, 200), formato="JPEG", modo="RGB", orientacao=None):
+    conteudo = BytesIO()
+    exif = Image.Exif()
+
+    if orientacao:
+        exif[0x0112] = orientacao
+
+    Image.new(modo, tamanho, "red").save(conteudo, formato, **({"exif": exif} if formato == "JPEG" else {}))
+
+    return SimpleUploadedFile(nome, conteudo.getvalue(), content_type=f"image/{formato.lower()}")
+
+
+class MediaRootMixin:
+    def setUp(self):
+        super().setUp()
+        self.media_root = tempfile.mkdtemp()
+        self.media_settings = override_settings(MEDIA_ROOT=self.media_root)
+        self.media_settings.enable()
+
+    def tearDown(self):
+        self.media_settings.disable()
+        shutil.rmtree(self.media_root)
+        super().tearDown()
+
+
+@override_settings(FOTO_MINIATURAS={"pequena": 64, "media": 128}, FOTO_MINIATURA_FORMATOS=["webp", "jpeg"])
+class ThumbnailTestCase(MediaRootMixin, TestCase):
+    def test_miniaturas(self):
+        usuario = UserFactory(foto=imagem(orientacao=6))
+        miniaturas = gerar_miniaturas(usuario.foto)
+
+        # Orientação 6 (90°): a foto de 300x200 é exibida em pé
+        self.assertEqual((miniaturas["largura"], miniaturas["altura"]), (200, 300))
+        self.assertEqual(miniaturas["origem"], usuario.foto.name)
+
+        for tamanho, lado in {"pequena": 64, "media": 128}.items():
+            for formato in ["webp", "jpeg"]:
+                with Image.open(os.path.join(self.media_root, miniaturas["variantes"][tamanho][formato])) as miniatura:
+                    self.assertEqual(miniatura.size, (lado, lado))
+                    self.assertEqual(miniatura.format, formato.upper())
+                    self.assertEqual(dict(miniatura.getexif()), {})
+
+    def test_transparencia(self):
+        usuario = UserFactory(foto=imagem("foto.png", formato="PNG", modo="RGBA"))
+        miniaturas = gerar_miniaturas(usuario.foto)
+
+        with Image.open(os.path.join(self.media_root, miniaturas["variantes"]["pequena"]["jpeg"])) as miniatura:
+            self.assertEqual(miniatura.mode, "RGB")
+
+    def test_process_foto(self):
+        usuario = UserFactory(foto=imagem())
+
+        process_foto(Usuario._meta.label, usuario.pk)
+        usuario.refresh_from_db()
+        anteriores = usuario.foto_miniaturas
+
+        self.assertFalse(desatualizada(usuario))
+        self.assertIsNone(process_foto(Usuario._meta.label, usuario.pk))
+
+        usuario.foto = imagem("nova.jpg")
+        usuario.save()
+        process_foto(Usuario._meta.label, usuario.pk)
+        usuario.refresh_from_db()
+
+        self.assertEqual(usuario.foto_miniaturas["origem"], usuario.foto.name)
+        self.assertFalse(os.path.exists(os.path.join(self.media_root, anteriores["variantes"]["pequena"]["webp"])))
+
+        usuario.foto = None
+        usuario.save()
+        process_foto(Usuario._meta.label, usuario.pk)
+        usuario.refresh_from_db()
+
+        self.assertIsNone(usuario.foto_miniaturas)
+
+    def test_tamanhos_alterados(self):
+        empresa = EmpresaFactory(foto=imagem())
+        process_foto(Empresa._meta.label, empresa.pk)
+        empresa.refresh_from_db()
+
+        with override_settings(FOTO_MINIATURAS={"pequena": 64}):
+            self.assertTrue(desatualizada(empresa))
+
+    def test_enqueue_on_commit(self):
+        with mock.patch.object(process_foto, "delay") as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                usuario = UserFactory(foto=imagem())
+
+            delay.assert_called_once_with("emprega.Usuario", usuario.pk)
+            delay.reset_mock()
+
+            with self.captureOnCommitCallbacks(execute=True):
+                UserFactory()
+
+            delay.assert_not_called()
+
+
+@override_settings(FOTO_MINIATURAS={"pequena": 64}, FOTO_MINIATURA_FORMATOS=["webp"])
+class ThumbnailSerializerTestCase(MediaRootMixin, APITestCase):
+    def test_empresa(self):
+        user = UserFactory(nivel_usuario=UsuarioNivelChoices.EMPREGADOR)
+        empresa = EmpresaFactory(usuario=user, foto=imagem())
+        process_foto(Empresa._meta.label, empresa.pk)
+
+        self.client.force_authenticate(user=user)
+        response = self.client.get(f"/empresa/{empresa.id}/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["foto_miniaturas"]["largura"], 300)
+        self.assertRegex(response.data["foto_miniaturas"]["pequena"]["webp"],
+                         r"^http://testserver/media/fotos/miniaturas/foto\w*_pequena\.webp$")
+
+    def test_sem_foto(self):
+        user = UserFactory(nivel_usuario=UsuarioNivelChoices.ADMIN)
+
+        self.client.force_authenticate(user=user)
+        response = self.client.get(f"/usuario/{user.id}/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(response.data["foto_miniaturas"])
@@ -0,0 +1,125 @@
+import shutil
+import tempfile
+from io import BytesIO
+from unittest import mock
+
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, override_settings
+from rest_framework.test import APITestCase
+
+from core.uploads import FileTooLarge, SizeLimitUploadHandler
+from emprega.factories import CursoEspecializacaoFactory, UserFactory
+from emprega.models import Candidato, UsuarioNivelChoices
+from emprega.tasks import remove_arquivos
+from emprega.validators import validate_pdf
+
+PDF = b"%PDF-1.4\n" + b"0" * 4096 + b"\n%%EOF\n"
+
+
+class SizeLimitUploadHandlerTestCase(SimpleTestCase):
+    @override_settings(UPLOAD_MAX_SIZE=100)
+    def test_limite(self):
+        handler = SizeLimitUploadHandler()
+        handler.new_file("curriculo", "curriculo.pdf", "application/pdf", None)
+
+        self.assertEqual(handler.receive_data_chunk(b"0" * 60, 0), b"0" * 60)
+
+        with self.assertRaises(FileTooLarge):
+            handler.receive_data_chunk(b"0" * 60, 60)
+
+    def test_validate_pdf(self):
+        validate_pdf(BytesIO(PDF))
+        # A assinatura pode vir depois de alguns bytes
+        validate_pdf(BytesIO(b"\xef\xbb\xbf" + PDF))
+
+        with self.assertRaises(ValidationError):
+            validate_pdf(BytesIO(b"\x89PNG\r\n\x1a\n" + b"0" * 4096))
+
+
+class CurriculoUploadTestCase(APITestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.media_settings = override_settings(MEDIA_ROOT=self.media_root)
+        self.media_settings.enable()
+
+        self.user = UserFactory(
+            nivel_usuario=UsuarioNivelChoices.CANDIDATO,
+            curriculo=SimpleUploadedFile("antigo.pdf", PDF, content_type="application/pdf"),
+        )
+        self.uri = f"/candidato/{self.user.id}/"
+        self.client.force_authenticate(user=self.user)
+
+    def tearDown(self):
+        self.media_settings.disable()
+        shutil.rmtree(self.media_root)
+
+    def _upload(self, conteudo, nome="curriculo.pdf"):
+        return self.client.patch(
+            self.uri, {"curriculo": SimpleUploadedFile(nome, conteudo, content_type="application/pdf")},
+            format="multipart",
+        )
+
+    def test_upload(self):
+        antigo = self.user.curriculo.name
+
+        with mock.patch.object(remove_arquivos, "delay") as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self._upload(PDF)
+
+        self.assertEqual(response.status_code, 200)
+        self.user.refresh_from_db()
+        self.assertNotEqual(self.user.curriculo.name, antigo)
+        self.assertEqual(self.user.curriculo.read(), PDF)
+        delay.assert_called_once_with([antigo])
+
+    def test_save_falha(self):
+        # O arquivo anterior só é removido se a atualização for gravada
+        with mock.patch.object(remove_arquivos, "delay") as delay, \
+                mock.patch.object(Candidato, "save", side_effect=RuntimeError):
+            with self.captureOnCommitCallbacks(execute=True):
+                with self.assertRaises(RuntimeError):
+                    self._upload(PDF)
+
+        delay.assert_not_called()
+
+    def test_certificado(self):
+        curso = CursoEspecializacaoFactory(
+            usuario=self.user, certificado=SimpleUploadedFile("antigo.pdf", PDF, content_type="application/pdf")
+        )
+        antigo = curso.certificado.name
+
+        with mock.patch.object(remove_arquivos, "delay") as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.patch(
+                    f"/curso_especializacao/{curso.id}/",
+                    {"certificado": SimpleUploadedFile("novo.pdf", PDF, content_type="application/pdf")},
+                    format="multipart",
+                )
+
+        self.assertEqual(response.status_code, 200)
+        curso.refresh_from_db()
+        self.assertNotEqual(curso.certificado.name, antigo)
+        delay.assert_called_once_with([antigo])
+
+    def test_nao_pdf(self):
+        response = self._upload(b"MZ\x90\x00" + b"0" * 100, "curriculo.exe")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("curriculo", response.data)
+
+    @override_settings(UPLOAD_MAX_SIZE=1024)
+    def test_tamanho(self):
+        antigo = self.user.curriculo.name
+
+        response = self._upload(PDF)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("excede", response.data["detail"])
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.curriculo.name, antigo)
+
+    @override_settings(FILE_UPLOAD_MAX_MEMORY_SIZE=1024)
+    def test_arquivo_temporario(self):
+        # Acima de FILE_UPLOAD_MAX_MEMORY_SIZE o upload é gravado em disco, em pedaços
+        self.assertEqual(self._upload(PDF).status_code, 200)
@@ -1,3 +1,5 @@
+from django.contrib.contenttypes.models import ContentType
+from django.test import override_settings
 from rest_framework import status
 from rest_framework.test import APITestCase, APIClient
 
@@ -5,6 +7,7 @@ from emprega.factories import (
     UserFactory,
     EmpresaFactory,
     VagaFactory,
+    BeneficioFactory,
 )
 from emprega.models import UsuarioNivelChoices, Vaga
 
@@ -97,6 +100,27 @@ class AdminVagaTestCase(APITestCase):
 
         self.assertEqual(len(json_response), 2)
 
+    def test_filter_empresa(self):
+        padaria = EmpresaFactory(nome_fantasia="Padaria Central", razao_social="Central Alimentos LTDA")
+        oficina = EmpresaFactory(nome_fantasia="Oficina Mecânica", razao_social="Auto Peças LTDA")
+
+        vaga = VagaFactory(empresa=padaria)
+        VagaFactory(empresa=oficina)
+
+        for termo in ["padaria", "Padria", "alimentos"]:
+            response = self.client.get(self.uri, {"empresa": termo})
+
+            self.assertEqual(
+                response.status_code, self.retrieve_status or status.HTTP_200_OK
+            )
+
+            if self.retrieve_status and self.retrieve_status != status.HTTP_200_OK:
+                return
+
+            json_response = response.json()
+
+            self.assertEqual([item["id"] for item in json_response["results"]], [vaga.id])
+
     def test_detail(self):
         if not self.empresa:
             self.user = UserFactory(nivel_usuario=UsuarioNivelChoices.EMPREGADOR)
@@ -213,6 +237,139 @@ class EmpregadorVagaTestCase(AdminVagaTestCase):
 
         self.client.force_authenticate(user=self.user)
 
+    def _vaga_data(self, vaga):
+        # O cache de ContentType do auditlog é global; aquecê-lo deixa a
+        # contagem de queries independente da ordem dos testes.
+        ContentType.objects.get_for_model(Vaga)
+
+        return {
+            "recaptcha": "passed",
+            "cargo": vaga.cargo,
+            "atividades": vaga.atividades,
+            "requisitos": vaga.requisitos,
+            "esta_ativo": vaga.esta_ativo,
+            "pessoa_deficiencia": vaga.pessoa_deficiencia,
+            "salario": vaga.salario,
+            "jornada_trabalho": vaga.jornada_trabalho,
+            "modelo_trabalho": vaga.modelo_trabalho,
+            "regime_contratual": vaga.regime_contratual,
+            "sexo": vaga.sexo,
+            "idade_minima": vaga.idade_minima,
+            "idade_maxima": vaga.idade_maxima,
+            "quantidade_vagas": vaga.quantidade_vagas,
+        }
+
+    @override_settings(DRF_RECAPTCHA_TESTING=True)
+    def test_create_queries(self):
+        data = self._vaga_data(VagaFactory.stub(empresa=self.empresa))
+        data["empresa"] = self.empresa.id
+
+        # Com os callbacks do commit: o INSERT do auditlog e o UPDATE de vaga_versao
+        with self.assertNumQueries(7):
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post(self.uri, data=data)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.json()["empresa"], self.empresa.id)
+
+    @override_settings(DRF_RECAPTCHA_TESTING=True)
+    def test_create_queries_empresa_padrao(self):
+        data = self._vaga_data(VagaFactory.stub(empresa=self.empresa))
+
+        with self.assertNumQueries(6):
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post(self.uri, data=data)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.json()["empresa"], self.empresa.id)
+
+    def test_update_queries(self):
+        vaga = VagaFactory(empresa=self.empresa, esta_ativo=True)
+        ContentType.objects.get_for_model(Vaga)
+
+        with self.assertNumQueries(7):
+            response = self.client.patch(f"{self.uri}{vaga.id}/", data={"cargo": "Padeiro"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["cargo"], "Padeiro")
+
+    @override_settings(DRF_RECAPTCHA_TESTING=True)
+    def test_create_beneficios(self):
+        beneficios = [beneficio.id for beneficio in BeneficioFactory.create_batch(5)]
+
+        data = self._vaga_data(VagaFactory.stub(empresa=self.empresa))
+        data["beneficios"] = beneficios
+
+        with self.assertNumQueries(8):
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post(self.uri, data=data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        vaga = Vaga.objects.get(id=response.json()["id"])
+
+        self.assertEqual(
+            sorted(vaga.beneficios.values_list("id", flat=True)), sorted(beneficios)
+        )
+
+    @override_settings(DRF_RECAPTCHA_TESTING=True)
+    def test_create_beneficio_inexistente(self):
+        beneficio = BeneficioFactory()
+
+        data = self._vaga_data(VagaFactory.stub(empresa=self.empresa))
+        data["beneficios"] = [beneficio.id, beneficio.id + 1000]
+
+        response = self.client.post(self.uri, data=data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("beneficios", response.json())
+
+    @override_settings(DRF_RECAPTCHA_TESTING=True)
+    def test_update_beneficios(self):
+        mantido, removido, adicionado = BeneficioFactory.create_batch(3)
+
+        vaga = VagaFactory(empresa=self.empresa, esta_ativo=True)
+        vaga.beneficios.add(mantido, removido)
+
+        data = self._vaga_data(vaga)
+        data["beneficios"] = [mantido.id, adicionado.id]
+
+        with self.assertNumQueries(11):
+            response = self.client.put(f"{self.uri}{vaga.id}/", data=data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            sorted(vaga.beneficios.values_list("id", flat=True)),
+            sorted([mantido.id, adicionado.id]),
+        )
+
+    def test_detail_queries(self):
+        vaga = VagaFactory(empresa=self.empresa)
+
+        with self.assertNumQueries(2):
+            response = self.client.get(f"{self.uri}{vaga.id}/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_update_alheia(self):
+        vaga = VagaFactory()
+
+        response = self.client.patch(f"{self.uri}{vaga.id}/", data={"cargo": "Padeiro"})
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_create_empresa_alheia(self):
+        outra_empresa = EmpresaFactory()
+
+        data = self._vaga_data(VagaFactory.stub(empresa=outra_empresa))
+        data["empresa"] = outra_empresa.id
+
+        with override_settings(DRF_RECAPTCHA_TESTING=True):
+            response = self.client.post(self.uri, data=data)
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertFalse(Vaga.objects.filter(empresa=outra_empresa).exists())
+
 
 class CandidatoVagaTestCase(AdminVagaTestCase):
     def setUp(self):
@@ -0,0 +1,76 @@
+import os
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+FORMATOS = {
+    "webp": ("WEBP", {"quality": 80, "method": 4}),
+    "jpeg": ("JPEG", {"quality": 82, "optimize": True, "progressive": True}),
+}
+
+
+def _codificar(imagem, formato):
+    nome, opcoes = FORMATOS[formato]
+
+    if nome == "JPEG" and imagem.mode != "RGB":
+        # JPEG não tem transparência: o fundo transparente vira branco
+        fundo = Image.new("RGB", imagem.size, (255, 255, 255))
+        fundo.paste(imagem, mask=imagem.getchannel("A") if imagem.mode == "RGBA" else None)
+        imagem = fundo
+
+    conteudo = BytesIO()
+    # Sem o parâmetro exif o Pillow não grava os metadados da foto original
+    imagem.save(conteudo, nome, **opcoes)
+
+    return ContentFile(conteudo.getvalue())
+
+
+def gerar_miniaturas(foto):
+    """Gera as miniaturas de ``foto`` (um ImageField) no mesmo storage.
+
+    Cada tamanho em ``FOTO_MINIATURAS`` (lado, em pixels) vira um recorte
+    quadrado centralizado em cada formato de ``FOTO_MINIATURA_FORMATOS``. A
+    orientação do EXIF é aplicada antes do recorte e os metadados não são
+    copiados para as miniaturas.
+
+    Retorna o valor de ``foto_miniaturas``: o arquivo de origem, as dimensões
+    da foto original e o nome de cada variante por tamanho e formato.
+    """
+
+    with foto.open("rb"), Image.open(foto) as original:
+        imagem = ImageOps.exif_transpose(original)
+
+    largura, altura = imagem.size
+    imagem = imagem.convert("RGBA" if "A" in imagem.getbands() or "transparency" in imagem.info else "RGB")
+    prefixo = os.path.splitext(os.path.basename(foto.name))[0]
+    variantes = {}
+
+    for tamanho, lado in settings.FOTO_MINIATURAS.items():
+        miniatura = ImageOps.fit(imagem, (lado, lado), Image.Resampling.LANCZOS)
+        variantes[tamanho] = {
+            formato: foto.storage.save(
+                f"{settings.FOTO_MINIATURAS_DIR}/{prefixo}_{tamanho}.{formato}", _codificar(miniatura, formato)
+            )
+            for formato in settings.FOTO_MINIATURA_FORMATOS
+        }
+
+    return {"origem": foto.name, "largura": largura, "altura": altura, "variantes": variantes}
+
+
+def arquivos(miniaturas):
+    return [nome for formatos in (miniaturas or {}).get("variantes", {}).values() for nome in formatos.values()]
+
+
+def desatualizada(instance):
+    """Se as miniaturas de ``instance`` não correspondem à foto atual ou aos tamanhos e formatos configurados."""
+
+    miniaturas = instance.foto_miniaturas or {}
+
+    if (instance.foto.name or None) != miniaturas.get("origem"):
+        return True
+
+    return bool(miniaturas) and {
+        tamanho: sorted(formatos) for tamanho, formatos in miniaturas["variantes"].items()
+    } != {tamanho: sorted(settings.FOTO_MINIATURA_FORMATOS) for tamanho in settings.FOTO_MINIATURAS}
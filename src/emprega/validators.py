@@ -130,3 +130,18 @@ def validate_cnpj(cnpj: str) -> str:
         raise ValidationError("CNPJ inválido.")
 
     return cnpj
+
+
+def validate_pdf(file):
+    """Verifica se o arquivo enviado é um PDF pela assinatura ``%PDF-``.
+
+    Lê apenas o primeiro KB (a especificação permite bytes antes do
+    cabeçalho), sem carregar o arquivo, que pode estar em um temporário em disco.
+    """
+
+    file.seek(0)
+    cabecalho = file.read(1024)
+    file.seek(0)
+
+    if b"%PDF-" not in cabecalho:
+        raise ValidationError("O arquivo deve ser um PDF.")
@@ -1,6 +1,5 @@
 from django.db import transaction
 from django.db.models import Q
-from django.http import FileResponse
 from rest_framework import mixins, viewsets, status
 from rest_framework.decorators import action
 from rest_framework.exceptions import PermissionDenied, ValidationError
@@ -9,6 +8,7 @@ from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnl
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from core.downloads import protected_file_response
 from emprega.models import (
     Empresa,
     Candidatura,
@@ -28,6 +28,7 @@ from emprega.models import (
 )
 from emprega.permissions import (
     AdminPermission,
+    CandidaturaEmpregadorPermission,
     OwnedByPermission,
     CreatePermission,
     IsCandidatoPermission,
@@ -58,8 +59,9 @@ from emprega.serializers import (
     BeneficioSerializer,
     VagaCreateSerializer, CPFPasswordResetSerializer, PasswordTokenSerializer, TokenSerializer,
 )
+from emprega.search import trigram_filter
 from emprega.tasks import send_email_confirmation
-from recomendacao.recommendation import recommend_vagas_tfidf, recommend_vagas_bert, recommend_candidatos_tfidf, \
+from recomendacao.ranking import recommend_vagas_tfidf, recommend_vagas_bert, recommend_candidatos_tfidf, \
     recommend_candidatos_bert
 
 RECOMMENDATION_ALGORITHM = 'bert'
@@ -76,19 +78,26 @@ class AbstractViewSet(
     permission_classes = [IsAuthenticatedOrReadOnly, AdminPermission, OwnedByPermission]
 
     def check_empresa(self, request):
-        empresa = request.data.get("empresa", request.user.empresa.id)
-        empresa = Empresa.objects.get(id=empresa)
+        empresa = request.user.empresa
+        empresa_id = request.data.get("empresa")
+
+        if empresa_id and (not empresa or str(empresa.id) != str(empresa_id)):
+            empresa = Empresa.objects.get(id=empresa_id)
 
         if request.user.is_staff:
             return empresa
 
-        if empresa.usuario != request.user:
+        if not empresa or empresa.usuario_id != request.user.id:
             raise PermissionDenied
 
         return empresa
 
     def check_usuario(self, request):
-        usuario = self.request.data.get("usuario", request.user.id)
+        usuario = self.request.data.get("usuario")
+
+        if not usuario or str(usuario) == str(request.user.id):
+            return request.user
+
         usuario = Usuario.objects.get(id=usuario)
 
         if request.user.is_staff:
@@ -114,6 +123,11 @@ class CandidatoPropertiesViewSet(AbstractViewSet):
                 IsAuthenticated,
                 AdminPermission | OwnedByPermission | IsEmpregadorPermission,
             ]
+        if self.action == "certificado":
+            self.permission_classes = [
+                IsAuthenticated,
+                AdminPermission | OwnedByPermission | CandidaturaEmpregadorPermission,
+            ]
         return super().get_permissions()
 
     def get_queryset(self):
@@ -186,10 +200,18 @@ class CandidatoViews(AbstractViewSet):
 
         return Response(serializer.data)
 
+    def get_permissions(self):
+        if self.action == "curriculo":
+            self.permission_classes = [
+                IsAuthenticated,
+                AdminPermission | OwnedByPermission | CandidaturaEmpregadorPermission,
+            ]
+        return super().get_permissions()
+
     @action(detail=True, methods=["GET"])
-    def curriculo(self, *args, **kwargs):
+    def curriculo(self, request, *args, **kwargs):
         candidato = self.get_object()
-        return FileResponse(candidato.curriculo)
+        return protected_file_response(request, candidato.curriculo)
 
     @action(detail=False, methods=["GET"])
     def perfil(self, request, *args, **kwargs):
@@ -214,7 +236,7 @@ class CandidatoViews(AbstractViewSet):
         filtering = Q()
 
         if termo:
-            filtering &= Q(objetivo_profissional_usuario__cargo__icontains=termo)
+            filtering &= trigram_filter(termo, "objetivo_profissional_usuario__cargo")
 
         if salario:
             filtering &= Q(objetivo_profissional_usuario__salario__gte=salario)
@@ -420,6 +442,11 @@ class CursoEspecializacaoViews(CandidatoPropertiesViewSet):
     serializer_class = CursoEspecializacaoSerializer
     queryset = CursoEspecializacao.objects.all()
 
+    @action(detail=True, methods=["GET"])
+    def certificado(self, request, *args, **kwargs):
+        curso = self.get_object()
+        return protected_file_response(request, curso.certificado)
+
 
 class FormacaoAcademicaViews(CandidatoPropertiesViewSet):
     serializer_class = FormacaoAcademicaSerializer
@@ -438,7 +465,7 @@ class EnderecoViews(
     viewsets.GenericViewSet,
 ):
     serializer_class = EnderecoSerializer
-    queryset = Endereco.objects.all()
+    queryset = Endereco.objects.select_related("empresa_endereco")
     permission_classes = [
         IsAuthenticatedOrReadOnly,
         AdminPermission
@@ -460,7 +487,7 @@ class VagaViews(AbstractViewSet):
         "update": VagaCreateSerializer,
     }
 
-    queryset = Vaga.objects.all()
+    queryset = Vaga.objects.select_related("empresa")
     permission_classes = [
         AdminPermission
         | (IsEmpregadorPermission & OwnedByPermission)
@@ -522,8 +549,8 @@ class VagaViews(AbstractViewSet):
             )
 
         if empresa:
-            filtering &= Q(empresa__nome_fantasia__icontains=empresa) | Q(
-                empresa__razao_social__icontains=empresa
+            filtering &= trigram_filter(
+                empresa, "empresa__nome_fantasia", "empresa__razao_social"
             )
 
         if salario:
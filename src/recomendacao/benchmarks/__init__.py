@@ -0,0 +1,2 @@
+from recomendacao.benchmarks.corpus import synthetic_candidatos, synthetic_texts, synthetic_vagas
+from recomendacao.benchmarks.runner import CASES, compare, measure, run
@@ -0,0 +1,58 @@
+from types import SimpleNamespace
+
+import numpy as np
+
+SYLLABLES = [
+    "ba", "be", "bi", "bo", "ca", "ce", "ci", "co", "da", "de", "di", "do", "fa", "fe", "ga", "go", "la", "le", "li",
+    "lo", "ma", "me", "mi", "mo", "na", "ne", "ni", "no", "pa", "pe", "pi", "po", "ra", "re", "ri", "ro", "sa", "se",
+    "si", "so", "ta", "te", "ti", "to", "va", "ve", "vi", "ção", "ções", "dade", "mento", "ista", "ar", "er", "ir",
+]
+
+
+def _vocabulary(rng, size):
+    lengths = rng.integers(2, 5, size=size)
+
+    return np.array(["".join(rng.choice(SYLLABLES, size=length)) for length in lengths])
+
+
+def synthetic_texts(size, words=200, vocabulary=5000, seed=0):
+    """Gera ``size`` textos com ``words`` palavras cada.
+
+    As palavras seguem uma distribuição de Zipf sobre um vocabulário fixo,
+    próxima da frequência de termos de currículos e vagas reais. A mesma
+    semente gera sempre o mesmo corpus, para comparar execuções.
+    """
+
+    rng = np.random.default_rng(seed)
+    vocabulary = _vocabulary(rng, vocabulary)
+    ranks = np.minimum(rng.zipf(1.3, size=(size, words)), len(vocabulary)) - 1
+
+    return [" ".join(vocabulary[row]) for row in ranks]
+
+
+def _embeddings(size, dimensions, seed):
+    return np.random.default_rng(seed).standard_normal((size, dimensions), dtype=np.float32).tolist()
+
+
+def synthetic_vagas(size, words=200, dimensions=768, seed=0):
+    """Vagas com os atributos lidos por ``recommend_*``: ``vaga_processada`` e ``vaga_embedding``."""
+
+    texts = synthetic_texts(size, words, seed=seed)
+    embeddings = _embeddings(size, dimensions, seed)
+
+    return [
+        SimpleNamespace(pk=pk, vaga_processada=text, vaga_embedding=embedding)
+        for pk, (text, embedding) in enumerate(zip(texts, embeddings))
+    ]
+
+
+def synthetic_candidatos(size, words=200, dimensions=768, seed=0):
+    """Candidatos com os atributos lidos por ``recommend_*``: ``curriculo_processado`` e ``curriculo_embedding``."""
+
+    texts = synthetic_texts(size, words, seed=seed + 1)
+    embeddings = _embeddings(size, dimensions, seed + 1)
+
+    return [
+        SimpleNamespace(pk=pk, curriculo_processado=text, curriculo_embedding=embedding)
+        for pk, (text, embedding) in enumerate(zip(texts, embeddings))
+    ]
@@ -0,0 +1,152 @@
+import gc
+import platform
+import subprocess
+import time
+import tracemalloc
+
+import numpy as np
+
+from recomendacao import ranking, recommendation
+from recomendacao.benchmarks.corpus import synthetic_candidatos, synthetic_vagas
+
+
+def _treat_text(vagas, candidatos):
+    return lambda: [recommendation.treat_text(vaga.vaga_processada) for vaga in vagas]
+
+
+def _apply_tfidf(vagas, candidatos):
+    corpus = [vaga.vaga_processada for vaga in vagas]
+    query = [candidatos[0].curriculo_processado]
+
+    return lambda: ranking.apply_tfidf(query, corpus)
+
+
+def _recommend_vagas(method):
+    recommend = getattr(ranking, f'recommend_vagas_{method}')
+
+    return lambda vagas, candidatos: lambda: recommend(vagas, candidatos[0])
+
+
+def _recommend_candidatos(method):
+    recommend = getattr(ranking, f'recommend_candidatos_{method}')
+
+    return lambda vagas, candidatos: lambda: recommend(candidatos, vagas[0])
+
+
+# Cada caso recebe o corpus e retorna a chamada medida
+CASES = {
+    'treat_text': _treat_text,
+    'apply_tfidf': _apply_tfidf,
+    'recommend_vagas_tfidf': _recommend_vagas('tfidf'),
+    'recommend_candidatos_tfidf': _recommend_candidatos('tfidf'),
+    'recommend_vagas_bert': _recommend_vagas('bert'),
+    'recommend_candidatos_bert': _recommend_candidatos('bert'),
+}
+
+
+def measure(call, repeat=5):
+    """Executa ``call`` ``repeat`` vezes e retorna as latências e o pico de memória.
+
+    Os tempos são medidos sem o tracemalloc, que deixa as alocações mais
+    lentas; o pico de memória vem de uma execução extra rastreada.
+
+    Retorno:
+        dict: ``p50`` e ``p95`` em segundos, ``peak_memory`` em bytes e os tempos de cada execução
+    """
+
+    timings = []
+
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        call()
+        timings.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+
+    try:
+        call()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'p50': float(np.percentile(timings, 50)),
+        'p95': float(np.percentile(timings, 95)),
+        'peak_memory': peak,
+        'timings': timings,
+    }
+
+
+def _commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(sizes=(1000, 10000, 100000), cases=None, repeat=5, words=200, seed=0, report=None):
+    """Executa os casos de ``CASES`` para cada tamanho de corpus.
+
+    Parâmetros:
+        sizes (list): quantidade de vagas e de candidatos gerados
+        cases (list): nomes dos casos; todos por padrão
+        repeat (int): execuções medidas por caso
+        words (int): palavras por texto
+        seed (int): semente do corpus
+        report (callable): chamado com (caso, tamanho, resultado) a cada medição
+
+    Retorno:
+        dict: metadados da execução e os resultados, indexados por caso e tamanho
+    """
+
+    results = {}
+
+    for size in sizes:
+        vagas = synthetic_vagas(size, words, seed=seed)
+        candidatos = synthetic_candidatos(size, words, seed=seed)
+
+        for case in cases or CASES:
+            result = measure(CASES[case](vagas, candidatos), repeat)
+            results.setdefault(case, {})[str(size)] = result
+
+            if report:
+                report(case, size, result)
+
+        del vagas, candidatos
+
+    return {
+        'commit': _commit(),
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'repeat': repeat,
+        'words': words,
+        'seed': seed,
+        'results': results,
+    }
+
+
+def compare(baseline, current, threshold=0.1):
+    """Compara o p50 de duas execuções de ``run``.
+
+    Retorno:
+        list: (caso, tamanho, p50 anterior, p50 atual, variação, regressão) para cada medição presente nas duas
+    """
+
+    rows = []
+
+    for case, sizes in current['results'].items():
+        for size, result in sizes.items():
+            previous = baseline['results'].get(case, {}).get(size)
+
+            if previous is None:
+                continue
+
+            change = result['p50'] / previous['p50'] - 1 if previous['p50'] else 0.0
+            rows.append((case, size, previous['p50'], result['p50'], change, change > threshold))
+
+    return rows
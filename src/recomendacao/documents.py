@@ -0,0 +1,103 @@
+import logging
+from collections import defaultdict
+
+from django.apps import apps
+
+from core.metrics import timer
+from recomendacao.recommendation import get_pdf_text
+
+logger = logging.getLogger(__name__)
+
+
+def get_curriculo_text(curriculo):
+    if not curriculo:
+        return ""
+
+    try:
+        return get_pdf_text(str(curriculo))
+    except Exception as e:
+        logger.warning('event=pdf_extract_failed curriculo=%s error="%s"', curriculo, e)
+        return ""
+
+
+def candidato_documents(pks):
+    """Monta os textos de vários candidatos de uma só vez.
+
+    Os dados de formações, experiências, cursos e idiomas são lidos com uma
+    consulta ``values()`` por modelo, agrupados por ``usuario_id``, e o texto
+    do currículo em PDF é extraído uma única vez por candidato. O mesmo
+    documento alimenta o processamento TF-IDF e o BERT.
+
+    Parâmetros:
+        pks (list): pks dos candidatos
+
+    Retorno:
+        dict: texto de cada candidato, indexado pelo pk
+    """
+
+    Candidato = apps.get_model('emprega.Candidato')
+    FormacaoAcademica = apps.get_model('emprega.FormacaoAcademica')
+    ExperienciaProfissional = apps.get_model('emprega.ExperienciaProfissional')
+    CursoEspecializacao = apps.get_model('emprega.CursoEspecializacao')
+    Idioma = apps.get_model('emprega.Idioma')
+
+    educations = defaultdict(list)
+    experiences = defaultdict(list)
+    courses = defaultdict(list)
+    languages = defaultdict(list)
+
+    with timer('processing.fetch', model='candidato'):
+        # Mesmo texto gerado pelo __str__ de cada modelo
+        for education in FormacaoAcademica.objects.filter(usuario_id__in=pks).values('usuario_id', 'instituicao', 'curso'):
+            educations[education['usuario_id']].append(f"{education['instituicao']} - {education['curso']}")
+
+        for experience in ExperienciaProfissional.objects.filter(usuario_id__in=pks).values(
+                'usuario_id', 'empresa', 'cargo', 'atividades'):
+            experiences[experience['usuario_id']].append(
+                f"{experience['empresa']} - {experience['cargo']} {experience['atividades']}")
+
+        for course in CursoEspecializacao.objects.filter(usuario_id__in=pks).values('usuario_id', 'instituicao', 'curso'):
+            courses[course['usuario_id']].append(f"{course['instituicao']} - {course['curso']}")
+
+        for language in Idioma.objects.filter(usuario_id__in=pks).values('usuario_id', 'nome'):
+            languages[language['usuario_id']].append(language['nome'])
+
+        candidatos = list(Candidato.objects.filter(pk__in=pks).values('pk', 'cargo', 'atuacao', 'curriculo'))
+
+    documents = {}
+
+    for candidato in candidatos:
+        pk = candidato['pk']
+        candidato_text = " ".join([
+            str(candidato['cargo']),
+            str(candidato['atuacao']),
+            " ".join(educations[pk]),
+            " ".join(experiences[pk]),
+            " ".join(courses[pk]),
+            " ".join(languages[pk]),
+        ])
+
+        documents[pk] = get_curriculo_text(candidato['curriculo']) + " " + candidato_text
+
+    return documents
+
+
+def vaga_documents(pks):
+    """Monta os textos de várias vagas com uma única consulta.
+
+    Parâmetros:
+        pks (list): pks das vagas
+
+    Retorno:
+        dict: texto de cada vaga, indexado pelo pk
+    """
+
+    Vaga = apps.get_model('emprega.Vaga')
+
+    with timer('processing.fetch', model='vaga'):
+        vagas = list(Vaga.objects.filter(pk__in=pks).values_list(
+            'pk', 'cargo', 'atividades', 'requisitos', 'empresa__ramo_atividade', 'empresa__descricao'
+        ))
+
+    # A descrição da empresa é opcional
+    return {pk: " ".join(campo or "" for campo in campos) for pk, *campos in vagas}
@@ -0,0 +1,154 @@
+import queue
+import threading
+import time
+from multiprocessing.connection import Client, Listener
+
+from django.conf import settings
+
+
+def parse_address(address):
+    """Converte ``host:porta`` em tupla; qualquer outro valor é um socket Unix."""
+
+    host, _, port = address.rpartition(":")
+
+    if host and port.isdigit():
+        return host, int(port)
+
+    return address
+
+
+def authkey():
+    return settings.SECRET_KEY.encode()
+
+
+class _Request:
+    def __init__(self, texts):
+        self.texts = texts
+        self.result = None
+        self.error = None
+        self.done = threading.Event()
+
+
+class InferenceServer:
+    """Servidor local de embeddings com micro-lotes.
+
+    Cada conexão envia uma lista de textos e recebe a lista de embeddings.
+    Os pedidos concorrentes são agrupados até ``max_batch`` textos ou
+    ``max_wait`` segundos após o primeiro, e cada grupo passa uma única vez
+    pelo modelo.
+
+    Parâmetros:
+        address (str | tuple): socket Unix ou (host, porta)
+        encode (callable): recebe uma lista de textos e retorna os embeddings
+        max_batch (int): máximo de textos por lote
+        max_wait (float): espera máxima, em segundos, para completar um lote
+    """
+
+    def __init__(self, address, encode, max_batch=32, max_wait=0.01):
+        self.address = address
+        self.encode = encode
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.requests = queue.Queue()
+        self.running = threading.Event()
+
+    def serve_forever(self):
+        threading.Thread(target=self._batch_loop, daemon=True).start()
+
+        with Listener(self.address, authkey=authkey()) as listener:
+            self.running.set()
+
+            while True:
+                connection = listener.accept()
+
+                if not self.running.is_set():
+                    connection.close()
+                    return
+
+                threading.Thread(target=self._handle, args=(connection,), daemon=True).start()
+
+    def shutdown(self):
+        self.running.clear()
+
+        # Desbloqueia o accept() do serve_forever
+        Client(self.address, authkey=authkey()).close()
+
+    def _handle(self, connection):
+        with connection:
+            while True:
+                try:
+                    texts = connection.recv()
+                except (EOFError, OSError):
+                    return
+
+                request = _Request(texts)
+                self.requests.put(request)
+                request.done.wait()
+
+                connection.send(("error", request.error) if request.error else ("ok", request.result))
+
+    def _next_batch(self):
+        batch = [self.requests.get()]
+        size = len(batch[0].texts)
+        deadline = time.monotonic() + self.max_wait
+
+        while size < self.max_batch:
+            timeout = deadline - time.monotonic()
+
+            if timeout <= 0:
+                break
+
+            try:
+                request = self.requests.get(timeout=timeout)
+            except queue.Empty:
+                break
+
+            batch.append(request)
+            size += len(request.texts)
+
+        return batch
+
+    def _batch_loop(self):
+        while True:
+            batch = self._next_batch()
+
+            try:
+                embeddings = self.encode([text for request in batch for text in request.texts])
+            except Exception as e:
+                for request in batch:
+                    request.error = repr(e)
+                    request.done.set()
+                continue
+
+            for request in batch:
+                request.result, embeddings = embeddings[:len(request.texts)], embeddings[len(request.texts):]
+                request.done.set()
+
+
+_connection = None
+
+
+def encode(texts):
+    """Envia ``texts`` ao servidor de inferência configurado e retorna os embeddings."""
+
+    global _connection
+
+    for attempt in range(2):
+        try:
+            if _connection is None:
+                _connection = Client(parse_address(settings.RECOMMENDATION_INFERENCE_ADDRESS), authkey=authkey())
+
+            _connection.send(list(texts))
+            status, result = _connection.recv()
+            break
+        except (EOFError, OSError):
+            # Servidor reiniciado; reconecta uma vez
+            _connection = None
+
+            if attempt:
+                raise
+
+    if status == "error":
+        raise RuntimeError(f"Inference server error: {result}")
+
+    return result
@@ -0,0 +1,47 @@
+from contextlib import contextmanager
+from zlib import crc32
+
+from django.db import connection
+
+
+def lock_namespace(model):
+    """Primeira chave dos advisory locks de ``model``, derivada do seu label."""
+
+    return crc32(model._meta.concrete_model._meta.label.encode()) & 0x7FFFFFFF
+
+
+@contextmanager
+def processing_lock(model, pks):
+    """Obtém um advisory lock do Postgres por pk, sem esperar pelos ocupados.
+
+    Os locks são de sessão e ficam com a conexão até a saída do bloco, então
+    outro worker que tente processar os mesmos pks enquanto isso recebe
+    apenas os que estiverem livres.
+
+    Parâmetros:
+        model (Model): modelo processado
+        pks (list): pks que se deseja processar
+
+    Retorno:
+        list: pks cujo lock foi obtido
+    """
+
+    namespace = lock_namespace(model)
+    pks = sorted(set(pks))
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT id FROM unnest(%s::integer[]) AS id WHERE pg_try_advisory_lock(%s, id)",
+            [pks, namespace],
+        )
+        locked = [row[0] for row in cursor.fetchall()]
+
+    try:
+        yield locked
+    finally:
+        if locked:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT pg_advisory_unlock(%s, id) FROM unnest(%s::integer[]) AS id",
+                    [namespace, locked],
+                )
@@ -0,0 +1,73 @@
+import json
+import logging
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.translation import gettext as _
+
+from recomendacao.benchmarks import CASES, compare, run
+
+
+class Command(BaseCommand):
+    help = _('Benchmarks the recommendation engine on synthetic corpora')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000],
+                            help=_('Number of synthetic jobs and candidates per run'))
+        parser.add_argument('--cases', nargs='+', choices=list(CASES), help=_('Cases to run (default: all)'))
+        parser.add_argument('--repeat', type=int, default=5, help=_('Timed runs per case'))
+        parser.add_argument('--words', type=int, default=200, help=_('Words per synthetic document'))
+        parser.add_argument('--seed', type=int, default=0, help=_('Seed of the synthetic corpus'))
+        parser.add_argument('--output', help=_('Path of the JSON file with the results'))
+        parser.add_argument('--compare', help=_('JSON file of a previous run to compare against'))
+        parser.add_argument('--threshold', type=float, default=0.1,
+                            help=_('Relative p50 increase reported as a regression'))
+
+    def _report(self, case, size, result):
+        self.stdout.write(
+            f'{case:<28} {size:>8} p50={result["p50"] * 1000:10.2f}ms p95={result["p95"] * 1000:10.2f}ms '
+            f'peak={result["peak_memory"] / 1024 / 1024:8.1f}MB'
+        )
+
+    def handle(self, *args, **options):
+        baseline = None
+
+        if options['verbosity'] < 2:
+            # Cada chamada medida também gera uma métrica; no sink de log isso polui o relatório
+            logging.getLogger('core.metrics').setLevel(logging.WARNING)
+
+        if options['compare']:
+            try:
+                with open(options['compare']) as f:
+                    baseline = json.load(f)
+            except (OSError, ValueError) as e:
+                raise CommandError(f'Não foi possível ler {options["compare"]}: {e}')
+
+        results = run(
+            sizes=options['sizes'],
+            cases=options['cases'],
+            repeat=options['repeat'],
+            words=options['words'],
+            seed=options['seed'],
+            report=self._report,
+        )
+
+        output = options['output'] or f'benchmark-{results["commit"] or "local"}.json'
+
+        with open(output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+        self.stdout.write(self.style.SUCCESS(f'Results saved at {output}'))
+
+        if baseline:
+            regressions = 0
+
+            for case, size, previous, current, change, regression in compare(baseline, results, options['threshold']):
+                regressions += regression
+                line = f'{case:<28} {size:>8} {previous * 1000:10.2f}ms -> {current * 1000:10.2f}ms ({change:+.1%})'
+                self.stdout.write(self.style.ERROR(line) if regression else line)
+
+            if regressions:
+                self.stdout.write(self.style.ERROR(
+                    f'{regressions} regressions against {baseline.get("commit") or options["compare"]}'))
+            else:
+                self.stdout.write(self.style.SUCCESS(f'No regressions against {baseline.get("commit") or options["compare"]}'))
@@ -0,0 +1,36 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils.translation import gettext as _
+
+from recomendacao.inference import InferenceServer, parse_address
+from recomendacao.recommendation import load_bert_model
+
+
+class Command(BaseCommand):
+    help = _('Serves BERT embeddings over a local socket, batching concurrent requests')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--address', default=settings.RECOMMENDATION_INFERENCE_ADDRESS,
+                            help=_('Unix socket path or host:port to listen on'))
+        parser.add_argument('--max-batch', type=int, default=settings.RECOMMENDATION_INFERENCE_MAX_BATCH,
+                            help=_('Maximum number of texts per forward pass'))
+        parser.add_argument('--max-wait-ms', type=int, default=settings.RECOMMENDATION_INFERENCE_MAX_WAIT_MS,
+                            help=_('Maximum time to wait for a batch to fill'))
+
+    def handle(self, *args, **options):
+        if not options['address']:
+            raise Exception('Endereço não configurado: use --address ou RECOMMENDATION_INFERENCE_ADDRESS')
+
+        model = load_bert_model()
+        max_batch = options['max_batch']
+
+        server = InferenceServer(
+            parse_address(options['address']),
+            lambda texts: model.encode(texts, batch_size=max_batch, show_progress_bar=False).tolist(),
+            max_batch=max_batch,
+            max_wait=options['max_wait_ms'] / 1000,
+        )
+
+        self.stdout.write(self.style.SUCCESS(f'Inference server listening on {options["address"]}'))
+
+        server.serve_forever()
@@ -0,0 +1,60 @@
+import time
+from itertools import islice
+
+from celery import current_app, group
+
+
+def task_queue(task):
+    """Nome da fila para a qual ``task`` é roteada."""
+
+    return current_app.amqp.router.route({}, task.name)["queue"].name
+
+
+def queue_depth(queue):
+    """Número de mensagens aguardando na fila ``queue`` do broker."""
+
+    with current_app.connection_for_read() as connection:
+        try:
+            return connection.default_channel.queue_declare(queue=queue, passive=True).message_count
+        except connection.channel_errors:
+            # Filas vazias não existem no Redis
+            return 0
+
+
+def enqueue_chunks(task, pks, chunk_size=100, group_size=10, max_queue=50, poll=1):
+    """Enfileira ``task`` para ``pks`` em blocos, respeitando o tamanho da fila.
+
+    Os pks são consumidos sob demanda, ``chunk_size`` por mensagem, e
+    publicados em grupos de ``group_size`` mensagens. Antes de cada grupo,
+    aguarda enquanto a fila da task tiver ``max_queue`` mensagens ou mais.
+
+    Parâmetros:
+        task (Task): task que recebe uma lista de pks
+        pks (iterable): pks a processar
+        chunk_size (int): pks por mensagem
+        group_size (int): mensagens publicadas por vez
+        max_queue (int): profundidade máxima da fila; 0 desativa a espera
+        poll (float): intervalo, em segundos, entre as consultas à fila
+
+    Retorno:
+        generator: total de pks enfileirados após cada grupo
+    """
+
+    queue = task_queue(task)
+    pks = iter(pks)
+    total = 0
+
+    while True:
+        chunks = [chunk for chunk in (list(islice(pks, chunk_size)) for _ in range(group_size)) if chunk]
+
+        if not chunks:
+            break
+
+        while max_queue and queue_depth(queue) >= max_queue:
+            time.sleep(poll)
+
+        group(task.s(chunk) for chunk in chunks).apply_async()
+
+        total += sum(len(chunk) for chunk in chunks)
+
+        yield total
@@ -0,0 +1,134 @@
+"""Ordenação de vagas e candidatos usada pelas views.
+
+Depende apenas de numpy e scipy: o processo web não importa torch,
+sentence-transformers, scikit-learn nem PyPDF2, usados somente pelos
+workers (recomendacao.recommendation) para gerar os textos processados e
+os embeddings.
+"""
+
+import re
+from collections import Counter
+
+import numpy as np
+from scipy import sparse
+
+from core.metrics import timer
+from recomendacao.stopwords import STOPWORDS
+
+# Mesmo padrão de tokens do TfidfVectorizer do scikit-learn
+TOKEN_PATTERN = re.compile(r"(?u)\b\w\w+\b")
+
+
+def _term_counts(documents, vocabulary, stop_words, grow):
+    data, indices, indptr = [], [], [0]
+
+    for document in documents:
+        counts = Counter(token for token in TOKEN_PATTERN.findall(document.lower()) if token not in stop_words)
+
+        for token, count in counts.items():
+            index = vocabulary.setdefault(token, len(vocabulary)) if grow else vocabulary.get(token)
+
+            if index is not None:
+                indices.append(index)
+                data.append(count)
+
+        indptr.append(len(indices))
+
+    return data, indices, indptr
+
+
+def _normalize(matrix):
+    if sparse.issparse(matrix):
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        norms[norms == 0] = 1
+
+        return sparse.diags(1 / norms) @ matrix
+
+    matrix = np.asarray(matrix, dtype=np.float64)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+
+    return matrix / norms
+
+
+def cosine_similarity(x, y):
+    """Similaridade de cosseno entre as linhas de ``x`` e ``y`` (densas ou esparsas)."""
+
+    similarities = _normalize(x) @ _normalize(y).T
+
+    return similarities.toarray() if sparse.issparse(similarities) else np.asarray(similarities)
+
+
+@timer('processing.tfidf')
+def apply_tfidf(query, corpus):
+    """TF-IDF de ``query`` e ``corpus`` com o vocabulário e o IDF do ``corpus``.
+
+    Equivalente ao ``TfidfVectorizer`` padrão do scikit-learn (IDF suavizado e
+    normalização L2) com as stopwords em inglês e português do NLTK.
+
+    Retorno:
+        tuple: matrizes esparsas (query_tfidf, corpus_tfidf)
+    """
+
+    vocabulary = {}
+
+    corpus_counts = _term_counts(corpus, vocabulary, STOPWORDS, grow=True)
+    query_counts = _term_counts(query, vocabulary, STOPWORDS, grow=False)
+
+    shape = len(vocabulary)
+    corpus_tf = sparse.csr_matrix(corpus_counts, shape=(len(corpus), shape), dtype=np.float64)
+    query_tf = sparse.csr_matrix(query_counts, shape=(len(query), shape), dtype=np.float64)
+
+    document_frequency = np.bincount(corpus_tf.indices, minlength=shape)
+    idf = sparse.diags(np.log((1 + len(corpus)) / (1 + document_frequency)) + 1)
+
+    return _normalize(query_tf @ idf).tocsr(), _normalize(corpus_tf @ idf).tocsr()
+
+
+def _rank(items, similarities):
+    indexes = np.argsort(similarities[0])[::-1]
+
+    return list(np.array(list(items))[indexes])
+
+
+@timer('recommendation', method='tfidf', target='vagas')
+def recommend_vagas_tfidf(vagas, user):
+    user_text = [str(user.curriculo_processado)]
+    vagas_text = [str(vaga.vaga_processada) for vaga in vagas]
+
+    query_tfidf, corpus_tfidf = apply_tfidf(user_text, vagas_text)
+
+    return _rank(vagas, cosine_similarity(query_tfidf, corpus_tfidf))
+
+
+@timer('recommendation', method='tfidf', target='candidatos')
+def recommend_candidatos_tfidf(candidatos, vaga):
+    vaga_text = [str(vaga.vaga_processada)]
+    candidatos_text = [str(candidato.curriculo_processado) for candidato in candidatos]
+
+    query_tfidf, corpus_tfidf = apply_tfidf(vaga_text, candidatos_text)
+
+    return _rank(candidatos, cosine_similarity(query_tfidf, corpus_tfidf))
+
+
+@timer('recommendation', method='bert', target='vagas')
+def recommend_vagas_bert(vagas, user):
+    #If bert embedding isn't created in time, use tfidf instead
+    if user.curriculo_embedding is None:
+        return recommend_vagas_tfidf(vagas, user)
+
+    user_embedding = [user.curriculo_embedding]
+    vagas_embedding = [vaga.vaga_embedding for vaga in vagas]
+
+    return _rank(vagas, cosine_similarity(user_embedding, vagas_embedding))
+
+
+@timer('recommendation', method='bert', target='candidatos')
+def recommend_candidatos_bert(candidatos, vaga):
+    if vaga.vaga_embedding is None:
+        return recommend_candidatos_tfidf(candidatos, vaga)
+
+    vaga_embedding = [vaga.vaga_embedding]
+    candidatos_embedding = [candidato.curriculo_embedding for candidato in candidatos]
+
+    return _rank(candidatos, cosine_similarity(vaga_embedding, candidatos_embedding))
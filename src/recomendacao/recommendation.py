@@ -1,28 +1,29 @@
+"""Processamento de currículos e vagas executado pelos workers.
+
+torch, sentence-transformers, nltk e PyPDF2 são importados dentro das
+funções, no primeiro uso: importar este módulo (pelas tasks, modelos e
+comandos) não carrega a pilha de ML. A ordenação usada pelas views fica em
+recomendacao.ranking.
+"""
+
+import logging
 import os
-import time
-
-import PyPDF2
-import nltk
-import numpy as np
-from nltk.corpus import stopwords
-from sentence_transformers import SentenceTransformer
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from functools import lru_cache
+
+from django.conf import settings
 from unidecode import unidecode
 
+from core.metrics import timer
+from recomendacao import inference
+from recomendacao.ranking import apply_tfidf, recommend_candidatos_bert, recommend_candidatos_tfidf, \
+    recommend_vagas_bert, recommend_vagas_tfidf
 
-def process_candidato_tfidf(curriculo, candidato_text):
-    if curriculo:
-        try:
-            text = get_pdf_text(str(curriculo))
-        except Exception as e:
-            print(e)
-            text = ""
-    else:
-        text = ""
+logger = logging.getLogger(__name__)
 
-    text += " " + candidato_text
+BERT_MODEL = "neuralmind/bert-base-portuguese-cased"
 
+
+def process_candidato_tfidf(text):
     text = treat_text(text)
     return text
 
@@ -33,41 +34,10 @@ def process_vaga_tfidf(vaga_text):
     return vaga_text
 
 
-def recommend_vagas_tfidf(vagas, user):
-    start = time.time()
-
-    user_text = [str(user.curriculo_processado)]
-    vagas_text = [str(vaga.vaga_processada) for vaga in vagas]
-
-    query_tfidf, corpus_tfidf = apply_tfidf(user_text, vagas_text)
-    cosine_similarities = cosine_similarity(query_tfidf, corpus_tfidf)
-
-    indexes = np.argsort(cosine_similarities[0])[::-1]
-    queries = list(np.array(list(vagas))[indexes])
-
-    print(f'tfidf + cosine = {time.time() - start}')
-
-    return queries
-
-
-def recommend_candidatos_tfidf(candidatos, vaga):
-    start = time.time()
-
-    vaga_text = [str(vaga.vaga_processada)]
-    candidatos_text = [str(candidato.curriculo_processado) for candidato in candidatos]
-
-    query_tfidf, corpus_tfidf = apply_tfidf(vaga_text, candidatos_text)
-    cosine_similarities = cosine_similarity(query_tfidf, corpus_tfidf)
-
-    indexes = np.argsort(cosine_similarities[0])[::-1]
-    queries = list(np.array(list(candidatos))[indexes])
-
-    print(f'tfidf + cosine = {time.time() - start}')
-
-    return queries
-
-
+@timer('processing.pdf_extract')
 def get_pdf_text(pdf_path):
+    import PyPDF2
+
     media_path = os.path.join(os.path.dirname(__file__), '../media')
     pdf_path = os.path.join(media_path, pdf_path)
 
@@ -83,9 +53,18 @@ def get_pdf_text(pdf_path):
     return text
 
 
-def treat_text(text):
+@lru_cache(maxsize=None)
+def load_stemmer():
+    import nltk
+
     nltk.download('rslp')
-    stemmer = nltk.stem.RSLPStemmer()
+
+    return nltk.stem.RSLPStemmer()
+
+
+@timer('processing.stemming')
+def treat_text(text):
+    stemmer = load_stemmer()
     text = text.lower().strip(" ").split(" ")
     text = " ".join([stemmer.stem(word) for word in text if word != ''])
     text = unidecode(str(text))
@@ -93,97 +72,46 @@ def treat_text(text):
     return text
 
 
-def apply_tfidf(query, corpus):
-    nltk.download('stopwords')
-    stopwords_list = stopwords.words('english') + stopwords.words('portuguese')
-
-    vectorizer = TfidfVectorizer(stop_words=stopwords_list)
-
-    corpus_tfidf = vectorizer.fit_transform(corpus)
-    query_tfidf = vectorizer.transform(query)
-
-    return query_tfidf, corpus_tfidf
-
+# Um carregamento por processo; com o modelo carregado no processo pai do worker
+# (CELERY_QUEUE_OPTIONS['...']['preload_model']) os filhos do prefork compartilham os pesos
+@lru_cache(maxsize=None)
+def load_bert_model(model_name=BERT_MODEL):
+    from sentence_transformers import SentenceTransformer
 
-def load_bert_model(model_name="neuralmind/bert-base-portuguese-cased"):
     #old model "paraphrase-multilingual-MiniLM-L12-v2"
     model_path = os.path.join(os.path.dirname(__file__), f'bert_models/{model_name}')
 
     try:
         model = SentenceTransformer(model_path, device="cpu")
     except ValueError:
-        print("Model not found in local directory")
+        logger.info('event=model_download model=%s', model_name)
         model = SentenceTransformer(model_name, device="cpu")
         model.save(model_path)
-        print(f'Model saved at {model_path}')
+        logger.info('event=model_saved model=%s path=%s', model_name, model_path)
 
     return model
 
 
-def process_candidato_bert(curriculo, candidato_text):
-    model = load_bert_model()
-
-    if curriculo:
-        try:
-            text = get_pdf_text(str(curriculo))
-        except Exception as e:
-            print(e)
-            text = ""
-    else:
-        text = ""
-
-    text += " " + candidato_text
-
-    embedding = model.encode(text, show_progress_bar=False).tolist()
-
-    return embedding
-
+@timer('processing.encode')
+def encode(texts):
+    if settings.RECOMMENDATION_INFERENCE_ADDRESS:
+        return inference.encode(texts)
 
-def process_vaga_bert(text):
     model = load_bert_model()
 
-    embedding = model.encode(text, show_progress_bar=False).tolist()
-
-    return embedding
-
-
-def recommend_vagas_bert(vagas, user):
-    start = time.time()
-
-    #If bert embedding isn't created in time, use tfidf instead
-    if user.curriculo_embedding is None:
-        return recommend_vagas_tfidf(vagas, user)
-
-    user_embedding = [user.curriculo_embedding]
-    vagas_embedding = [vaga.vaga_embedding for vaga in vagas]
-
-    cosine_similarities = cosine_similarity(user_embedding, vagas_embedding)
-
-    indexes = np.argsort(cosine_similarities[0])[::-1]
-    queries = list(np.array(list(vagas))[indexes])
-
-    print(f'bert + cosine = {time.time() - start}')
-
-    return queries
-
-
-def recommend_candidatos_bert(candidatos, vaga):
-    start = time.time()
+    return model.encode(texts, show_progress_bar=False).tolist()
 
-    if vaga.vaga_embedding is None:
-        return recommend_candidatos_tfidf(candidatos, vaga)
 
-    vaga_embedding = [vaga.vaga_embedding]
-    candidatos_embedding = [candidato.curriculo_embedding for candidato in candidatos]
+def process_candidatos_bert(texts):
+    """Embeddings de vários candidatos com uma única chamada ao modelo."""
 
-    cosine_similarities = cosine_similarity(vaga_embedding, candidatos_embedding)
+    return encode(texts)
 
-    indexes = np.argsort(cosine_similarities[0])[::-1]
-    queries = list(np.array(list(candidatos))[indexes])
 
-    print(f'bert + cosine = {time.time() - start}')
+def process_vagas_bert(texts):
+    """Embeddings de várias vagas com uma única chamada ao modelo."""
 
-    return queries
+    return encode(texts)
 
 
 if __name__ == '__main__':
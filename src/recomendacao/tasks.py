@@ -1,62 +1,162 @@
+import logging
+from collections import defaultdict
+from functools import reduce
+from operator import or_
+
 from celery import shared_task
 from django.apps import apps
-from recomendacao.recommendation import process_candidato_tfidf, process_candidato_bert, process_vaga_tfidf, process_vaga_bert
+from django.db.models import F, Q
 
-@shared_task(name='process_candidato')
-def process_candidato(pk):
+from core.metrics import increment, timer
+from recomendacao.documents import candidato_documents, vaga_documents
+from recomendacao.locks import processing_lock
+from recomendacao.recommendation import BERT_MODEL, process_candidato_tfidf, process_candidatos_bert, process_vaga_tfidf, \
+    process_vagas_bert
+
+logger = logging.getLogger(__name__)
+
+
+def _write(model, values, fields, versions, version_field):
+    # Grava somente as colunas derivadas em uma única consulta; bulk_update não chama save()
+    # nem dispara sinais, então auditlog e emprega.signals não reagem a dados gerados aqui.
+    # Linhas cuja versão mudou desde a leitura ficam de fora do UPDATE
+    objs = [model(pk=pk, **dict(zip(fields, row))) for pk, row in values.items()]
+
+    if not objs:
+        return 0
+
+    # Um pk__in por versão lida; em geral o bloco inteiro tem poucas versões distintas
+    by_version = defaultdict(list)
+
+    for pk in values:
+        by_version[versions[pk]].append(pk)
+
+    current = reduce(or_, (Q(pk__in=pks, **{version_field: version}) for version, pks in by_version.items()))
+
+    with timer('processing.write', model=model._meta.model_name):
+        return model.objects.filter(current).bulk_update(objs, fields)
+
+
+def _process(model, pks, documents, tfidf, bert, fields, version_field):
+    """Processa os pks livres e retorna (linhas gravadas, pks desatualizados).
+
+    ``tfidf`` trata um texto por vez; ``bert`` recebe todos os textos do bloco
+    e gera os embeddings em uma única passada pelo modelo.
+
+    pks já em processamento por outra task são ignorados. Por isso as versões
+    são relidas depois que os locks são liberados: um pk editado durante o
+    processamento, cuja task encontrou o lock ocupado, é reenfileirado por
+    quem detinha o lock. O reenfileiramento é sempre por pk, pelas tasks
+    process_candidato/process_vaga (fila recomendacao), para que a edição não
+    espere atrás de um backfill.
+    """
+
+    with processing_lock(model, pks) as locked:
+        versions = dict(model.objects.filter(pk__in=locked).values_list('pk', version_field))
+        texts = documents(list(versions))
+        embeddings = bert(list(texts.values())) if texts else []
+        values = {
+            pk: (tfidf(text), embedding, BERT_MODEL) for (pk, text), embedding in zip(texts.items(), embeddings)
+        }
+
+        rows = _write(model, values, fields, versions, version_field)
+
+    stale = []
+
+    if versions:
+        current = dict(model.objects.filter(pk__in=list(versions)).values_list('pk', version_field))
+        stale = [pk for pk in versions if current.get(pk, versions[pk]) != versions[pk]]
+
+    name = model._meta.model_name
+    skipped = len(set(pks)) - len(locked)
+
+    increment('processing.rows', rows, model=name)
+    increment('processing.stale', len(stale), model=name)
+    increment('processing.locked', skipped, model=name)
+
+    logger.info(
+        'event=processed model=%s requested=%d rows=%d stale=%d locked=%d',
+        name, len(set(pks)), rows, len(stale), skipped,
+    )
+
+    return rows, stale
+
+
+def _process_candidatos(pks):
     Candidato = apps.get_model('emprega.Candidato')
-    FormacaoAcademica = apps.get_model('emprega.FormacaoAcademica')
-    ExperienciaProfissional = apps.get_model('emprega.ExperienciaProfissional')
-    CursoEspecializacao = apps.get_model('emprega.CursoEspecializacao')
-    Idioma = apps.get_model('emprega.Idioma')
 
-    candidato = Candidato.objects.get(pk=pk)
+    return _process(
+        Candidato, pks, candidato_documents,
+        process_candidato_tfidf, process_candidatos_bert,
+        ['curriculo_processado', 'curriculo_embedding', 'curriculo_embedding_modelo'],
+        'curriculo_versao',
+    )
 
-    educations = FormacaoAcademica.objects.filter(usuario=candidato)
-    educations =  " ".join([str(education) for education in educations])
 
-    experiences = ExperienciaProfissional.objects.filter(usuario=candidato)
-    experiences = " ".join([f'{str(experience)} {experience.atividades}' for experience in experiences])
+def _process_vagas(pks):
+    Vaga = apps.get_model('emprega.Vaga')
+
+    return _process(
+        Vaga, pks, vaga_documents,
+        process_vaga_tfidf, process_vagas_bert,
+        ['vaga_processada', 'vaga_embedding', 'vaga_embedding_modelo'],
+        'vaga_versao',
+    )
+
 
-    courses = CursoEspecializacao.objects.filter(usuario=candidato)
-    courses = " ".join([str(course) for course in courses])
+@shared_task(name='process_candidatos')
+def process_candidatos(pks):
+    rows, stale = _process_candidatos(pks)
 
-    languages = Idioma.objects.filter(usuario=candidato)
-    languages = " ".join([str(language) for language in languages])
+    for pk in stale:
+        process_candidato.delay(pk=pk)
 
-    candidato_text = " ".join([str(candidato.cargo), str(candidato.atuacao), educations, experiences, courses, languages])
+    return rows
 
-    processed_text = process_candidato_tfidf(candidato.curriculo, candidato_text)
 
-    candidato.curriculo_processado = processed_text
+@shared_task(name='process_vagas')
+def process_vagas(pks):
+    rows, stale = _process_vagas(pks)
 
-    #save the processed_text to use in case the embedding doesn't get processed in time
-    candidato.save(process = False)
+    for pk in stale:
+        process_vaga.delay(pk=pk)
 
-    embedding = process_candidato_bert(candidato.curriculo, candidato_text)
-    candidato.curriculo_embedding = embedding
+    return rows
 
-    print(f'Candidato {candidato} - {candidato.pk} processado')
 
-    candidato.save(process = False)
+@shared_task(name='process_candidato')
+def process_candidato(pk):
+    rows, stale = _process_candidatos([pk])
+
+    if stale:
+        process_candidato.delay(pk=pk)
+
+    return rows
 
 
 @shared_task(name='process_vaga')
 def process_vaga(pk):
-    Vaga = apps.get_model('emprega.Vaga')
+    rows, stale = _process_vagas([pk])
+
+    if stale:
+        process_vaga.delay(pk=pk)
+
+    return rows
 
-    vaga = Vaga.objects.get(pk = pk)
-    empresa = vaga.empresa
-    vaga_text = " ".join([vaga.cargo, vaga.atividades, vaga.requisitos, empresa.ramo_atividade, empresa.descricao])
 
-    processed_text = process_vaga_tfidf(vaga_text)
-    vaga.vaga_processada = processed_text
+def request_candidato_processing(pk):
+    """Marca uma nova versão dos dados do candidato e enfileira o seu processamento."""
 
-    vaga.save(process = False)
-    
-    embedding = process_vaga_bert(vaga_text)
-    vaga.vaga_embedding = embedding
+    Usuario = apps.get_model('emprega.Usuario')
+    Usuario.objects.filter(pk=pk).update(curriculo_versao=F('curriculo_versao') + 1)
 
-    print(f'Vaga {vaga} - {vaga.pk} processada')
+    process_candidato.delay(pk=pk)
+
+
+def request_vaga_processing(pk):
+    """Marca uma nova versão dos dados da vaga e enfileira o seu processamento."""
+
+    Vaga = apps.get_model('emprega.Vaga')
+    Vaga.objects.filter(pk=pk).update(vaga_versao=F('vaga_versao') + 1)
 
-    vaga.save(process = False)
+    process_vaga.delay(pk=pk)
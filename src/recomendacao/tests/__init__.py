@@ -0,0 +1,7 @@
+from recomendacao.tests.documents import *
+from recomendacao.tests.tasks import *
+from recomendacao.tests.inference import *
+from recomendacao.tests.metrics import *
+from recomendacao.tests.benchmarks import *
+from recomendacao.tests.ranking import *
+from recomendacao.tests.imports import *
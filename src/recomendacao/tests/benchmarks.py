@@ -0,0 +1,36 @@
+from django.test import SimpleTestCase
+
+from recomendacao.benchmarks import compare, run, synthetic_texts, synthetic_vagas
+
+
+class BenchmarkTestCase(SimpleTestCase):
+    def test_corpus(self):
+        texts = synthetic_texts(10, words=20, seed=1)
+
+        self.assertEqual(len(texts), 10)
+        self.assertTrue(all(len(text.split(" ")) == 20 for text in texts))
+        self.assertEqual(texts, synthetic_texts(10, words=20, seed=1))
+        self.assertNotEqual(texts, synthetic_texts(10, words=20, seed=2))
+
+        vaga = synthetic_vagas(1, words=5, dimensions=4)[0]
+
+        self.assertEqual(len(vaga.vaga_embedding), 4)
+
+    def test_run(self):
+        results = run(sizes=[50], cases=["recommend_vagas_bert", "recommend_candidatos_bert"], repeat=2, words=10)
+
+        for case in ("recommend_vagas_bert", "recommend_candidatos_bert"):
+            result = results["results"][case]["50"]
+
+            self.assertEqual(len(result["timings"]), 2)
+            self.assertLessEqual(result["p50"], result["p95"])
+            self.assertGreater(result["peak_memory"], 0)
+
+    def test_compare(self):
+        baseline = {"results": {"apply_tfidf": {"1000": {"p50": 1.0}, "10000": {"p50": 2.0}}}}
+        current = {"results": {"apply_tfidf": {"1000": {"p50": 1.5}, "10000": {"p50": 2.0}, "100000": {"p50": 9.0}}}}
+
+        self.assertEqual(compare(baseline, current), [
+            ("apply_tfidf", "1000", 1.0, 1.5, 0.5, True),
+            ("apply_tfidf", "10000", 2.0, 2.0, 0.0, False),
+        ])
@@ -0,0 +1,58 @@
+from django.test import TestCase
+
+from emprega.factories import (
+    UserFactory,
+    FormacaoAcademicaFactory,
+    ExperienciaProfissionalFactory,
+    CursoEspecializacaoFactory,
+    IdiomaFactory,
+    VagaFactory,
+)
+from emprega.models import UsuarioNivelChoices
+from recomendacao.documents import candidato_documents, vaga_documents
+
+
+class CandidatoDocumentsTestCase(TestCase):
+    def setUp(self):
+        self.candidatos = UserFactory.create_batch(3, nivel_usuario=UsuarioNivelChoices.CANDIDATO)
+
+        for candidato in self.candidatos:
+            FormacaoAcademicaFactory.create_batch(2, usuario=candidato)
+            ExperienciaProfissionalFactory(usuario=candidato)
+            CursoEspecializacaoFactory(usuario=candidato)
+            IdiomaFactory(usuario=candidato)
+
+    def test_text(self):
+        candidato = self.candidatos[0]
+
+        # Texto montado a partir das instâncias, como antes do processamento em lote
+        educations = " ".join(str(education) for education in candidato.formacoes_academicas_usuario.all())
+        experiences = " ".join(
+            f'{experience} {experience.atividades}' for experience in candidato.experiencias_profissionais_usuario.all()
+        )
+        courses = " ".join(str(course) for course in candidato.cursos_especializacao_usuario.all())
+        languages = " ".join(str(language) for language in candidato.idiomas_usuario.all())
+        text = " ".join([str(candidato.cargo), str(candidato.atuacao), educations, experiences, courses, languages])
+
+        documents = candidato_documents([candidato.pk])
+
+        self.assertEqual(documents, {candidato.pk: " " + text})
+
+    def test_queries(self):
+        pks = [candidato.pk for candidato in self.candidatos]
+
+        with self.assertNumQueries(5):
+            documents = candidato_documents(pks)
+
+        self.assertEqual(sorted(documents), sorted(pks))
+
+
+class VagaDocumentsTestCase(TestCase):
+    def test_text(self):
+        vaga = VagaFactory(empresa__descricao=None)
+
+        documents = vaga_documents([vaga.pk])
+
+        self.assertEqual(documents, {
+            vaga.pk: " ".join([vaga.cargo, vaga.atividades, vaga.requisitos, vaga.empresa.ramo_atividade, ""]),
+        })
@@ -0,0 +1,53 @@
+import os
+import subprocess
+import sys
+from unittest import skipUnless
+
+from django.conf import settings
+from django.test import SimpleTestCase
+
+# Bibliotecas que só os workers usam (recomendacao.recommendation)
+WORKER_ONLY_MODULES = ["torch", "sentence_transformers", "sklearn", "nltk", "PyPDF2"]
+
+# Limite opcional, em segundos, para o tempo de import do Django com as urls e
+# views carregadas (IMPORT_TIME_BUDGET=2.5, por exemplo). O tempo depende da
+# máquina, então sem a variável ele é só medido
+IMPORT_TIME_BUDGET = os.getenv("IMPORT_TIME_BUDGET")
+
+
+class ImportTimeTestCase(SimpleTestCase):
+    def _importtime(self):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import django; django.setup(); import core.urls"],
+            cwd=settings.BASE_DIR,
+            env={**os.environ, "DJANGO_SETTINGS_MODULE": "core.settings"},
+            capture_output=True,
+            text=True,
+        )
+
+        self.assertEqual(result.returncode, 0, result.stderr[-2000:])
+
+        modules = {}
+
+        for line in result.stderr.splitlines():
+            if line.startswith("import time:") and not line.endswith("imported package"):
+                own, cumulative, name = line[len("import time:"):].split("|")
+
+                if own.strip().isdigit():
+                    modules[name.strip()] = int(own)
+
+        return modules
+
+    def test_web_imports(self):
+        modules = self._importtime()
+
+        self.assertIn("emprega.views", modules)
+
+        for module in WORKER_ONLY_MODULES:
+            self.assertNotIn(module, modules, f"{module} importado pelo processo web")
+
+    @skipUnless(IMPORT_TIME_BUDGET, "IMPORT_TIME_BUDGET não definido")
+    def test_import_time(self):
+        total = sum(self._importtime().values()) / 1e6
+
+        self.assertLess(total, float(IMPORT_TIME_BUDGET), f"imports levaram {total:.2f}s")
@@ -0,0 +1,78 @@
+import os
+import tempfile
+import threading
+
+from django.test import SimpleTestCase, override_settings
+
+from recomendacao import inference
+from recomendacao.inference import InferenceServer
+
+
+class InferenceServerTestCase(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.address = os.path.join(self.directory.name, "inference.sock")
+        self.batches = []
+
+        self.server = InferenceServer(self.address, self._encode, max_batch=8, max_wait=0.5)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+        self.server.running.wait()
+
+        inference._connection = None
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.thread.join()
+        self.directory.cleanup()
+        inference._connection = None
+
+    def _encode(self, texts):
+        if "falha" in texts:
+            raise ValueError("falha")
+
+        self.batches.append(texts)
+
+        return [[float(len(text))] for text in texts]
+
+    def _client(self, texts, results, i):
+        # Cada thread usa a sua própria conexão, como processos distintos do worker
+        with override_settings(RECOMMENDATION_INFERENCE_ADDRESS=self.address):
+            connection = inference.Client(self.address, authkey=inference.authkey())
+            connection.send(texts)
+            results[i] = connection.recv()
+            connection.close()
+
+    def test_encode(self):
+        with override_settings(RECOMMENDATION_INFERENCE_ADDRESS=self.address):
+            self.assertEqual(inference.encode(["a", "abc"]), [[1.0], [3.0]])
+
+    def test_micro_batch(self):
+        results = {}
+        threads = [
+            threading.Thread(target=self._client, args=(["x" * (i + 1)], results, i))
+            for i in range(4)
+        ]
+
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(self.batches), 1)
+        self.assertEqual(sorted(self.batches[0]), ["x", "xx", "xxx", "xxxx"])
+        self.assertEqual(results, {i: ("ok", [[float(i + 1)]]) for i in range(4)})
+
+    def test_max_batch(self):
+        with override_settings(RECOMMENDATION_INFERENCE_ADDRESS=self.address):
+            inference.encode(["a"] * 20)
+
+        self.assertEqual([len(batch) for batch in self.batches], [20])
+
+    def test_error(self):
+        with override_settings(RECOMMENDATION_INFERENCE_ADDRESS=self.address):
+            with self.assertRaises(RuntimeError):
+                inference.encode(["falha"])
+
+            self.assertEqual(inference.encode(["ok"]), [[2.0]])
@@ -0,0 +1,66 @@
+import socket
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from core.metrics import MemorySink, StatsdSink, get_sink, timer
+from emprega.factories import VagaFactory
+from recomendacao.tasks import process_vagas
+
+
+class MetricsSinkTestCase(SimpleTestCase):
+    def test_log(self):
+        with self.assertLogs("core.metrics", level="INFO") as logs:
+            with timer("processing.fetch", model="vaga"):
+                pass
+
+        self.assertRegex(logs.output[0], r"metric=processing.fetch type=timing value=[\d.]+ model=vaga")
+
+    @override_settings(METRICS_SINK="memory", METRICS_OPTIONS={})
+    def test_memory(self):
+        sink = get_sink()
+
+        self.assertIsInstance(sink, MemorySink)
+
+        sink.timing("processing.encode", 0.5)
+        sink.timing("processing.encode", 0.25)
+        sink.increment("task.outcome", task="process_vaga", state="SUCCESS")
+
+        self.assertEqual(sink.values["processing.encode", ()], [0.5, 0.25])
+        self.assertEqual(sink.counters["task.outcome", (("state", "SUCCESS"), ("task", "process_vaga"))], 1)
+
+    def test_metrics_endpoint(self):
+        # As métricas são coletadas pelo statsd_exporter, não pela API
+        self.assertEqual(self.client.get("/metrics/").status_code, 404)
+
+    def test_statsd(self):
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as server:
+            server.bind(("127.0.0.1", 0))
+            server.settimeout(1)
+
+            sink = StatsdSink("127.0.0.1", server.getsockname()[1], prefix="teste")
+            sink.timing("processing.write", 0.002, model="vaga")
+            sink.increment("processing.rows", 3, model="vaga")
+
+            self.assertEqual(server.recv(1024), b"teste.processing.write:2.0|ms|#model:vaga")
+            self.assertEqual(server.recv(1024), b"teste.processing.rows:3|c|#model:vaga")
+
+
+@mock.patch("recomendacao.tasks.process_vaga_tfidf", lambda text: "processada")
+@mock.patch("recomendacao.tasks.process_vagas_bert", lambda texts: [[0.1, 0.2]] * len(texts))
+@override_settings(METRICS_SINK="memory", METRICS_OPTIONS={})
+class ProcessingMetricsTestCase(TestCase):
+    def test_stages(self):
+        vagas = VagaFactory.create_batch(2)
+
+        process_vagas.apply(kwargs={"pks": [vaga.pk for vaga in vagas]})
+
+        sink = get_sink()
+        vaga = (("model", "vaga"),)
+        task = (("state", "SUCCESS"), ("task", "process_vagas"))
+
+        self.assertEqual(len(sink.values["processing.fetch", vaga]), 1)
+        self.assertEqual(len(sink.values["processing.write", vaga]), 1)
+        self.assertEqual(sink.counters["processing.rows", vaga], 2)
+        self.assertEqual(sink.counters["task.outcome", task], 1)
+        self.assertEqual(len(sink.values["task.duration", task]), 1)
@@ -0,0 +1,62 @@
+from types import SimpleNamespace
+from unittest import mock
+
+import numpy as np
+from django.test import SimpleTestCase
+
+from recomendacao.ranking import apply_tfidf, cosine_similarity, recommend_vagas_bert, recommend_vagas_tfidf
+
+STOPWORDS = frozenset(["de", "the", "e", "and"])
+
+
+@mock.patch("recomendacao.ranking.STOPWORDS", STOPWORDS)
+class RankingTestCase(SimpleTestCase):
+    corpus = [
+        "desenvolvedor python django e postgres",
+        "analista de dados python and sql",
+        "vendedor externo de veículos",
+        "desenvolvedor frontend react and typescript",
+        "",
+    ]
+    query = ["desenvolvedor python sênior", "palavras fora do vocabulário"]
+
+    def test_tfidf_matches_sklearn(self):
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.metrics.pairwise import cosine_similarity as sklearn_cosine_similarity
+
+        vectorizer = TfidfVectorizer(stop_words=list(STOPWORDS))
+        expected_corpus = vectorizer.fit_transform(self.corpus)
+        expected_query = vectorizer.transform(self.query)
+
+        query_tfidf, corpus_tfidf = apply_tfidf(self.query, self.corpus)
+
+        np.testing.assert_allclose(
+            cosine_similarity(query_tfidf, corpus_tfidf),
+            sklearn_cosine_similarity(expected_query, expected_corpus),
+        )
+        np.testing.assert_allclose(
+            np.sort(corpus_tfidf.toarray(), axis=1),
+            np.sort(expected_corpus.toarray(), axis=1),
+        )
+
+    def test_cosine_dense(self):
+        from sklearn.metrics.pairwise import cosine_similarity as sklearn_cosine_similarity
+
+        x = [[0.1, 0.2, 0.3]]
+        y = [[0.3, 0.2, 0.1], [0.0, 0.0, 0.0], [-1.0, 2.0, 0.5]]
+
+        np.testing.assert_allclose(cosine_similarity(x, y), sklearn_cosine_similarity(x, y))
+
+    def test_recommend(self):
+        vagas = [SimpleNamespace(vaga_processada=text, vaga_embedding=[float(i), 1.0]) for i, text in enumerate(self.corpus)]
+        user = SimpleNamespace(curriculo_processado="desenvolvedor python", curriculo_embedding=[4.0, 1.0])
+
+        self.assertIs(recommend_vagas_tfidf(vagas, user)[0], vagas[0])
+        self.assertIs(recommend_vagas_bert(vagas, user)[0], vagas[4])
+
+        user.curriculo_embedding = None
+
+        self.assertIs(recommend_vagas_bert(vagas, user)[0], vagas[0])
+
+    def test_empty(self):
+        self.assertEqual(recommend_vagas_tfidf([], SimpleNamespace(curriculo_processado="python")), [])
@@ -0,0 +1,145 @@
+from unittest import mock
+
+from auditlog.models import LogEntry
+from django.db import connection
+from django.db.models import F
+from django.test import TestCase
+
+from emprega.factories import (
+    UserFactory,
+    VagaFactory,
+    CandidaturaFactory,
+    FormacaoAcademicaFactory,
+)
+from emprega.models import UsuarioNivelChoices, Candidato, Candidatura, Vaga
+from recomendacao.locks import lock_namespace
+from recomendacao.recommendation import BERT_MODEL
+from recomendacao.tasks import _write, process_candidatos, process_vaga, process_vagas, request_vaga_processing
+
+
+@mock.patch("recomendacao.tasks.process_vaga_tfidf", lambda text: "processada")
+@mock.patch("recomendacao.tasks.process_vagas_bert", lambda texts: [[0.1, 0.2]] * len(texts))
+class ProcessVagaTestCase(TestCase):
+    def test_single_write(self):
+        vagas = VagaFactory.create_batch(3)
+        logs = LogEntry.objects.count()
+
+        # A última consulta relê as versões depois que os locks são liberados
+        with self.assertNumQueries(6):
+            rows = process_vagas([vaga.pk for vaga in vagas])
+
+        self.assertEqual(rows, 3)
+        self.assertEqual(LogEntry.objects.count(), logs)
+
+        for vaga in vagas:
+            vaga.refresh_from_db()
+
+            self.assertEqual(vaga.vaga_processada, "processada")
+            self.assertEqual(vaga.vaga_embedding, [0.1, 0.2])
+            self.assertEqual(vaga.vaga_embedding_modelo, BERT_MODEL)
+
+    def test_batch_encode(self):
+        vagas = VagaFactory.create_batch(3)
+
+        with mock.patch("recomendacao.tasks.process_vagas_bert", return_value=[[0.1, 0.2]] * 3) as bert:
+            process_vagas([vaga.pk for vaga in vagas])
+
+        # Os textos do bloco passam de uma só vez pelo modelo
+        bert.assert_called_once()
+        self.assertEqual(len(bert.call_args.args[0]), 3)
+
+    def test_signal_bypass(self):
+        vaga = VagaFactory(esta_ativo=False)
+        candidatura = CandidaturaFactory(vaga=vaga, esta_ativo=True)
+
+        process_vaga(vaga.pk)
+
+        self.assertTrue(Candidatura.objects.get(pk=candidatura.pk).esta_ativo)
+
+    def test_locked(self):
+        livre, ocupada = VagaFactory.create_batch(2)
+
+        # Outra sessão, como a de outro worker, processando uma das vagas
+        other = connection.copy()
+
+        try:
+            with other.cursor() as cursor:
+                cursor.execute("SELECT pg_advisory_lock(%s, %s)", [lock_namespace(Vaga), ocupada.pk])
+
+            rows = process_vagas([livre.pk, ocupada.pk, livre.pk])
+        finally:
+            other.close()
+
+        self.assertEqual(rows, 1)
+        self.assertEqual(Vaga.objects.get(pk=livre.pk).vaga_processada, "processada")
+        self.assertIsNone(Vaga.objects.get(pk=ocupada.pk).vaga_processada)
+
+        # Os locks obtidos são liberados ao final
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT count(*) FROM pg_locks WHERE locktype = 'advisory' AND pid = pg_backend_pid()")
+            self.assertEqual(cursor.fetchone()[0], 0)
+
+    def test_stale(self):
+        atual, editada = VagaFactory.create_batch(2)
+
+        def process(text):
+            # Edição concluída enquanto a vaga era processada
+            Vaga.objects.filter(pk=editada.pk).update(vaga_versao=F("vaga_versao") + 1)
+            return "processada"
+
+        # Reenfileirada na fila recomendacao, não atrás do backfill
+        with mock.patch("recomendacao.tasks.process_vaga_tfidf", process), \
+                mock.patch.object(process_vaga, "delay") as delay:
+            rows = process_vagas([atual.pk, editada.pk])
+
+        self.assertEqual(rows, 1)
+        self.assertEqual(Vaga.objects.get(pk=atual.pk).vaga_processada, "processada")
+        self.assertIsNone(Vaga.objects.get(pk=editada.pk).vaga_processada)
+        delay.assert_called_once_with(pk=editada.pk)
+
+    def test_edited_after_write(self):
+        vaga = VagaFactory()
+        def write(*args):
+            rows = _write(*args)
+            # Edição concluída depois da gravação, com o lock ainda ocupado: a task
+            # enfileirada por ela ignora o pk
+            Vaga.objects.filter(pk=vaga.pk).update(vaga_versao=F("vaga_versao") + 1)
+            return rows
+
+        with mock.patch("recomendacao.tasks._write", write), mock.patch.object(process_vaga, "delay") as delay:
+            rows = process_vagas([vaga.pk])
+
+        self.assertEqual(rows, 1)
+        delay.assert_called_once_with(pk=vaga.pk)
+
+    def test_request(self):
+        vaga = VagaFactory()
+
+        with mock.patch.object(process_vaga, "delay") as delay:
+            request_vaga_processing(vaga.pk)
+
+        self.assertEqual(Vaga.objects.get(pk=vaga.pk).vaga_versao, 1)
+        delay.assert_called_once_with(pk=vaga.pk)
+
+
+@mock.patch("recomendacao.tasks.process_candidato_tfidf", lambda text: "processado")
+@mock.patch("recomendacao.tasks.process_candidatos_bert", lambda texts: [[0.1, 0.2]] * len(texts))
+class ProcessCandidatoTestCase(TestCase):
+    def test_single_write(self):
+        candidatos = UserFactory.create_batch(3, nivel_usuario=UsuarioNivelChoices.CANDIDATO)
+
+        for candidato in candidatos:
+            FormacaoAcademicaFactory(usuario=candidato)
+
+        logs = LogEntry.objects.count()
+
+        with self.assertNumQueries(10):
+            rows = process_candidatos([candidato.pk for candidato in candidatos])
+
+        self.assertEqual(rows, 3)
+        self.assertEqual(LogEntry.objects.count(), logs)
+
+        for candidato in Candidato.objects.filter(pk__in=[candidato.pk for candidato in candidatos]):
+            self.assertEqual(candidato.curriculo_processado, "processado")
+            self.assertEqual(candidato.curriculo_embedding, [0.1, 0.2])
+            self.assertEqual(candidato.curriculo_embedding_modelo, BERT_MODEL)